@@ -1,16 +1,19 @@
 # flake8: noqa
 
-from . import algo
-from . import net
-from . import optim
-from . import utils
-from . import callback
-from . import linalg
+from ._lazy import attach
 
-
-from .net import Network, load_sioux, load_braess
-from .algo import EFA, MCA, MCFI
-from .optim import FW, NetworkFW
-
-
-__all__ = [s for s in dir() if not s.startswith("_")]
\ No newline at end of file
+# Subpackages (and their dependencies) are imported on first access
+__getattr__, __dir__, __all__ = attach(
+    __name__,
+    submodules=["algo", "net", "optim", "utils", "callback", "linalg", "profiling"],
+    attributes={
+        "Network": "net",
+        "load_sioux": "net",
+        "load_braess": "net",
+        "EFA": "algo",
+        "MCA": "algo",
+        "MCFI": "algo",
+        "FW": "optim",
+        "NetworkFW": "optim",
+    },
+)
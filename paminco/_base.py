@@ -3,19 +3,31 @@ from __future__ import annotations
 from collections.abc import MutableSequence
 import abc
 from copy import deepcopy
+import io
 from time import time, localtime, strftime
 
 import numpy as np
-import pandas as pd
-import matplotlib.pyplot as plt
-import scipy.interpolate as spip
 
 from . import _doc
 from .callback import CallBackFlag, SimpleTimer
+from .profiling import NULL_PROFILER
 from .net import Network
+from .utils.io import savez_blocks
 from .utils.misc import callback_to_list
 
 
+def _import_pyarrow():
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError(
+            "Parquet support requires pyarrow, install it via "
+            "'pip install pyarrow' or 'pip install paminco[parquet]'."
+        ) from e
+    return pa, pq
+
+
 class Base(abc.ABC):
     """Abstract solver class.
     
@@ -31,13 +43,18 @@ class Base(abc.ABC):
         the status of the algorithm.
     use_simple_timer : bool, default=True
         Whether timestamps will be collected during initialization and run.
-    copy_network : bool, default=True
-        Whether to work on a copy of ``network``.
+    copy_network : bool or str, default=True
+        Whether to work on a copy of ``network``. If True, a
+        copy-on-write view is used (see :meth:`Network.view()
+        <paminco.net.network.Network.view>`), if ``"deep"``, a deep copy.
     
     Attributes
     ----------
     callbacks : list
         List of callbacks.
+    profiler : Profiler or NullProfiler
+        Collects timing spans and counters, disabled by default. See
+        :mod:`paminco.profiling`.
     network
     name
     
@@ -61,10 +78,15 @@ class Base(abc.ABC):
         else:
             self.callbacks = callback_to_list(callback)
         
+        # Profiling is disabled unless a profiler attaches itself
+        self.profiler = NULL_PROFILER
+        
         self.callback(CallBackFlag.INIT_START)
         
         # Init network
         if copy_network is True:
+            self._net = network.view()
+        elif copy_network == "deep":
             self._net = deepcopy(network)
         else:
             self._net = network
@@ -375,6 +397,7 @@ class ParametricSolution(TypedList):
         """
         return_figax = False
         if ax is None:
+            import matplotlib.pyplot as plt
             fig, ax = plt.subplots()
             return_figax = True
         
@@ -403,6 +426,7 @@ class ParametricSolution(TypedList):
         p, idx = self.all_params(filter_same=True, return_indices=True)
         f = np.array([s.flow for s in self])[idx, :]
         if len(p) > 1:
+            import scipy.interpolate as spip
             self.flow_ip = spip.interp1d(p, f.T)
         
         if dflow is not None:
@@ -416,6 +440,7 @@ class ParametricSolution(TypedList):
         p, idx = self.all_params(filter_same=True, return_indices=True)
         pot = np.array([s.potential for s in self])[idx, :]
         if len(p) > 1:
+            import scipy.interpolate as spip
             self.pot_ip = spip.interp1d(p, pot.T)
         
         if dpi is not None:
@@ -450,13 +475,68 @@ class ParametricSolution(TypedList):
     def save_to_numpy(
             self,
             file: str,
+            chunk_size: int = None,
             **kwargs
             ) -> None:
-        save_dict = self.make_save_dict()
+        """Save object into a single file in uncompressed ``.npz`` format.
+        
+        Flows and potentials are written in blocks of ``chunk_size``
+        breakpoints, such that the arrays of all breakpoints are never
+        stacked in memory.
+        
+        Parameters
+        ----------
+        file : str or file
+            Filename as str or open file.
+        chunk_size : int, optional
+            Number of breakpoints per block. Defaults to blocks of
+            about one million entries.
+        kwargs : keyword arguments, optional
+            Keyword arguments saved to file.
+        
+        See Also
+        --------
+        make_save_dict
+        paminco.utils.io.savez_blocks
+        numpy.lib.npyio.NpzFile
+        """
+        chunk_size = self._chunk_size(chunk_size)
+        
+        def blocks(attr):
+            for (start, stop) in self._blocks(chunk_size):
+                yield np.array([getattr(s, attr) for s in self[start:stop]])
+        
+        save_dict = {"arr_param": self.arr_param}
+        save_dict["arr_flow"] = ((len(self), ) + np.shape(self[0].flow),
+                                 np.result_type(self[0].flow),
+                                 blocks("flow"))
+        if self.has_costs is True:
+            save_dict["arr_cost"] = self.arr_cost
+        if self.has_potentials is True:
+            save_dict["arr_potential"] = ((len(self), ) + np.shape(self[0].potential),
+                                          np.result_type(self[0].potential),
+                                          blocks("potential"))
+        if self.dflow is not None:
+            save_dict["dflow"] = self.dflow
+        if self.dpi is not None:
+            save_dict["dpi"] = self.dpi
         save_dict.update(**kwargs)
-        np.savez(file, **save_dict)
-    
-    save_to_numpy.__doc__ = _doc.save_to_numpy.__doc__
+        savez_blocks(file, save_dict)
+
+    def _chunk_size(self, chunk_size=None) -> int:
+        if chunk_size is None:
+            # Blocks of about 2**20 entries
+            width = np.size(self[0].flow)
+            if self.has_potentials is True:
+                width += np.size(self[0].potential)
+            chunk_size = max(1, 2**20 // max(1, width))
+        if chunk_size < 1:
+            raise ValueError(f"chunk_size must be positive, got {chunk_size}.")
+        return int(chunk_size)
+
+    def _blocks(self, chunk_size: int):
+        for start in range(0, len(self), chunk_size):
+            yield (start, min(start + chunk_size, len(self)))
 
     def to_df(
             self,
@@ -476,54 +556,61 @@ class ParametricSolution(TypedList):
             If True, a row will be appended that contains the slope values
             of flow (and potential).
         """
-        # Build index
+        return self._block_to_df(0, len(self),
+                                 prefix_flow=prefix_flow,
+                                 prefix_potential=prefix_potential,
+                                 add_delta_row=add_delta_row)
+
+    def _block_to_df(
+            self,
+            start: int,
+            stop: int,
+            prefix_flow: str = "edge",
+            prefix_potential: str = "node",
+            add_delta_row: bool = False,
+            ) -> pd.DataFrame:
+        # Dataframe of breakpoints start:stop, optionally with delta row
+        import pandas as pd
+        
+        bps = self[start:stop]
         if self.dflow is None:
             add_delta_row = False
-        index = np.arange(len(self))
-        if add_delta_row:
+        
+        # Build index
+        index = np.arange(start, stop)
+        if add_delta_row is True:
             index = [*index.astype(str)] + ["delta"]
         
-        # Build flow df
-        if add_delta_row is True and self.dflow is not None:
-            df = pd.DataFrame(np.vstack((self.arr_flow, self.dflow)),
-                              index=index)
-        else:
-            df = pd.DataFrame(self.arr_flow, index=index)
-        df.columns = [f"{prefix_flow}_{e}" for e in df.columns]
+        def stack(arrs, delta):
+            arr = np.array(arrs)
+            if add_delta_row is True:
+                if delta is None:
+                    delta = np.full(arr.shape[1], np.nan)
+                arr = np.vstack((arr, delta))
+            return arr
         
-        # Build potential df
-        if self.has_potentials is True:
-            if add_delta_row is True and self.dpi is not None:
-                df_pot = pd.DataFrame(np.vstack((self.arr_potential, self.dpi)),
-                                      index=index)
-            else:
-                df_pot = pd.DataFrame(self.arr_potential, index=index)
-            df_pot.columns = [f"{prefix_potential}_{e}" for e in df_pot.columns]
-            
-            # Merge flow and pot frames
-            df = df.join(df_pot)
+        def with_nan(arr):
+            return np.append(np.array(arr, dtype=float), [np.nan] * add_delta_row)
         
-        # Set cost in merged frame
+        cols = {"param": with_nan([s.param for s in bps])}
         if self.has_costs is True:
-            try:
-                df["cost"] = [*self.arr_cost] + [np.nan]
-            except ValueError:
-                df["cost"] = self.arr_cost
-            # Bring cost column to front
-            cols = [df.columns[-1]] + df.columns[:-1].tolist()
-            df = df[cols]
-            
-        # Add param column
-        if "delta" in df.index:
-            df["param"] = [*self.arr_param] + [np.nan]
-        else:
-            df["param"] = self.arr_param
+            cols["cost"] = with_nan([s.cost for s in bps])
+        frames = [pd.DataFrame(cols, index=index)]
         
-        # Bring param column to front
-        cols = [df.columns[-1]] + df.columns[:-1].tolist()
-        df = df[cols]
+        # Flow (and potential) columns
+        flow = stack([s.flow for s in bps], self.dflow)
+        frames.append(pd.DataFrame(
+            flow, index=index,
+            columns=[f"{prefix_flow}_{e}" for e in range(flow.shape[1])]
+        ))
+        if self.has_potentials is True:
+            pot = stack([s.potential for s in bps], self.dpi)
+            frames.append(pd.DataFrame(
+                pot, index=index,
+                columns=[f"{prefix_potential}_{v}" for v in range(pot.shape[1])]
+            ))
         
-        return df
+        return pd.concat(frames, axis=1)
 
     @classmethod
     def from_arrays(
@@ -651,9 +738,13 @@ class ParametricSolution(TypedList):
             prefix_flow: str = "edge",
             prefix_potential: str = "node",
             add_delta_row: bool = True,
+            chunk_size: int = None,
             ) -> None:
         """Save ParametricSolution to ``CSV``.
         
+        The file is written in blocks of ``chunk_size`` breakpoints, such
+        that only a single block is held in a dataframe at a time.
+        
         Parameters
         ----------
         file : str or file handle
@@ -666,11 +757,26 @@ class ParametricSolution(TypedList):
         add_delta_row : bool, default=False
             If True, a row will be appended that contains the slope values
             of flow (and potential).
+        chunk_size : int, optional
+            Number of breakpoints per block. Defaults to blocks of
+            about one million entries.
         """
-        df = self.to_df(prefix_flow=prefix_flow,
-                        prefix_potential=prefix_potential,
-                        add_delta_row=add_delta_row)
-        return df.to_csv(file, index_label="index")
+        if file is None:
+            buf = io.StringIO()
+            self.to_csv(buf, prefix_flow, prefix_potential, add_delta_row, chunk_size)
+            return buf.getvalue()
+        
+        chunk_size = self._chunk_size(chunk_size)
+        blocks = list(self._blocks(chunk_size))
+        for (i, (start, stop)) in enumerate(blocks):
+            df = self._block_to_df(start, stop,
+                                   prefix_flow=prefix_flow,
+                                   prefix_potential=prefix_potential,
+                                   add_delta_row=(add_delta_row and i == len(blocks) - 1))
+            if i == 0:
+                df.to_csv(file, index_label="index")
+            else:
+                df.to_csv(file, mode="a", header=False)
     
     @classmethod
     def from_csv(
@@ -696,6 +802,8 @@ class ParametricSolution(TypedList):
         -------
         ParametricSolution
         """
+        import pandas as pd
+        
         df = pd.read_csv(file, index_col="index")
         return cls.from_df(
             df,
@@ -703,6 +811,199 @@ class ParametricSolution(TypedList):
             prefix_potential=prefix_potential
         )
 
+    def to_parquet(
+            self,
+            file,
+            chunk_size: int = None,
+            compression: str = "snappy",
+            ) -> None:
+        """Save ParametricSolution to ``Parquet``.
+        
+        The solution is stored in long format with the columns
+        ``param``, ``cost``, ``edge``, ``flow``, ``node`` and
+        ``potential``. The first rows hold parameter and total cost of
+        all breakpoints. They are followed by one row per edge and
+        breakpoint, sorted by edge and in order of breakpoints, and the
+        potentials of nodes likewise. Slopes after the last breakpoint
+        are stored in an additional row per edge (node) with
+        ``param = inf``.
+        
+        Rows of whole edges (nodes) are written as row groups, such that
+        :meth:`from_parquet` can skip edges that are not requested.
+        
+        Requires ``pyarrow``.
+        
+        Parameters
+        ----------
+        file : str or file handle
+            File to save ParametricSolution to.
+        chunk_size : int, optional
+            Number of rows per row group, rounded down to whole edges
+            (nodes). Defaults to about one million rows.
+        compression : str, default="snappy"
+            Compression codec passed to
+            :class:`pyarrow.parquet.ParquetWriter`.
+        
+        See Also
+        --------
+        from_parquet
+        """
+        pa, pq = _import_pyarrow()
+        
+        if chunk_size is None:
+            chunk_size = 2**20
+        if chunk_size < 1:
+            raise ValueError(f"chunk_size must be positive, got {chunk_size}.")
+        
+        schema = pa.schema([("param", pa.float64()),
+                            ("cost", pa.float64()),
+                            ("edge", pa.int32()),
+                            ("flow", pa.float64()),
+                            ("node", pa.int32()),
+                            ("potential", pa.float64())])
+        
+        def write(writer, **cols):
+            num_rows = len(cols["param"])
+            arrays = [pa.array(cols[f.name], type=f.type) if f.name in cols
+                      else pa.nulls(num_rows, type=f.type) for f in schema]
+            table = pa.Table.from_arrays(arrays, schema=schema)
+            writer.write_table(table, row_group_size=max(1, num_rows))
+        
+        param = np.asarray(self.arr_param, dtype=float)
+        with pq.ParquetWriter(file, schema, compression=compression) as writer:
+            # Parameter and total cost of all breakpoints
+            if self.has_costs is True:
+                write(writer, param=param, cost=np.asarray(self.arr_cost, dtype=float))
+            else:
+                write(writer, param=param)
+            
+            # Flows (and potentials) of blocks of whole edges (nodes)
+            blocks = [("edge", "flow", "flow", self.dflow)]
+            if self.has_potentials is True:
+                blocks.append(("node", "potential", "potential", self.dpi))
+            for (index, value, attr, slope) in blocks:
+                p = param if slope is None else np.append(param, np.inf)
+                size = np.size(getattr(self[0], attr))
+                step = max(1, chunk_size // len(p))
+                for start in range(0, size, step):
+                    stop = min(start + step, size)
+                    vals = [getattr(s, attr)[start:stop] for s in self]
+                    if slope is not None:
+                        vals.append(np.asarray(slope)[start:stop])
+                    vals = np.array(vals, dtype=float)
+                    write(writer,
+                          param=np.tile(p, stop - start),
+                          **{index: np.repeat(np.arange(start, stop, dtype=np.int32), len(p)),
+                             value: vals.T.ravel()})
+
+    @classmethod
+    def from_parquet(
+            cls,
+            file,
+            edges=None,
+            nodes=None,
+            param_range=None,
+            ) -> ParametricSolution:
+        """Build ParametricSolution from ``Parquet``.
+        
+        Only the row groups of the requested edges (nodes) are read from
+        ``file``, rows outside of ``param_range`` are skipped.
+        
+        Requires ``pyarrow``.
+        
+        Parameters
+        ----------
+        file : str or file handle
+            File written by :meth:`to_parquet`.
+        edges : array_like of int, optional
+            Edge indices to load. If given, flows (and their slopes) of
+            the returned solution hold these edges only, in this order.
+            Defaults to all edges.
+        nodes : array_like of int, optional
+            Node indices of potentials to load, same as for ``edges``.
+            Defaults to all nodes. Pass an empty sequence to skip
+            potentials.
+        param_range : tuple of float, optional
+            Load breakpoints with ``param_range[0] <= param <=
+            param_range[1]`` only. Either bound may be None. Slopes after
+            the last breakpoint are dropped if the last breakpoint is not
+            loaded.
+        
+        Returns
+        -------
+        ParametricSolution
+        
+        See Also
+        --------
+        to_parquet
+        """
+        pa, pq = _import_pyarrow()
+        import pyarrow.compute as pc
+        
+        # Parameter and total cost of all breakpoints
+        table = pq.read_table(file, columns=["param", "cost"],
+                              filters=pc.field("edge").is_null() & pc.field("node").is_null())
+        param = table.column("param").to_numpy()
+        arr_cost = None
+        if table.column("cost").null_count == 0:
+            arr_cost = table.column("cost").to_numpy()
+        
+        rows = pc.scalar(True)
+        if param_range is not None:
+            (lo, hi) = param_range
+            mask = np.full(len(param), True)
+            if lo is not None:
+                rows = rows & (pc.field("param") >= lo)
+                mask &= param >= lo
+            if hi is not None:
+                # Slopes only if last breakpoint is loaded
+                if len(param) > 0 and hi >= param[-1]:
+                    rows = rows & ((pc.field("param") <= hi) | (pc.field("param") == np.inf))
+                else:
+                    rows = rows & (pc.field("param") <= hi)
+                mask &= param <= hi
+            param = param[mask]
+            if arr_cost is not None:
+                arr_cost = arr_cost[mask]
+        
+        def read(index, value, indices):
+            # Values of shape (B, k) and slopes of selected edges (nodes)
+            if indices is None:
+                selected = pc.field(index).is_valid()
+            else:
+                indices = np.asarray(indices, dtype=int).ravel()
+                if len(indices) == 0:
+                    return (np.empty((len(param), 0)), None)
+                selected = pc.field(index).isin(np.unique(indices))
+            table = pq.read_table(file, columns=["param", index, value],
+                                  filters=selected & rows)
+            idx = table.column(index).to_numpy()
+            p = table.column("param").to_numpy()
+            # Rows of every edge (node) are in order of breakpoints
+            order = np.argsort(idx, kind="stable")
+            unique = np.unique(idx)
+            if indices is None:
+                if len(unique) == 0:
+                    return (None, None)
+                indices = unique
+            elif not np.array_equal(unique, np.unique(indices)):
+                raise IndexError(f"{index} index out of range of file")
+            
+            has_slope = bool(np.isinf(p[order[-1]]))
+            num_rows = len(param) + has_slope
+            vals = table.column(value).to_numpy()[order].reshape(len(unique), num_rows).T
+            vals = vals[:, np.searchsorted(unique, indices)]
+            if has_slope is True:
+                return (vals[:-1], vals[-1])
+            return (vals, None)
+        
+        arr_flow, dflow = read("edge", "flow", edges)
+        arr_pot, dpi = read("node", "potential", nodes)
+        if arr_pot is not None and arr_pot.shape[1] == 0:
+            arr_pot = None
+        
+        return cls.from_arrays(param, arr_flow, arr_pot, arr_cost, dflow, dpi)
+
     @classmethod
     def from_npz(
             cls,
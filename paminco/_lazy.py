@@ -0,0 +1,60 @@
+"""Lazy loading of subpackages and attributes.
+
+Subpackages of paminco import their submodules and the heavy optional
+dependencies (matplotlib, pandas, scipy.optimize, lxml, ...) only when
+an attribute is accessed for the first time, see :pep:`562`.
+"""
+import importlib
+
+
+def attach(package_name: str, submodules=(), attributes=None):
+    """Attach lazily loaded submodules and attributes to a package.
+
+    Parameters
+    ----------
+    package_name : str
+        Name of the package, i.e., ``__name__`` in ``__init__.py``.
+    submodules : sequence of str, default=()
+        Names of submodules that are imported on first access.
+    attributes : dict, optional
+        Map attribute names to names of the (relative) submodules that
+        define them.
+
+    Returns
+    -------
+    __getattr__ : callable
+        Module level ``__getattr__`` for the package.
+    __dir__ : callable
+        Module level ``__dir__`` for the package.
+    __all__ : list of str
+        Names of all lazily loaded submodules and attributes.
+
+    Examples
+    --------
+    In ``__init__.py`` of a package:
+
+    >>> __getattr__, __dir__, __all__ = attach(
+    ...     __name__,
+    ...     submodules=["efa"],
+    ...     attributes={"EFA": "efa"},
+    ... )  # doctest: +SKIP
+    """
+    submodules = set(submodules)
+    attributes = {} if attributes is None else dict(attributes)
+    names = sorted(submodules | set(attributes))
+
+    def __getattr__(name):
+        if name in submodules:
+            return importlib.import_module("." + name, package_name)
+        if name in attributes:
+            module = importlib.import_module("." + attributes[name], package_name)
+            value = getattr(module, name)
+            # Bind to package, __getattr__ is not called again
+            setattr(importlib.import_module(package_name), name, value)
+            return value
+        raise AttributeError(f"module {package_name!r} has no attribute {name!r}")
+
+    def __dir__():
+        return sorted(set(names) | set(vars(importlib.import_module(package_name))))
+
+    return __getattr__, __dir__, names
@@ -1,11 +1,16 @@
 # flake8: noqa
 
-from . import efa
-from . import mca
-from . import mcfi
-from .efa import EFA, EFAConfig
-from .mca import MCA, MCAConfig
-from .mcfi import MCFI, MCFIConfig
+from paminco._lazy import attach
 
-
-__all__ = [s for s in dir() if not s.startswith("_")]
+__getattr__, __dir__, __all__ = attach(
+    __name__,
+    submodules=["efa", "mca", "mcfi"],
+    attributes={
+        "EFA": "efa",
+        "EFAConfig": "efa",
+        "MCA": "mca",
+        "MCAConfig": "mca",
+        "MCFI": "mcfi",
+        "MCFIConfig": "mcfi",
+    },
+)
@@ -2,12 +2,11 @@ from __future__ import annotations
 from copy import deepcopy
 
 import numpy as np
-import pandas as pd
 import scipy.sparse as sps
 
 from paminco._base import ParametricSolver, Config, ParametricSolution
 from paminco.callback import CallBackFlag
-from paminco.linalg import InverseMethod, SingularLaplaceError
+from paminco.linalg import InverseMethod, SingularLaplaceError, FactorizationCache
 from paminco.net.network import Network
 from paminco.net.demand import LinearDemandFunction, AffineDemandFunction
 from paminco.net.cost import PiecewiseQuadraticCoefficients, PiecewiseQuadraticCost
@@ -117,6 +116,8 @@ class EFAEdges:
         return len(self.source_target)
     
     def to_df(self) -> pd.DataFrame:
+        import pandas as pd
+        
         cols = ["s", "t", "region", "flow", "gamma_dpi", "gamma_pi_t",
                 "round_gamma_dpi", "ll", "lu"]
         data = {k: getattr(self, k) for k in cols}
@@ -197,6 +198,8 @@ class NodePotentials:
         return len(self.node_idx)
     
     def to_df(self) -> pd.DataFrame:
+        import pandas as pd
+        
         cols = ["node_idx", "node_lbl", "pi", "pi_t", "dpi_t", "dtilde"]
         data = {k: getattr(self, k) for k in cols}
         df = pd.DataFrame(data)
@@ -263,6 +266,9 @@ class EFAConfig(Config):
         Set gamma_dpi with low exponent (in `IEEE754 <https://en.wikipedia.org/wiki/IEEE_754>`_) to zero.
     rounding_margins_fac : int, default=-5
         Set gamma_dpi with low exponent (in `IEEE754 <https://en.wikipedia.org/wiki/IEEE_754>`_) to zero.
+    factor_cache_size : int, default=2**27
+        Maximum size in bytes of inverse Laplacians that are cached and
+        reused if a region is visited again. If 0, nothing is cached.
     """
 
     all_options = [
@@ -275,6 +281,7 @@ class EFAConfig(Config):
         "round_lambda",
         "rounding_margins_base",
         "rounding_margins_fac",
+        "factor_cache_size",
     ]
     """All available settings for EFA."""
 
@@ -295,6 +302,7 @@ class EFAConfig(Config):
         self.round_lambda = 3
         self.rounding_margins_base = -16
         self.rounding_margins_fac = -5
+        self.factor_cache_size = 2**27
         
         self.map_kwargs(run=False, **kwargs)
 
@@ -443,6 +451,12 @@ class EFA(ParametricSolver):
         # setup properites
         self.min_edge = None
         
+        # Cost coefficients of current region
+        self._ec = None
+        
+        # Inverse Laplacians of visited regions
+        self.factor_cache = FactorizationCache(self._c.factor_cache_size)
+        
         # Storing breakpoint solutions
         self._param_solution = ParametricSolution()
         
@@ -528,47 +542,57 @@ class EFA(ParametricSolver):
         self._run_cb = run_cb
         self.callback(CallBackFlag.RUN_START, run_cb)
         
-        # Set initial values for run
-        self.i = 1
-        self.lambda_min = 0
-        self.lambda_max = None
-        self.breakflag = EFABreakFlag.NOT_SET
-        self._set_rounding_margins()
-        self._initial_region()
-        self._calculate_inv(force_recomputation=True)
-        
-        self.callback(CallBackFlag.ITER_PRE, run_cb)
-        
-        # loop through algorithm until some break condition is met
-        while self.breakflag == EFABreakFlag.NOT_SET:
-            self.callback(CallBackFlag.ITER_START, run_cb)
-            
-            # Set to None to avoid misuse
+        prof = self.profiler
+        with prof.span("run"):
+            # Set initial values for run
+            self.i = 1
+            self.lambda_min = 0
             self.lambda_max = None
+            self.breakflag = EFABreakFlag.NOT_SET
+            self.factor_cache.max_bytes = self._c.factor_cache_size
+            self._set_rounding_margins()
+            with prof.span("initial_region"):
+                self._initial_region()
+            with prof.span("calculate_inv"):
+                self._calculate_inv(force_recomputation=True)
             
-            # Compute potentials, flows and save solution
-            self._compute_potentials()
-            self._compute_flows()
-            self._add_param_solution(self.lambda_min,
-                                     self._e.flow.copy(),
-                                     potential=self._np.pi)
-            self._pivot_step()
-            
-            # Iteration cleanup
-            self.callback(CallBackFlag.ITER_END, run_cb)
-            if self.i == (self._c.max_iter):
-                self.breakflag = EFABreakFlag.MAX_ITER
-            self.i += 1
+            self.callback(CallBackFlag.ITER_PRE, run_cb)
             
-        # Find flow for lambda_max if pivot step would follow
-        if self.breakflag._execute_pivot():
-            self.lambda_min = self.lambda_max
-            self.lambda_max = np.inf
-            self._compute_potentials()
-            self._compute_flows()
-            self._add_param_solution(self.lambda_min,
-                                     self._e.flow.copy(),
-                                     potential=self._np.pi)
+            # loop through algorithm until some break condition is met
+            while self.breakflag == EFABreakFlag.NOT_SET:
+                self.callback(CallBackFlag.ITER_START, run_cb)
+                
+                with prof.span("iteration"):
+                    # Set to None to avoid misuse
+                    self.lambda_max = None
+                    
+                    # Compute potentials, flows and save solution
+                    with prof.span("compute_potentials"):
+                        self._compute_potentials()
+                    with prof.span("compute_flows"):
+                        self._compute_flows()
+                    self._add_param_solution(self.lambda_min,
+                                             self._e.flow.copy(),
+                                             potential=self._np.pi)
+                    self._pivot_step()
+                
+                # Iteration cleanup
+                self.callback(CallBackFlag.ITER_END, run_cb)
+                if self.i == (self._c.max_iter):
+                    self.breakflag = EFABreakFlag.MAX_ITER
+                self.i += 1
+                
+            # Find flow for lambda_max if pivot step would follow
+            if self.breakflag._execute_pivot():
+                self.lambda_min = self.lambda_max
+                self.lambda_max = np.inf
+                with prof.span("compute_potentials"):
+                    self._compute_potentials()
+                with prof.span("compute_flows"):
+                    self._compute_flows()
+                self._add_param_solution(self.lambda_min,
+                                         self._e.flow.copy(),
+                                         potential=self._np.pi)
         
         self.callback(CallBackFlag.RUN_END, run_cb)
         
@@ -579,18 +603,22 @@ class EFA(ParametricSolver):
         if self.breakflag == EFABreakFlag.LAMBDA_INF:
             self.i -= 1
             self._print_iteration_summary()
-            dflow = (1 / (2 * self._ec.a) * self._net.times_gamma(self._np.dpi_t))
+            dflow = self._net.potential_flow(self._np.dpi_t, self._ec.a)
             dpi_ = self._np.dpi_t
         self.close_run(dflow=dflow, dpi=dpi_)
 
     def _pivot_step(self) -> None:
-        self._compute_boundary()
+        prof = self.profiler
+        with prof.span("compute_boundary"):
+            self._compute_boundary()
         if self.breakflag._execute_pivot():
             self.lambda_min = self.lambda_max
-            self._select_boundary()
+            with prof.span("select_boundary"):
+                self._select_boundary()
             self._update_region()
             self._print_iteration_summary()
-            self._calculate_inv()
+            with prof.span("calculate_inv"):
+                self._calculate_inv()
 
     def _initial_region(self) -> None:
         # Determine inital region for linear or affine demands
@@ -626,6 +654,7 @@ class EFA(ParametricSolver):
         cost_of_zero_flow = self.network.cost.ddx(np.zeros(self.network.m))
         
         # Compute shortest path potential starting from a random source
+        self.profiler.count("dijkstra")
         first_source = self.network.demand.b.source_id[0]
         pot, _ = self.network.shortest_path(weight=cost_of_zero_flow,
                                             s=first_source,
@@ -640,7 +669,7 @@ class EFA(ParametricSolver):
         return init_region
     
     def _initial_region_affine(self):
-        network = deepcopy(self.network)
+        network = self.network.view()
         network._d = LinearDemandFunction(network.demand.b0, shared=network.shared)
 
         self.efa_phase1 = EFA(
@@ -648,6 +677,9 @@ class EFA(ParametricSolver):
             preprocess_network=False, 
             lambda_max=1,
             phase1_of=self)
+        self.efa_phase1.profiler = self.profiler
+        # Phase 2 may revisit regions of phase 1
+        self.efa_phase1.factor_cache = self.factor_cache
         
         if self._c.print is True:
             print("=" * 11 + " START OF PHASE 1 " + "=" * 11)
@@ -688,9 +720,11 @@ class EFA(ParametricSolver):
 
     def _update_cost_coeffs(self) -> None:
         # Update cost coefficients for edges by current region
-        self._ec = self._net.cost.get_coefficients(at=self._e.region,
-                                                   is_region=True)
-        self._np.d_tilde = self._net.gamma_times(self._ec.d)
+        with self.profiler.span("update_cost_coeffs"):
+            self._ec = self._net.cost.get_coefficients(at=self._e.region,
+                                                       is_region=True,
+                                                       out=self._ec)
+            self._np.d_tilde = self._net.gamma_times(self._ec.d)
 
     def _calculate_inv(
             self,
@@ -703,9 +737,15 @@ class EFA(ParametricSolver):
                 if self.i % self._c.recomp_interval == 0:
                     recompute = True
             if recompute:
-                # recompute inverse
+                # recompute inverse (or reuse it if region was visited)
+                hits = self.factor_cache.hits
                 self.Lstar = self._net.Lstar(region=self.region,
-                                             method=self._c.inverse_method)
+                                             method=self._c.inverse_method,
+                                             cache=self.factor_cache)
+                if self.factor_cache.hits > hits:
+                    self.profiler.count("factor_cache_hits")
+                else:
+                    self.profiler.count("factorizations")
             else:
                 # Update inverse
                 # calculate diff in c as if region has not been updated
@@ -713,10 +753,12 @@ class EFA(ParametricSolver):
                 dc = self._net.cost.delta_c(region=edge_region,
                                             step=self.region_activate,
                                             edge=self.min_edge)
+                self.profiler.count("rank1_updates")
                 self.Lstar = self._net.Lstar_update(self.Lstar,
                                                     self.min_edge,
                                                     dc)
         except SingularLaplaceError as sle:
+            self.profiler.count("singular_laplacians")
             self._fix_region(sle)
             self._calculate_inv(force_recomputation=True)
 
@@ -803,12 +845,14 @@ class EFA(ParametricSolver):
         b = self._net._d.ddx(self.lambda_min)
         self._np.dpi_t = self.Lstar.dot(b).ravel()
         self._np.pi = (self._np.pi_t + self._np.dpi_t * (self.lambda_min)).ravel()
-        self._e.gamma_pi_t = self._net.times_gamma(self._np.pi_t)
+        self._e.gamma_pi_t = self._net.times_gamma(self._np.pi_t,
+                                                   out=self._e.gamma_pi_t)
         self._e.gamma_dpi = self._net.times_gamma(self._np.dpi_t)
 
     def _compute_flows(self) -> None:
-        self._e.flow = (1 / (2 * self._ec.a) * self._net.times_gamma(self._np.pi)
-                        - self._ec.d)
+        # Flow is copied when a run closes, buffer can be reused
+        self._e.flow = self._net.potential_flow(self._np.pi, self._ec.a,
+                                                self._ec.d, out=self._e.flow)
 
     def _compute_boundary(self) -> None:
         # Get lower and upper lambda bounds and set boundary edges
@@ -864,6 +908,9 @@ class EFA(ParametricSolver):
                                       self._e.lu == self.lambda_max)
         bounds = np.logical_or(lower_bounds, upper_bounds)
         self.boundary_edges = np.where(bounds)[0]
+        if len(self.boundary_edges) > 1:
+            self.profiler.count("boundary_ties")
+            self.profiler.count("boundary_tie_edges", len(self.boundary_edges))
 
     def _select_boundary(self) -> None:
         # TODO: is das hier sinnvoll abzubrechen wenn some break conditions gefunden wurden? Wenn ja welche?
@@ -882,15 +929,16 @@ class EFA(ParametricSolver):
             # lexicographic mode
             self.M = np.zeros(shape=(self._net.n, len(self.boundary_edges)))
             
-            self.Lstar_cache = self.Lstar.toarray()
-            
-            # loop through boundary edges, compute vector and update M
-            for j, edge in enumerate(self.boundary_edges):
-                # self._lex_rule_compute_m_vec(edge, j)
-                self._lex_rule_compute_m_vec2(edge, j)
+            with self.profiler.span("lex_rule"):
+                self.Lstar_cache = self.Lstar.toarray()
                 
-            # find smallest column (lexicographically) in M matrix -> min edge
-            min_m = find_min_col_lex(self.M)
+                # loop through boundary edges, compute vector and update M
+                for j, edge in enumerate(self.boundary_edges):
+                    # self._lex_rule_compute_m_vec(edge, j)
+                    self._lex_rule_compute_m_vec2(edge, j)
+                    
+                # find smallest column (lexicographically) in M matrix -> min edge
+                min_m = find_min_col_lex(self.M)
             self.min_edge = self.boundary_edges[min_m]
         
         # check whether edge region was incremented or decremented
@@ -971,6 +1019,10 @@ class EFA(ParametricSolver):
     def edges(self) -> EFAEdges:
         """Object that keeps track of edge values for current region.
         
+        Arrays like ``flow`` and ``gamma_pi_t`` are buffers that are
+        overwritten inplace on every pivot, copy them to keep the values
+        of an iteration.
+        
         See Also
         --------
         EFAEdges
@@ -981,9 +1033,13 @@ class EFA(ParametricSolver):
     def edge_coeffs(self) -> PiecewiseQuadraticCoefficients:
         """Edge coefficients for current region.
         
+        The coefficients are a buffer that is overwritten inplace on
+        every pivot. Use ``copy.deepcopy(edge_coeffs)`` to keep the
+        coefficients of an iteration, e.g., in a callback.
+        
         See Also
         --------
-        paminco.net.cost.sPiecewiseQuadraticCoefficients
+        paminco.net.cost.PiecewiseQuadraticCoefficients
         """
         return self._ec
 
@@ -1,3 +1,8 @@
+import hashlib
+import os
+import shutil
+import tempfile
+
 import numpy as np
 import scipy.sparse as sps
 
@@ -7,6 +12,7 @@ from paminco.callback import CallBackFlag
 from paminco.net.network import Network
 from paminco.net.cost import InterpolationRule, PiecewiseQuadraticCoefficients, PiecewiseQuadraticCost
 from paminco.utils.bisec import bisec_fast
+from paminco.utils.io import save_npy_dir, NpyDirectory
 from paminco.utils.misc import callback_to_list
 
 
@@ -79,7 +85,7 @@ class MCAInterpolationRule(InterpolationRule):
 
     def step(
             self,
-            edge_cost,
+            cost,
             edge: int,
             x: float
             ) -> float:
@@ -90,11 +96,12 @@ class MCAInterpolationRule(InterpolationRule):
 
         Parameters
         ----------
-        edge_cost: EdgeCost
-            The :class:`~paminco.net.cost.EdgeCost` object representing the edge cost function
-            :math:`F(x)`.
+        cost: NetworkCost
+            The :class:`~paminco.net.cost.NetworkCost` that is interpolated.
+            The edge cost function :math:`F(x)` is evaluated by
+            :meth:`~paminco.net.cost.NetworkCost.edge_value`.
         edge: int
-            The index of the edge. Only for debugging purposes, can also be None.
+            The index of the edge.
         x: float
             The last breakpoint.
         
@@ -105,16 +112,16 @@ class MCAInterpolationRule(InterpolationRule):
         """
         
         def f(x):
-            return edge_cost(x, d=1)
+            return cost.edge_value(edge, x, d=1)
         
         def f2(x):
-            return edge_cost(x, d=3)
+            return cost.edge_value(edge, x, d=3)
         
         # If the cost that are interpolated are polynomials
         # and the degree of the polynomial is less or equal 2
         # than no interpolation is needed => return infinite
         # step size
-        if edge_cost.degree <= 2:
+        if getattr(cost, "degree", np.inf) <= 2:
             return np.inf
         
         y1 = abs(f(x))
@@ -151,6 +158,146 @@ class MCAInterpolationRule(InterpolationRule):
         return delta
 
 
+class InterpolationCache:
+    """On-disk cache of piecewise quadratic interpolations of network costs.
+    
+    Interpolating the cost of large networks with
+    :class:`MCAInterpolationRule` is expensive, but deterministic for
+    given cost coefficients, edge bounds and rule parameters. This cache
+    stores the resulting :class:`~paminco.net.cost.PiecewiseQuadraticCost`
+    in a subdirectory of ``path`` named by a hash of these inputs. The
+    coefficients are saved with :func:`~paminco.utils.io.save_npy_dir`
+    and memory-mapped when loaded.
+    
+    Parameters
+    ----------
+    path : str
+        Cache directory, created if it does not exist.
+    mmap_mode : {None, 'r', 'c'}, default='c'
+        Memory-map mode for loading coefficients, see
+        :func:`numpy.load`. ``'c'`` (copy-on-write) shares the pages of
+        all processes until coefficients are modified.
+    
+    Attributes
+    ----------
+    hits : int
+        Number of interpolations loaded from disk.
+    misses : int
+        Number of interpolations computed.
+    
+    See Also
+    --------
+    MCAConfig : Option ``cost_cache_dir``.
+    
+    Examples
+    --------
+    >>> import tempfile
+    >>> import paminco
+    >>> net = paminco.net.load_sioux()
+    >>> net.set_demand(("1", "20", 10000))
+    >>> path = tempfile.mkdtemp()
+    >>> mca = paminco.MCA(net, cost_cache_dir=path)
+    >>> mca = paminco.MCA(net, cost_cache_dir=path)  # loaded from disk
+    >>> mca.cost_cache.hits
+    1
+    """
+    
+    version = 1
+    """Version of interpolation, part of the key."""
+    
+    def __init__(self, path: str, mmap_mode: str = "c") -> None:
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self.mmap_mode = mmap_mode
+        self.hits = 0
+        self.misses = 0
+    
+    def __repr__(self) -> str:
+        return (f"InterpolationCache('{self.path}', "
+                f"hits={self.hits}, misses={self.misses})")
+    
+    def key(self, cost, rule: MCAInterpolationRule) -> str:
+        """Get key for the interpolation of ``cost`` by ``rule``.
+        
+        Parameters
+        ----------
+        cost : NetworkCost
+            Cost to interpolate, its coefficients, dtypes and the bounds
+            of its edges enter the key.
+        rule : MCAInterpolationRule
+            Rule for breakpoints.
+        
+        Returns
+        -------
+        str
+            Hex digest.
+        """
+        h = hashlib.blake2b(digest_size=20)
+        h.update(str(self.version).encode())
+        for (k, v) in sorted(cost.make_save_dict().items()):
+            h.update(k.encode())
+            v = np.asarray(v)
+            h.update(f"{v.dtype.str}{v.shape}".encode())
+            if v.dtype.hasobject:
+                h.update(repr(v.tolist()).encode())
+            else:
+                h.update(np.ascontiguousarray(v).data)
+        shared = cost.shared
+        h.update(f"{np.dtype(shared.dtype_float).str}{np.dtype(shared.dtype_int).str}".encode())
+        h.update(np.ascontiguousarray(shared.edges.bounds, dtype=np.float64).data)
+        rule_params = [rule.alpha, rule.beta, rule.m, rule.x_max, rule.accuracy]
+        h.update(np.array(rule_params, dtype=np.float64).data)
+        return h.hexdigest()
+    
+    def get(self, key: str, shared=None):
+        """Load interpolated cost for ``key``, None if not cached."""
+        path = os.path.join(self.path, key)
+        if os.path.isdir(path) is False:
+            self.misses += 1
+            return None
+        data = NpyDirectory(path, mmap_mode=self.mmap_mode)
+        self.hits += 1
+        return PiecewiseQuadraticCost.from_npz(data, shared=shared, copy=False)
+    
+    def put(self, key: str, cost: PiecewiseQuadraticCost) -> None:
+        """Save interpolated cost for ``key``."""
+        # Write to temporary directory first, move into place in one
+        # step -> concurrent processes never see partial entries
+        tmp = tempfile.mkdtemp(prefix=".tmp-", dir=self.path)
+        try:
+            save_npy_dir(tmp, cost.make_save_dict())
+            os.rename(tmp, os.path.join(self.path, key))
+        except OSError:
+            # entry written by other process in the meantime
+            shutil.rmtree(tmp, ignore_errors=True)
+    
+    def interpolate(self, cost, rule: MCAInterpolationRule) -> PiecewiseQuadraticCost:
+        """Get cached interpolation of ``cost`` or compute and store it.
+        
+        Parameters
+        ----------
+        cost : NetworkCost
+            Cost to interpolate.
+        rule : MCAInterpolationRule
+            Rule for breakpoints.
+        
+        Returns
+        -------
+        PiecewiseQuadraticCost
+        """
+        key = self.key(cost, rule)
+        pwq = self.get(key, shared=cost.shared)
+        if pwq is None:
+            pwq = cost.interpolate(rule)
+            self.put(key, pwq)
+        return pwq
+    
+    def clear(self) -> None:
+        """Delete all cached interpolations."""
+        for entry in os.listdir(self.path):
+            shutil.rmtree(os.path.join(self.path, entry), ignore_errors=True)
+
+
 class MCAConfig(EFAConfig):
     """Settings for MCA algorithms.
     
@@ -185,6 +332,9 @@ class MCAConfig(EFAConfig):
         Set gamma_dpi with low exponent (in `IEEE754 <https://en.wikipedia.org/wiki/IEEE_754>`_) to zero.
     rounding_margins_fac : int, default=-5
         Set gamma_dpi with low exponent (in `IEEE754 <https://en.wikipedia.org/wiki/IEEE_754>`_) to zero.
+    cost_cache_dir : str, optional
+        If given, interpolated costs are stored in and loaded from this
+        directory, see :class:`InterpolationCache`.
         
     """
     
@@ -194,6 +344,7 @@ class MCAConfig(EFAConfig):
         "beta",
         "interpolation_step_size",
         "interpolation_accuracy",
+        "cost_cache_dir",
     ]
     
     def __init__(self, **kwargs):
@@ -202,6 +353,7 @@ class MCAConfig(EFAConfig):
         self.beta = 1
         self.interpolation_accuracy = 1e-3
         self.interpolation_step_size = None
+        self.cost_cache_dir = None
         
         # ? TODO-PW: alpha-beta approxim for equation check in interpolation instead of abs difference
         
@@ -335,8 +487,14 @@ class MCA(AlphaBetaApproximativeSolver):
         # MCA settings
         self._c = MCAConfig(**kwargs)
         
+        # Interpolated costs on disk
+        self.cost_cache = None
+        if self._c.cost_cache_dir is not None:
+            self.cost_cache = InterpolationCache(self._c.cost_cache_dir)
+        
         # Prepare network be run with EFA
-        self._cost_to_piecewise()
+        with self.profiler.span("cost_to_piecewise"):
+            self._cost_to_piecewise()
         
         # Pass prepped network to EFA
         self.efa = EFA(
@@ -364,13 +522,19 @@ class MCA(AlphaBetaApproximativeSolver):
                 x_max=x_max,
                 accuracy=self.config.interpolation_accuracy
             )
-            self._net._c = self._net.cost.interpolate(iprule)
+            if self.cost_cache is None:
+                self._net._c = self._net.cost.interpolate(iprule)
+            else:
+                hits = self.cost_cache.hits
+                self._net._c = self.cost_cache.interpolate(self._net.cost, iprule)
+                self.profiler.count("cost_cache_hits", self.cost_cache.hits - hits)
     
     def run(self, callback=None, **kwargs):
         if callback:
             callback = self.callbacks + callback_to_list(callback)
         else:
             callback = self.callbacks
+        self.efa.profiler = self.profiler
         self.efa.run(callback=callback, **kwargs)
         
     @property
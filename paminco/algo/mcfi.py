@@ -3,10 +3,10 @@ from __future__ import annotations
 import copy
 
 import numpy as np
-import scipy.optimize as scopt
 
 from paminco._base import AlphaBetaApproximativeSolver, Config, ParametricSolution
 from paminco.callback import CallBackFlag
+from paminco.linalg import FactorizationCache
 from paminco.net.demand import AffineDemandFunction
 from paminco.net.network import Support, Network
 from paminco.utils.misc import callback_to_list
@@ -52,6 +52,9 @@ class MCFIConfig(Config):
         If True and feasible, optimizer is warmstarted.
     print : bool
         if True, an interation summary is printed after each iteration.
+    factor_cache_size : int
+        Maximum size in bytes of inverse Laplacians cached while
+        computing support steps. If 0, nothing is cached.
         
     See also
     --------
@@ -67,6 +70,7 @@ class MCFIConfig(Config):
         "epsilon",
         "warmstart",
         "print",
+        "factor_cache_size",
     ]
     
     def __init__(self, **kw):
@@ -78,6 +82,7 @@ class MCFIConfig(Config):
         self.epsilon = 1e-3
         self.warmstart = True
         self.print = False
+        self.factor_cache_size = 2**27
         
         self.map_kwargs(**kw)
 
@@ -191,6 +196,9 @@ class MCFI(AlphaBetaApproximativeSolver):
         # Storing breakpoint solutions
         self._param_solution = ParametricSolution()
         
+        # Inverse Laplacians used in support steps
+        self.factor_cache = FactorizationCache(self.config.factor_cache_size)
+        
         # Flag end of iteration to listeners
         self.callback(CallBackFlag.INIT_END)
 
@@ -243,6 +251,8 @@ class MCFI(AlphaBetaApproximativeSolver):
             self.config.warmstart = False
         
         self.i = 0
+        self.factor_cache.max_bytes = self.config.factor_cache_size
+        self.optim.profiler = self.profiler
         if param is None:
             self._check_adaptive_conditions()
             self._run_adaptive(callback)
@@ -252,13 +262,14 @@ class MCFI(AlphaBetaApproximativeSolver):
             raise ValueError("'param' must be None or Iterable.")
 
     def _run_single_fw(self, param: float, warmstart=None):
-        if self.config.warmstart is True:
-            self.optim.run(param=param, warmstart=warmstart)
-            warmstart = LinearWarmstart(self.optim.flow, param)
-            return self.optim.flow, warmstart
-        else:
-            self.optim.run(param=param)
-            return self.optim.flow, None
+        with self.profiler.span("optimize"):
+            if self.config.warmstart is True:
+                self.optim.run(param=param, warmstart=warmstart)
+                warmstart = LinearWarmstart(self.optim.flow, param)
+                return self.optim.flow, warmstart
+            else:
+                self.optim.run(param=param)
+                return self.optim.flow, None
 
     def _run_with_params(self, params=None, callback=None) -> None:
         # Handle callback
@@ -272,8 +283,9 @@ class MCFI(AlphaBetaApproximativeSolver):
             self.callback(CallBackFlag.ITER_START, run_cb)
             
             # Run instance of FW for param
-            flow, warmstart = self._run_single_fw(p, warmstart)
-            self._add_param_solution(p, flow.copy())
+            with self.profiler.span("iteration"):
+                flow, warmstart = self._run_single_fw(p, warmstart)
+                self._add_param_solution(p, flow.copy())
             
             self.callback(CallBackFlag.ITER_END, run_cb)
             self._print_iteration_summary()
@@ -313,7 +325,10 @@ class MCFI(AlphaBetaApproximativeSolver):
         flow = None
         
         # Find an s-t-pair decomposition of the demand
-        self.demand_decomposed = copy.deepcopy(self.network.demand)
+        # (copy demand only, not the shared network elements it refers to)
+        demand = self.network.demand
+        self.demand_decomposed = copy.deepcopy(demand,
+                                               {id(demand.shared): demand.shared})
         self.demand_decomposed.to_single_pairs()
         self.demand_decomposed.reset_cache()
         
@@ -323,51 +338,55 @@ class MCFI(AlphaBetaApproximativeSolver):
             self.i += 1
             self.callback(CallBackFlag.ITER_START, run_cb)
             
-            # STEP 1): find next param, not needed in first iteration
-            if self.i > 1:
-                if self.config.adaptive_method == AdaptiveMethod.BASIC:
-                    # Use only support free steps
-                    delta = self._support_free_step(param,
-                                                    flow,
-                                                    last_delta=delta)
-                    param += delta
-                else:
-                    # Try support step
-                    tmp_delta = self._support_step(param,
-                                                   flow,
-                                                   supp,
-                                                   last_delta=delta)
-                    flow_tmp, warmstart_tmp = self._run_single_fw(param + tmp_delta,
-                                                                  warmstart)
-                    
-                    if self.network.support_of(flow_tmp) == supp:
-                        # Solution compliant with the previous support,
-                        # i.e., flow_tmp is valid for next param
-                        param += tmp_delta
-                        warmstart = warmstart_tmp
-                    else:
-                        # Use support free step to recalc flow for param
-                        delta = self._support_free_step(param,
-                                                        flow,
-                                                        last_delta=delta)
+            with self.profiler.span("iteration"):
+                # STEP 1): find next param, not needed in first iteration
+                if self.i > 1:
+                    if self.config.adaptive_method == AdaptiveMethod.BASIC:
+                        # Use only support free steps
+                        with self.profiler.span("support_free_step"):
+                            delta = self._support_free_step(param,
+                                                            flow,
+                                                            last_delta=delta)
                         param += delta
-                        flow_tmp = None
+                    else:
+                        # Try support step
+                        with self.profiler.span("support_step"):
+                            tmp_delta = self._support_step(param,
+                                                           flow,
+                                                           supp,
+                                                           last_delta=delta)
+                        flow_tmp, warmstart_tmp = self._run_single_fw(param + tmp_delta,
+                                                                      warmstart)
+                    
+                        if self.network.support_of(flow_tmp) == supp:
+                            # Solution compliant with the previous support,
+                            # i.e., flow_tmp is valid for next param
+                            param += tmp_delta
+                            warmstart = warmstart_tmp
+                        else:
+                            # Use support free step to recalc flow for param
+                            with self.profiler.span("support_free_step"):
+                                delta = self._support_free_step(param,
+                                                                flow,
+                                                                last_delta=delta)
+                            param += delta
+                            flow_tmp = None
             
-            # STEP 2): find min cost flow for param
-            if (self.config.adaptive_method == AdaptiveMethod.CONSTANT_SUPPORT
-                    and self.i > 1 and flow_tmp is not None):
-                # Reuse fw_tmp from AdaptiveMethod.EXTENDED
-                flow = flow_tmp
-            else:
-                # Run instance of FW for param
-                flow, warmstart = self._run_single_fw(param, warmstart)
+                # STEP 2): find min cost flow for param
+                if (self.config.adaptive_method == AdaptiveMethod.CONSTANT_SUPPORT
+                        and self.i > 1 and flow_tmp is not None):
+                    # Reuse fw_tmp from AdaptiveMethod.EXTENDED
+                    flow = flow_tmp
+                else:
+                    # Run instance of FW for param
+                    flow, warmstart = self._run_single_fw(param, warmstart)
                 
-                # Calc support for extended method
-                if self.config.adaptive_method == AdaptiveMethod.CONSTANT_SUPPORT:
-                    supp = self.network.support_of(flow)
+                    # Calc support for extended method
+                    if self.config.adaptive_method == AdaptiveMethod.CONSTANT_SUPPORT:
+                        supp = self.network.support_of(flow)
             
-            # Store solution
-            self._add_param_solution(param, flow.copy())
+                # Store solution
+                self._add_param_solution(param, flow.copy())
             
             self.callback(CallBackFlag.ITER_END, run_cb)
             self._print_iteration_summary()
@@ -403,6 +422,8 @@ class MCFI(AlphaBetaApproximativeSolver):
         def error_fct(delta: float):
             if isinstance(delta, np.ndarray):
                 delta = delta[0]
+            self.profiler.count("bisection_evaluations")
+            self.profiler.count("dijkstra")
             flow_estimate = np.ones_like(flow) * R * (param + delta)
             weight = self.network.cost.ddx(flow_estimate)
             D, _ = self.network.shortest_path(weight,
@@ -431,6 +452,7 @@ class MCFI(AlphaBetaApproximativeSolver):
             return res
         
         # use scipy fsolve
+        import scipy.optimize as scopt
         res = scopt.fsolve(error_fct, x0, full_output=True)
         if res[2] != 1:
             raise Exception("Function solve did not converge")
@@ -459,6 +481,7 @@ class MCFI(AlphaBetaApproximativeSolver):
         def error_fct(delta):
             if type(delta) == np.ndarray:
                 delta = delta[0]
+            self.profiler.count("bisection_evaluations")
             # In case of delta == 0, the lhs is zero -> return only rhs
             if delta == 0:
                 return -rhs
@@ -472,7 +495,13 @@ class MCFI(AlphaBetaApproximativeSolver):
             # print("ddx2", ddx2)
             weight = np.zeros_like(flow)
             weight[sup.active] = 1 / ddx2[sup.active]
-            norm2 = b.T.dot(net.Lstar(weight).dot(b)).flatten()[0]
+            hits = self.factor_cache.hits
+            lstar = net.Lstar(weight, cache=self.factor_cache)
+            if self.factor_cache.hits > hits:
+                self.profiler.count("factor_cache_hits")
+            else:
+                self.profiler.count("factorizations")
+            norm2 = b.T.dot(lstar.dot(b)).flatten()[0]
             return (delta ** 2) * norm2 - rhs
         
         # solve the (in)equality
@@ -492,6 +521,7 @@ class MCFI(AlphaBetaApproximativeSolver):
             return res
         
         # use scipy fsolve
+        import scipy.optimize as scopt
         res = scopt.fsolve(error_fct, x0, full_output=True)
         if res[2] != 1:
             raise Exception("Function solve did not converge")
@@ -1,10 +1,13 @@
+import os
+import tempfile
+
 import pytest
 import numpy as np
 
 from paminco.net import load_sioux
 from paminco.net.network import Network
 
-from paminco.algo.mca import MCA
+from paminco.algo.mca import MCA, MCAInterpolationRule, InterpolationCache
 from paminco.algo.mcfi import MCFI
 
 
@@ -86,4 +89,43 @@ def test_laplace_recomputation_vs_update():
     mca_up.run()
 
     # Ensure solutions are the same
-    assert np.allclose(mca_re.flow_at(1), mca_up.flow_at(1))
\ No newline at end of file
+    assert np.allclose(mca_re.flow_at(1), mca_up.flow_at(1))
+
+
+class TestInterpolationCache:
+    def test_mca_reuses_interpolation(self):
+        net = load_sioux()
+        net.set_demand(('1', '20', 10000), mode='linear')
+        path = tempfile.mkdtemp()
+        
+        mca0 = MCA(net)
+        mca1 = MCA(net, cost_cache_dir=path)
+        mca2 = MCA(net, cost_cache_dir=path)
+        assert (mca1.cost_cache.hits, mca1.cost_cache.misses) == (0, 1)
+        assert (mca2.cost_cache.hits, mca2.cost_cache.misses) == (1, 0)
+        assert len(os.listdir(path)) == 1
+        assert mca2.network.cost == mca0.network.cost
+        
+        mca0.run()
+        mca2.run()
+        assert np.allclose(mca0.flow_at(1), mca2.flow_at(1))
+        
+        # other rule parameters -> other entry
+        MCA(net, cost_cache_dir=path, alpha=1.1)
+        assert len(os.listdir(path)) == 2
+
+    def test_key(self):
+        net = load_sioux()
+        cache = InterpolationCache(tempfile.mkdtemp())
+        rule = MCAInterpolationRule(1.01, 1, net.m, 1000)
+        key = cache.key(net.cost, rule)
+        assert key == cache.key(net.view().cost, rule)
+        assert key != cache.key(net.cost, MCAInterpolationRule(1.01, 1, net.m, 1001))
+        
+        net.edges.bounds[0, 1] = 100
+        assert key != cache.key(net.cost, rule)
+        net.cost.coefficients[0, 0] += 1
+        assert cache.key(net.cost, rule) != key
+        
+        cache.clear()
+        assert len(os.listdir(cache.path)) == 0
@@ -5,6 +5,7 @@ import copy
 
 import numpy as np
 
+from paminco.utils.misc import GrowableArray
 from paminco.utils.typing import IntEnum2
 
 
@@ -123,7 +124,12 @@ class SimpleTimer:
 
 
 class SimpleDebuggerIterativeModel:
-    """Simple callback that stores copies of the model during run."""
+    """Simple callback that stores copies of the model during run.
+    
+    See Also
+    --------
+    IterationRecorder : Records selected values without copying model.
+    """
 
     def __init__(self) -> None:
         self._debug_copies = {}
@@ -160,3 +166,277 @@ class SimpleDebuggerIterativeModel:
     def _make_debug_copy(self, model, i: int) -> None:
         # customizable
         self._debug_copies[i] = copy.deepcopy(model)
+
+
+class IterationRecorder:
+    """Callback that records selected values of every iteration.
+    
+    In contrast to :class:`SimpleDebuggerIterativeModel`, the model is
+    never copied. Scalar fields are stored in preallocated growable
+    arrays, the edge region is delta encoded, i.e., only edges whose
+    region changed are stored per iteration. The region of any
+    iteration is reconstructed on demand.
+    
+    Only the first model that starts a run is recorded, flags of nested
+    runs (e.g., the phase 1 run of EFA) are ignored.
+    
+    Parameters
+    ----------
+    fields : sequence of str, optional
+        Names of scalar attributes of the model to record. ``None``
+        values are stored as ``-1`` for int fields and ``nan`` else.
+    region : str or None, default="region"
+        Name of the region attribute of the model. If None, no region
+        is recorded.
+    sets : sequence of str, default=("boundary_edges", )
+        Names of attributes that hold a variable number of ints.
+    int_fields : sequence of str, optional
+        Fields to store as int, all other fields are stored as float.
+    capacity : int, default=256
+        Initial number of iterations to allocate space for.
+    
+    Examples
+    --------
+    >>> import paminco
+    >>> from paminco.callback import IterationRecorder
+    >>> net = paminco.net.load_example(2)
+    >>> rec = IterationRecorder()
+    >>> efa = paminco.EFA(net, lambda_max=10, callback=rec)
+    >>> efa.run()
+    >>> len(rec)
+    4
+    >>> rec.to_df()[["lambda_min", "min_edge", "breakflag"]]
+       lambda_min  min_edge  breakflag
+    i                                 
+    1        1.50         2          0
+    2        3.75         1          0
+    3        5.75         0          0
+    4        5.75         0          2
+    >>> rec.region_at(0)
+    array([0, 0, 0])
+    >>> rec.region_at(2)
+    array([0, 1, 1])
+    """
+    
+    default_fields = (
+        "lambda_min",
+        "lambda_max",
+        "min_edge",
+        "region_activate",
+        "breakflag",
+    )
+    """Fields recorded by default, tailored to EFA and MCA."""
+    
+    default_int_fields = ("min_edge", "region_activate", "breakflag")
+    """Fields stored as int by default."""
+
+    def __init__(
+            self,
+            fields=None,
+            region="region",
+            sets=("boundary_edges", ),
+            int_fields=None,
+            capacity: int = 256,
+            ) -> None:
+        if fields is None:
+            fields = self.default_fields
+        if int_fields is None:
+            int_fields = self.default_int_fields
+        self.fields = tuple(fields)
+        self.region = region
+        self.sets = tuple(sets)
+        self.int_fields = set(int_fields) | {"i"}
+        self.capacity = capacity
+        self._reset()
+
+    def __len__(self) -> int:
+        return len(self._values["i"])
+
+    def __getitem__(self, i: int) -> dict:
+        return self.get(i)
+
+    def __call__(self, model, status_flag: CallBackFlag) -> None:
+        if status_flag == CallBackFlag.RUN_START:
+            if self._model is None:
+                self._reset()
+                self._model = model
+            return
+        
+        if model is not self._model:
+            return
+        
+        if status_flag == CallBackFlag.ITER_PRE:
+            if self.region is not None:
+                self._region0 = np.array(getattr(model, self.region), copy=True)
+                self._region = self._region0.copy()
+        elif status_flag == CallBackFlag.ITER_END:
+            self._record(model)
+        elif status_flag == CallBackFlag.RUN_END:
+            self._model = None
+
+    def _reset(self) -> None:
+        self._model = None
+        self._region0 = None
+        self._region = None
+        cap = self.capacity
+        self._values = {}
+        for f in ("i", ) + self.fields:
+            dtype = np.int64 if f in self.int_fields else np.float64
+            self._values[f] = GrowableArray(dtype, cap)
+        # CSR-like storage: offsets into concatenated values
+        self._region_ptr = GrowableArray(np.int64, cap + 1)
+        self._region_ptr.append(0)
+        self._region_edges = GrowableArray(np.int64, cap)
+        self._region_vals = GrowableArray(np.int64, cap)
+        self._set_ptr = {}
+        self._set_vals = {}
+        for s in self.sets:
+            self._set_ptr[s] = GrowableArray(np.int64, cap + 1)
+            self._set_ptr[s].append(0)
+            self._set_vals[s] = GrowableArray(np.int64, cap)
+
+    def _record(self, model) -> None:
+        self._values["i"].append(getattr(model, "i", len(self) + 1))
+        for f in self.fields:
+            v = getattr(model, f, None)
+            if v is None:
+                v = -1 if f in self.int_fields else np.nan
+            self._values[f].append(v)
+        
+        # Store edges whose region changed since last iteration
+        if self._region is not None:
+            region = getattr(model, self.region)
+            changed = np.flatnonzero(region != self._region)
+            self._region[changed] = region[changed]
+            self._region_edges.extend(changed)
+            self._region_vals.extend(region[changed])
+        self._region_ptr.append(len(self._region_edges))
+        
+        for s in self.sets:
+            v = getattr(model, s, None)
+            if v is not None:
+                self._set_vals[s].extend(v)
+            self._set_ptr[s].append(len(self._set_vals[s]))
+
+    def _pos(self, i: int) -> int:
+        # Position of iteration i in records, -1 for state before first
+        # iteration
+        if i == 0:
+            return -1
+        pos = np.flatnonzero(self._values["i"].values == i)
+        if len(pos) == 0:
+            raise KeyError(f"Iteration {i} was not recorded.")
+        return int(pos[-1])
+
+    @property
+    def iterations(self) -> np.ndarray:
+        """ndarray of int: recorded iterations."""
+        return self._values["i"].values
+
+    def field(self, name: str) -> np.ndarray:
+        """Get values of a field for all recorded iterations."""
+        return self._values[name].values
+
+    def set_at(self, name: str, i: int) -> np.ndarray:
+        """Get the values of set ``name`` at end of iteration ``i``."""
+        pos = self._pos(i)
+        if pos < 0:
+            return np.empty(0, dtype=np.int64)
+        ptr = self._set_ptr[name].values
+        return self._set_vals[name].values[ptr[pos]:ptr[pos + 1]].copy()
+
+    def region_changes(self, i: int) -> tuple:
+        """Get edges and their new regions changed in iteration ``i``.
+        
+        Returns
+        -------
+        edges : ndarray
+        regions : ndarray
+        """
+        pos = self._pos(i)
+        if pos < 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        ptr = self._region_ptr.values
+        sl = slice(ptr[pos], ptr[pos + 1])
+        return self._region_edges.values[sl].copy(), self._region_vals.values[sl].copy()
+
+    def region_at(self, i: int) -> np.ndarray:
+        """Reconstruct the region at the end of iteration ``i``.
+        
+        Parameters
+        ----------
+        i : int
+            Iteration, ``0`` denotes the initial region (before first
+            iteration).
+        
+        Returns
+        -------
+        ndarray
+            Region of all edges.
+        """
+        if self._region0 is None:
+            raise RuntimeError("No region was recorded.")
+        pos = self._pos(i)
+        region = self._region0.copy()
+        end = self._region_ptr.values[pos + 1]
+        edges = self._region_edges.values[:end]
+        vals = self._region_vals.values[:end]
+        # Only the latest change of every edge is relevant
+        rev_edges = edges[::-1]
+        uniq, idx = np.unique(rev_edges, return_index=True)
+        region[uniq] = vals[::-1][idx]
+        return region
+
+    def get(self, i: int) -> dict:
+        """Get all recorded values at the end of iteration ``i``.
+        
+        Parameters
+        ----------
+        i : int
+            Iteration.
+        
+        Returns
+        -------
+        dict
+            Recorded fields, sets and region (if recorded).
+        """
+        pos = self._pos(i)
+        out = {f: self._values[f].values[pos] for f in self._values}
+        for s in self.sets:
+            out[s] = self.set_at(s, i)
+        if self._region0 is not None:
+            out[self.region] = self.region_at(i)
+        return out
+
+    def replay(self):
+        """Iterate over states of all recorded iterations.
+        
+        Regions are updated incrementally, which is much faster than
+        calling :meth:`get` for every iteration.
+        
+        Yields
+        ------
+        dict
+            State of iteration, see :meth:`get`. The region array is
+            reused between iterations, copy if needed.
+        """
+        region = None if self._region0 is None else self._region0.copy()
+        ptr = self._region_ptr.values
+        for pos in range(len(self)):
+            out = {f: self._values[f].values[pos] for f in self._values}
+            for s in self.sets:
+                sptr = self._set_ptr[s].values
+                out[s] = self._set_vals[s].values[sptr[pos]:sptr[pos + 1]]
+            if region is not None:
+                sl = slice(ptr[pos], ptr[pos + 1])
+                region[self._region_edges.values[sl]] = self._region_vals.values[sl]
+                out[self.region] = region
+            yield out
+
+    def to_df(self):
+        """Get recorded scalar fields as DataFrame indexed by iteration."""
+        import pandas as pd
+        
+        df = pd.DataFrame({f: self._values[f].values for f in self.fields},
+                          index=pd.Index(self.iterations, name="i"))
+        return df
@@ -1,4 +1,6 @@
 import copy
+import hashlib
+from collections import OrderedDict
 
 import numpy as np
 from scipy import sparse
@@ -122,6 +124,8 @@ class CholeskyInverse:
             The result of self<dot>other
         """
         if self._array is not None and not reduced:
+            if sparse.issparse(other):
+                other = other.toarray()
             return self._array.dot(other)
 
         # Cast to numpy array if necessary
@@ -399,3 +403,149 @@ def _star_update_arr(net, lstar, edge: int, delta_c: float):
     fac = delta_c / denominator
     outer_product = np.outer(lstar_gamma, lstar_gamma)
     return lstar - fac * outer_product
+
+
+def _nbytes(obj) -> int:
+    if isinstance(obj, np.ndarray):
+        return obj.nbytes
+    if isinstance(obj, CholeskyInverse):
+        n = obj._cho[0].nbytes
+        if obj._array is not None:
+            n += obj._array.nbytes
+        return n
+    if isinstance(obj, sparse.spmatrix):
+        obj = obj.tocsr()
+        return obj.data.nbytes + obj.indices.nbytes + obj.indptr.nbytes
+    return 0
+
+
+class FactorizationCache:
+    """Bounded LRU cache of (pseudo-)inverse Laplacian factorizations.
+    
+    Factorizations are keyed by a hash of the Laplace weight vector
+    together with the inverse method and the shape of the network. If
+    the total size of all stored factorizations exceeds ``max_bytes``,
+    the least recently used ones are evicted.
+    
+    Parameters
+    ----------
+    max_bytes : int, default=2**27
+        Maximum total size of stored factorizations in bytes (128 MiB).
+        If 0, nothing is cached.
+    
+    Attributes
+    ----------
+    hits : int
+        Number of successful lookups.
+    misses : int
+        Number of failed lookups.
+    evictions : int
+        Number of evicted factorizations.
+    
+    Notes
+    -----
+    Cached objects are shared by all callers and must not be modified
+    inplace. A cache should only be used with networks of the same
+    topology (e.g., a network and its copies), as only the number of
+    nodes and edges enter the key.
+    
+    Examples
+    --------
+    >>> import numpy as np
+    >>> import paminco
+    >>> from paminco.linalg import FactorizationCache
+    >>> net = paminco.net.load_sioux()
+    >>> cache = FactorizationCache()
+    >>> w = np.ones(net.m)
+    >>> lstar = net.Lstar(w, cache=cache)
+    >>> net.Lstar(w, cache=cache) is lstar
+    True
+    >>> cache.hits, cache.misses
+    (1, 1)
+    """
+
+    def __init__(self, max_bytes: int = 2**27) -> None:
+        self.max_bytes = max_bytes
+        self._data = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key) -> bool:
+        return key in self._data
+
+    def __repr__(self) -> str:
+        return (f"FactorizationCache(entries={len(self)}, "
+                f"nbytes={self.nbytes}, max_bytes={self.max_bytes}, "
+                f"hits={self.hits}, misses={self.misses})")
+
+    @staticmethod
+    def key(weight, *args) -> tuple:
+        """Get key of a factorization.
+        
+        Parameters
+        ----------
+        weight : ndarray
+            Laplace weights.
+        args
+            Further hashable values that the factorization depends on,
+            e.g., inverse method and number of nodes.
+        
+        Returns
+        -------
+        tuple
+        """
+        weight = np.ascontiguousarray(weight, dtype=np.float64)
+        digest = hashlib.blake2b(weight.data, digest_size=16).digest()
+        return (digest, len(weight)) + tuple(args)
+
+    @property
+    def nbytes(self) -> int:
+        """int: Total size of stored factorizations in bytes."""
+        return sum(_nbytes(v) for v in self._data.values())
+
+    @property
+    def stats(self) -> dict:
+        """dict: Statistics of cache usage."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self),
+            "nbytes": self.nbytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups > 0 else float("nan"),
+        }
+
+    def get(self, key, default=None):
+        """Get factorization for ``key`` and mark it as recently used."""
+        try:
+            value = self._data[key]
+        except KeyError:
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value) -> None:
+        """Store factorization, evicting least recently used ones."""
+        size = _nbytes(value)
+        if size > self.max_bytes:
+            return
+        self._data[key] = value
+        self._data.move_to_end(key)
+        # Sizes are recomputed as cached inverses may grow (toarray)
+        while len(self._data) > 1 and self.nbytes > self.max_bytes:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """Remove all factorizations and reset statistics."""
+        self._data.clear()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
@@ -1,5 +1,7 @@
 # flake8: noqa
 
+from paminco._lazy import attach
+
 from . import cost
 from . import demand
 from . import network
@@ -10,14 +12,30 @@ from .network import Network
 from .shared import Shared, Nodes, Edges
 from .cost import NetworkCost, PolynomialCost, PiecewiseQuadraticCost, SymbolicCost
 from .demand import demand_vector, DemandFunction, LinearDemandFunction, AffineDemandFunction
-from ._data import DATA_BRAESS
-from ._data_examples import NET_ELECTRICAL_PIECEWISE, NET_ELECTRICAL_BRAESS, NET_DISCONTINUOUS_COST, NET_SIMPLE_POLYNOMIAL
-from ._data_sioux import TNTP_SIOUX_NET, TNTP_SIOUX_NODE, TNTP_SIOUX_TRIPS
-from ._data_gas import temporary_gas_files
-from paminco.utils.readin import FileLineIterator
+
+# Generators and raw data of bundled instances are imported on first access
+__getattr__, __dir__, _lazy = attach(
+    __name__,
+    submodules=["generate"],
+    attributes={
+        "DATA_BRAESS": "_data",
+        "NET_ELECTRICAL_PIECEWISE": "_data_examples",
+        "NET_ELECTRICAL_BRAESS": "_data_examples",
+        "NET_DISCONTINUOUS_COST": "_data_examples",
+        "NET_SIMPLE_POLYNOMIAL": "_data_examples",
+        "TNTP_SIOUX_NET": "_data_sioux",
+        "TNTP_SIOUX_NODE": "_data_sioux",
+        "TNTP_SIOUX_TRIPS": "_data_sioux",
+        "temporary_gas_files": "_data_gas",
+        "load_dataset": "_datasets",
+        "build_dataset": "_datasets",
+        "GAS_DATASETS": "_datasets",
+    },
+)
 
 
 def load_example(num, **kw):
+    from ._data_examples import NET_ELECTRICAL_PIECEWISE
     mapper = {
         2: NET_ELECTRICAL_PIECEWISE,
         "2": NET_ELECTRICAL_PIECEWISE,
@@ -26,19 +44,25 @@ def load_example(num, **kw):
 
 
 def load_sioux(**kw):
-    tntp_net = FileLineIterator(TNTP_SIOUX_NET, is_string=True).dump()
-    tntp_node = FileLineIterator(TNTP_SIOUX_NODE, is_string=True).dump()
-    tntp_trips = FileLineIterator(TNTP_SIOUX_TRIPS, is_string=True).dump()
-    return Network.from_tntp(tntp_net, tntp_trips, tntp_node, **kw)
+    from ._datasets import load_dataset, build_dataset
+    if len(kw) > 0:
+        return build_dataset("sioux", **kw)
+    return load_dataset("sioux")
 
 
 def load_braess(**kw):
+    from ._data import DATA_BRAESS
     return Network(**DATA_BRAESS, **kw)
 
 
 def load_gas(name: str, **kw) -> Network:
-    with temporary_gas_files(name) as files:
-        return Network.from_gaslib(*files, **kw)
+    from ._datasets import load_dataset, build_dataset, GAS_DATASETS
+    name = name.lower().strip()
+    if name not in GAS_DATASETS:
+        raise ValueError(f"Unknown gas network '{name}'")
+    if len(kw) > 0:
+        return build_dataset(name, **kw)
+    return load_dataset(name)
 
 
-__all__ = [s for s in dir() if not s.startswith("_")]
+__all__ = [s for s in dir() if not s.startswith("_")] + _lazy
@@ -1,4 +1,5 @@
 import copy
+import functools
 import math
 from lxml import etree
 import numpy as np
@@ -341,6 +342,46 @@ def class_from_unit(unit):
     raise TypeError('Unknown Unit ' + str(unit))
 
 
+@functools.lru_cache(maxsize=None)
+def si_conversion(unit):
+    """Get factor and offset to convert values in ``unit`` to SI units.
+
+    A value ``x`` in ``unit`` equals ``x * factor + offset`` in SI units.
+    Mixed units such as ``kg_per_m_cube`` are supported if they have no
+    offset.
+
+    Returns
+    -------
+    factor : float
+    offset : float
+    """
+    unit = unit.strip()
+    if unit == '':
+        return 1., 0.
+    try:
+        Q = class_from_unit(unit)
+    except TypeError:
+        Q = unit
+    if isinstance(Q, str):
+        if unit in MIXED_UNITS:
+            un, ud = MIXED_UNITS[unit]
+        else:
+            un, *ud = unit.split('_per_')
+            un = [un]
+        if len(ud) == 0:
+            raise ValueError(f"Could not parse unit {str(unit)}")
+        f = 1.
+        for (units, sgn) in [(un, 1), (ud, -1)]:
+            for u in units:
+                fu, ou = si_conversion(u)
+                if ou != 0:
+                    raise ValueError(f"Unit {u} with offset in mixed unit {unit}")
+                f *= fu ** sgn
+        return f, 0.
+    f, o = Q(1., unit)._unwrap_unit(unit)
+    return f, -o
+
+
 GAS_CONSTANT = MixedQuantity(8.314462618, ['J'], ['mol', 'K'])
 
 
@@ -363,11 +404,9 @@ def indent(elem, level=0):
     return elem
 
 
-def remove_namespace(tag, ns):
-    """Remove namespace from xml tag."""
-    for n in ns.values():
-        tag = tag.replace('{' + n + '}', '')
-    return tag
+def _localname(tag):
+    """Remove any namespace from xml tag."""
+    return tag.rpartition('}')[2]
 
 
 def gaslib_to_network_data(network_file, scenario_file, contract_aux_elements=True, debug=False):
@@ -413,66 +452,76 @@ def gaslib_to_network_data(network_file, scenario_file, contract_aux_elements=Tr
     root = net_tree.getroot()
     
     nodes = read_gaslib_nodes(root)
+    node2idx = {lbl: i for (i, lbl) in enumerate(nodes['id'])}
     
     # Compute average node values for node properties
     # Needed because some "global" properties such as
     # gas temperature are needed in the computation of the beta
     # coefficients. The average value of all nodes are used for
     # these computations
-    avg_n_vals = dict()
-    for n in nodes:
-        for p in nodes[n]['p']:
-            avg_n_vals[p] = avg_n_vals.get(p, []) + [nodes[n]['p'][p]]
-    
-    for p in avg_n_vals:
-        vals = avg_n_vals.get(p, [])
-        if len(vals) != 0:
-            avg_n_vals[p] = sum(vals) / len(vals)
+    avg_n_vals = {p: np.nanmean(v) for (p, v) in nodes['p'].items()}
             
     if debug:
-        print("\n== GLOBAL NODE VALUES (AVG) ==")
+        print("\n== GLOBAL NODE VALUES (AVG, SI UNITS) ==")
         for p in avg_n_vals:
             print("{:30s}: {:s}".format(str(p), str(avg_n_vals[p])))
     
     # Read pipe data from the XML file
-    edges = read_gaslib_pipes(root)
+    edges, aux_elements = read_gaslib_connections(root)
+    edges['st'] = _map_labels(edges['st'], node2idx)
     # Compute the minimal beta of all edges
     # (used as beta for auxiliary elements, if contract_aux_elements == False)
-    min_beta = math.inf
-    for e in edges:
-        edges[e]['beta'] = calc_beta(edges[e], nodes, avg_n_vals)
-        min_beta = min(min_beta, edges[e]['beta'])
+    edges['beta'] = calc_beta(edges, nodes, avg_n_vals)
+    min_beta = edges['beta'].min(initial=math.inf)
 
     if debug:
         print('MIN BETA', min_beta)
 
-    # Read further components (non-pipe edges) from XML
-    aux_elements = read_gaslib_aux_elements(root)
-    
     # Handle the auxiliary components
-    contract_gaslib_instance(nodes, edges, demand, aux_elements, contract_aux_elements, min_beta, debug)
-
-    return raw_data_to_network_data(nodes, edges, demand)
+    aux_elements['st'] = _map_labels(aux_elements['st'], node2idx)
+    if contract_aux_elements:
+        contracted_nodes = contract_gaslib_instance(len(node2idx), aux_elements['st'], debug)
+    else:
+        # Emulate zero resistance pipes for all auxillary elements (like compressors, valves)
+        contracted_nodes = np.arange(len(node2idx))
+        edges['st'] = np.vstack([edges['st'], aux_elements['st']])
+        edges['beta'] = np.concatenate([edges['beta'],
+                                        np.full(len(aux_elements['st']), min_beta * 1e-10)])
+    
+    if debug:
+        print("== CONTRACTED NODES ==")
+        for w in np.flatnonzero(contracted_nodes != np.arange(len(contracted_nodes))):
+            print("Contracting node", nodes['id'][w], "into node", nodes['id'][contracted_nodes[w]])
+    
+    return raw_data_to_network_data(nodes, edges, demand, contracted_nodes, node2idx)
 
 
-def raw_data_to_network_data(nodes, edges, demand):
-    """Convert the raw data of gaslib instances to network data."""
-    node_data = (
-        np.array([n for n in nodes]),
-        np.array([[nodes[n]['x'], nodes[n]['y']] for n in nodes])
-    )
+def raw_data_to_network_data(nodes, edges, demand, contracted_nodes, node2idx):
+    """Convert the raw data of gaslib instances to network data.
+    
+    Nodes that are contracted into another node are removed, and edges
+    as well as demands are moved to the node they are contracted into.
+    """
+    labels = np.asarray(nodes['id'])
+    keep = contracted_nodes == np.arange(len(labels))
+    node_data = (labels[keep], nodes['xy'][keep])
+    
+    m = len(edges['st'])
     edge_data = (
-        [[edges[e]['from'], edges[e]['to']] for e in edges],
-        np.array([[-np.inf, np.inf] for _ in edges])
+        labels[contracted_nodes[edges['st']]].reshape(-1, 2),
+        np.tile([-np.inf, np.inf], (m, 1))
     )
     cost_data = (
-        np.array([[0, 0, edges[e]['beta']] for e in edges]),
-        [True for _ in edges]
+        np.column_stack([np.zeros((m, 2)), edges['beta']]),
+        np.ones(m, dtype=bool)
     )
-    demand_data = {
-        n: demand[n]['b']
-        for n in demand
-    }
+    
+    # Sum up demand of contracted nodes
+    demand_data = dict()
+    for (n, d) in demand.items():
+        if n in node2idx:
+            n = labels[contracted_nodes[node2idx[n]]]
+        demand_data[n] = demand_data.get(n, 0) + d['b']
 
     return edge_data, node_data, cost_data, demand_data
 
@@ -499,139 +548,159 @@ def read_gaslib_scn(xml_root):
         if demand[n]['type'] == "exit":
             demand[n]['b'] = demand[n]['lb']
     return demand
+
+
+def read_gaslib_elements(elements, attributes=()):
+    """Read raw data of gaslib xml elements (nodes or connections).
+    
+    Parameters
+    ----------
+    elements : list of lxml.etree._Element
+        The xml elements to read.
+    attributes : tuple of str, default=()
+        Attributes of the elements to read besides ``id``.
+
+    Returns
+    -------
+    dict
+        With key ``id`` and the keys in ``attributes`` mapping to lists
+        of attribute values, and key ``p`` mapping property names to
+        arrays of property values converted to SI units. Values of
+        elements that do not have a property are set to ``nan``.
+    """
+    ids = []
+    attr = {a: [] for a in attributes}
+    # Property name -> (element index, value, unit)
+    raw = dict()
+    for (i, el) in enumerate(elements):
+        ids.append(el.attrib['id'])
+        for a in attributes:
+            attr[a].append(el.attrib[a])
+        for p in el:
+            if not isinstance(p.tag, str):
+                # Skip comments
+                continue
+            idx, val, unit = raw.setdefault(_localname(p.tag), ([], [], []))
+            idx.append(i)
+            val.append(p.attrib.get('value', 0))
+            unit.append(p.attrib.get('unit', ''))
     
+    # Convert units once per column
+    prop = dict()
+    for (pname, (idx, val, unit)) in raw.items():
+        unique_units, inv = np.unique(unit, return_inverse=True)
+        conv = np.array([si_conversion(u) for u in unique_units]).reshape(-1, 2)
+        prop[pname] = np.full(len(ids), np.nan)
+        prop[pname][idx] = np.array(val, dtype=float) * conv[inv, 0] + conv[inv, 1]
     
+    return dict(id=ids, p=prop, **attr)
+
+
 def read_gaslib_nodes(xml_root):
     """Read raw node data from gaslib xml."""
-    nodes = dict()
-    
-    # READ NODES
     nodes_node = xml_root.find("framework:nodes", xml_root.nsmap)
-    for x in nodes_node:
-        prop = dict()
-        for p in x:
-            pname = remove_namespace(p.tag, xml_root.nsmap)
-            val = float(p.attrib.get('value', 0))
-            unit = p.get('unit', None)
-            prop[pname] = Quantity.from_unit(val, unit)
-        x
-        x_pos = x.attrib['x']
-        y_pos = x.attrib['y']
-        nodes[x.attrib['id']] = {'x': x_pos, 'y': y_pos, 'p': prop}
-        
+    nodes = read_gaslib_elements(nodes_node, ('x', 'y'))
+    nodes['xy'] = np.array([nodes.pop('x'), nodes.pop('y')], dtype=float).T.reshape(-1, 2)
     return nodes
 
 
-def read_gaslib_pipes(xml_root):
-    """Read raw pipe data from gaslib xml."""
-    edges = dict()
-    
-    edges_node = xml_root.find("framework:connections", xml_root.nsmap)
-    for pipe in edges_node.findall("pipe", xml_root.nsmap):
-        prop = dict()
-        for p in pipe:
-            if not isinstance(p, etree._Comment):
-                pname = remove_namespace(p.tag, xml_root.nsmap)
-                val = float(p.attrib.get('value', 0))
-                unit = p.get('unit', None)
-                prop[pname] = Quantity.from_unit(val, unit)
-        v = pipe.attrib['from']
-        w = pipe.attrib['to']
-        edges[pipe.attrib['id']] = {'from': v, 'to': w, 'p': prop}
-    
-    return edges
+AUX_ELEMENTS = ["compressorStation", "valve", "shortPipe", "controlValve", "resistor"]
 
 
-def read_gaslib_aux_elements(xml_root):
-    """Read raw auxiliary edge data from gaslib xml."""
-    aux_elements = dict()
-    
+def read_gaslib_connections(xml_root):
+    """Read raw pipe and auxiliary edge data from gaslib xml."""
     edges_node = xml_root.find("framework:connections", xml_root.nsmap)
     
-    compressors = edges_node.findall("compressorStation", xml_root.nsmap)
-    valves = edges_node.findall("valve", xml_root.nsmap)
-    shortpipes = edges_node.findall("shortPipe", xml_root.nsmap)
-    controlvalves = edges_node.findall("controlValve", xml_root.nsmap)
-    resistors = edges_node.findall("resistor", xml_root.nsmap)
+    pipes = []
+    aux_elements = {tag: [] for tag in AUX_ELEMENTS}
+    for el in edges_node:
+        if not isinstance(el.tag, str):
+            continue
+        tag = _localname(el.tag)
+        if tag == "pipe":
+            pipes.append(el)
+        elif tag in aux_elements:
+            aux_elements[tag].append(el)
+    # Auxiliary elements are grouped by type
+    aux_elements = sum(aux_elements.values(), [])
     
-    all_elements = compressors + valves + shortpipes + controlvalves + resistors
+    out = []
+    for elements in [pipes, aux_elements]:
+        data = read_gaslib_elements(elements, ('from', 'to'))
+        data['st'] = np.array([data.pop('from'), data.pop('to')], dtype=object).T.reshape(-1, 2)
+        out.append(data)
     
-    for el in all_elements:
-        prop = dict()
-        for p in el:
-            pname = remove_namespace(p.tag, xml_root.nsmap)
-            prop[pname] = Quantity.from_unit(float(p.attrib.get('value', 0)), p.get('unit', None))
-        aux_elements[el.attrib['id']] = {'from': el.attrib['from'], 'to': el.attrib['to'], 'p': prop}
-    
-    return aux_elements
-
-
-def contract_gaslib_instance(nodes, edges, demand, aux_elements, contract_aux_edges, min_beta, debug=False):
-    """Contract all auxiliary edge elements (if contract_aux_edge == False, create low resistance edges instead)."""
-    # Dict containg the node ids of contracted nodes
-    # contracted_nodes['w'] = 'v' means that node v and w are contracted,
-    # where node 'w' will be deleted
-    contracted_nodes = dict()
-    if contract_aux_edges:
-        # Contract all auxillary elements like compressors and valves
-        for ae in aux_elements:
-            v, w = (aux_elements[ae]['from'], aux_elements[ae]['to'])
-            while v in contracted_nodes and not v == contracted_nodes[v]:
-                v = contracted_nodes[v]
-            if w in contracted_nodes:
-                if debug:
-                    print(w, "was already contracted", w, '->', v)
-                u = contracted_nodes[w]
-                for x in contracted_nodes:
-                    if contracted_nodes[x] == u:
-                        if debug:
-                            print("Updating ", x, ':', x, '->', u, ' updated to ', x, '->', v)
-                        contracted_nodes[x] = v
-                if debug:
-                    print("Contracting also", u, '->', v)
-                contracted_nodes[u] = v
-            for x in contracted_nodes:
-                if contracted_nodes[x] == w:
-                    if debug:
-                        print("! Updating ", x, ':', x, '->', w, ' updated to ', x, '->', v)
-                    contracted_nodes[x] = v
-            contracted_nodes[w] = v
-    else:
-        # Emulate zero resistance pipes for all auxillary elements (like compressors, valves)
-        for ae in aux_elements:
-            aux_elements[ae]['beta'] = min_beta * 1e-10
-        edges.update(aux_elements)
+    return tuple(out)
+
+
+def _map_labels(labels, lbl2idx):
+    return np.array([lbl2idx[lbl] for lbl in labels.ravel()], dtype=int).reshape(labels.shape)
+
+
+def contract_gaslib_instance(n, aux_st, debug=False):
+    """Contract all auxiliary edge elements.
     
-    if debug:
-        print("== CONTRACTED NODES ==")
-        for v in contracted_nodes:
-            print("Contracting node", v, "into node", contracted_nodes[v])
-    # Update Nodes with contracted nodes (if necessary)
-    for w in contracted_nodes:
-        v = contracted_nodes[w]
-        if v != w:
-            del nodes[w]
-            if w in demand:
-                if v in demand:
-                    demand[w]['b'] += demand[v]['b']
-                    if debug:
-                        print("Contracting two entries/exits", v, 'and', w, "\nNew b ", demand[w]['b'])
-                demand[v] = demand[w]
-                del demand[w]
-    # Update Edges by updating node ids
-    for eid in edges:
-        e = edges[eid]
-        if e['from'] in contracted_nodes:
-            e['from'] = contracted_nodes[e['from']]
-        if e['to'] in contracted_nodes:
-            e['to'] = contracted_nodes[e['to']]
-
-
-def calc_beta(edge, nodes, avg_n_vals):
-    r"""Compute the resistance coefficient beta for the pipe edge.
-    
-    Compute the resistance value :math:`\beta_e` for the edge
-    given by the raw edge data in ``edge`` with the formula
+    The nodes connected by auxiliary elements are merged with a
+    union-find structure. Each set of merged nodes is represented by the
+    representative of the set containing the tail of the auxiliary
+    element that was contracted first.
+
+    Parameters
+    ----------
+    n : int
+        Number of nodes.
+    aux_st : ndarray
+        Array of shape (k, 2), the source and target node indices of
+        the auxiliary elements.
+    debug : boolean, default=False
+        If set to True, some debug information are printed
+
+    Returns
+    -------
+    ndarray
+        Array of shape (n, ): ``contracted_nodes[w] = v`` means that node
+        ``w`` is contracted into node ``v``.
+    """
+    parent = list(range(n))
+    size = [1] * n
+    # Representative node of set with root r
+    rep = list(range(n))
+    
+    def find(x):
+        while parent[x] != x:
+            # Path halving
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+    
+    for (v, w) in aux_st.tolist():
+        rv, rw = find(v), find(w)
+        if rv == rw:
+            continue
+        if debug:
+            print("Contracting", rep[rw], '->', rep[rv])
+        r = rep[rv]
+        # Union by size
+        if size[rv] < size[rw]:
+            rv, rw = rw, rv
+        parent[rw] = rv
+        size[rv] += size[rw]
+        rep[rv] = r
+    
+    return np.array([rep[find(x)] for x in range(n)], dtype=int)
+
+
+# Convert flow from m_cube_per_s to 1000m_cube_per_hour
+# and pressure from Pa to bar
+_M3_PER_S_TO_1000M3_PER_H = 3600 / 1000
+_PA_TO_BAR = 1e-5
+
+
+def calc_beta(edges, nodes, avg_n_vals):
+    r"""Compute the resistance coefficients beta for pipe edges.
+    
+    Compute the resistance values :math:`\beta_e` for all edges
+    given by the raw edge data in ``edges`` with the formula
 
     .. math::
         \beta_e = \bigg(\frac{4}{\pi}\bigg)^2 \frac{L_e}{D^5_e}
@@ -664,39 +733,29 @@ def calc_beta(edge, nodes, avg_n_vals):
     * :math:`z(p_e, T)` - the compressibility factor of the gas
     * :math:`p_c` - the pseudo-critical pressure of the gas
     * :math:`T_c` - the pseudo-critical temperature of the gas
+
+    All values are expected in SI units, the returned coefficients
+    are in bar and 1000m_cube_per_hour.
     """
-    u = nodes[edge['from']]
-    v = nodes[edge['to']]
+    u, v = edges['st'].T
     # Compute pa
-    pl = min(u['p']['pressureMin'], v['p']['pressureMin'])
-    pu = max(u['p']['pressureMax'], v['p']['pressureMax'])
-    pa = ((pl + pu) / 2)
-    pa.to('Pa')
+    pl = np.minimum(nodes['p']['pressureMin'][u], nodes['p']['pressureMin'][v])
+    pu = np.maximum(nodes['p']['pressureMax'][u], nodes['p']['pressureMax'][v])
+    pa = (pl + pu) / 2
 
     # Compute z_(p_e, T)
-    pc = avg_n_vals['pseudocriticalPressure'].to('Pa')
-    prq = pa / pc
-    T = avg_n_vals['gasTemperature'].to('K')
-    Tc = avg_n_vals['pseudocriticalTemperature'].to('K')
-    teq = T / Tc
+    prq = pa / avg_n_vals['pseudocriticalPressure']
+    T = avg_n_vals['gasTemperature']
+    teq = T / avg_n_vals['pseudocriticalTemperature']
     z = 1 + 0.257 * prq - 0.533 * prq / teq
 
-    da = edge['p']['diameter']
-    ka = edge['p']['roughness']
-    lambdaa = 1 / ((2 * math.log10(da / ka) + 1.138) ** 2)
-
-    beta = GAS_CONSTANT / avg_n_vals['molarMass']
-    beta = beta * z * T * lambdaa
-    da5 = (da.to('m')) ** 5
+    da = edges['p']['diameter']
+    ka = edges['p']['roughness']
+    lambdaa = 1 / ((2 * np.log10(da / ka) + 1.138) ** 2)
 
-    beta = (4 / math.pi) ** 2 * beta * edge['p']['length'] / da5
+    beta = GAS_CONSTANT.value() / avg_n_vals['molarMass'] * z * T * lambdaa
+    beta = (4 / math.pi) ** 2 * beta * edges['p']['length'] / da ** 5
     
     # Transform units of beta
-    fac0 = MixedQuantity(1, ['kg', 'm', 'm'], ['s', 's', 'J'])
-    fac1 = MixedQuantity(1 / 100000, ['bar', 'm', 's', 's'], ['kg'])
-    fac2 = MixedQuantity(3600, ['s'], ['h'], no_cancel=True)
-    
-    beta = beta * fac0 * fac1 * fac1 / fac2 / fac2
-    beta = beta * avg_n_vals['normDensity'] * avg_n_vals['normDensity']
-    
-    return beta.value() * 1e6
+    rho = avg_n_vals['normDensity'] / _M3_PER_S_TO_1000M3_PER_H
+    return beta * (_PA_TO_BAR * rho) ** 2
@@ -1,9 +1,12 @@
+import io
 import re
 import numbers
 
 import numpy as np
 import pandas as pd
 
+from .demand import DemandVectorSP
+
 
 LINK_TRAVEL_TIME = "free_flow_time * (1 + b * (x / capacity)**power)"
 COMMENT_SYMBOLS = ("~", "#")
@@ -45,60 +48,130 @@ def clever_split(line: str) -> list:
     return elems
 
 
-def load_trips(trips) -> list:
-    """Read network commodities from path.
+def read_metadata(f) -> dict:
+    """Read TNTP metadata up to ``<END OF METADATA>``.
     
     Parameters
     ----------
-    tntp_trips : str
-        File path.
+    f : file
+        Open file, positioned at the first line after the metadata
+        afterwards.
     
     Returns
     -------
-    commodities : list of list
-        List of commodities (source, target, demand).
+    metadata : dict
+        Maps metadata keys (e.g., ``'FIRST THRU NODE'``) to values (str).
     """
-    # Open file
-    f = dummy_file_handler(trips)
+    metadata = {}
+    for line in f:
+        m = re.match(r'\s*\<([^>]+)\>(.*)', line)
+        if m is None:
+            continue
+        key = m.group(1).strip().upper()
+        if key == "END OF METADATA":
+            break
+        metadata[key] = m.group(2).strip()
+    return metadata
+
+
+_RE_SKIP = re.compile(r'^\s*[~#<][^\n]*$', re.MULTILINE)
+
+
+def _split_origin_blocks(body: str) -> tuple:
+    # Get origin labels and blocks of 'target : rate;' entries
+    lower = body.lower()
+    starts = []
+    pos = lower.find("origin")
+    while pos >= 0:
+        starts.append(pos)
+        pos = lower.find("origin", pos + 6)
+    starts.append(len(body))
+    
+    origins = []
+    blocks = []
+    for (start, end) in zip(starts[:-1], starts[1:]):
+        eol = body.find("\n", start, end)
+        if eol < 0:
+            eol = end
+        origins.append(body[start + 6:eol].split()[0])
+        blocks.append(body[eol:end])
+    return origins, blocks
+
+
+def read_trips(trips) -> tuple:
+    """Read network commodities from TNTP trips file into arrays.
     
-    # Init return data
-    commodities = []
+    All ``target : rate;`` entries are tokenized at once by the pandas
+    C parser, the origin of every entry is inferred from the number of
+    entries in its ``Origin`` block.
     
+    Parameters
+    ----------
+    trips : str or file
+        File path or open file.
+    
+    Returns
+    -------
+    sources : ndarray of str
+        Origins, ndarray (k, ).
+    sinks : ndarray of str
+        Destinations, ndarray (k, ).
+    rates : ndarray of float
+        Demand of OD pairs, ndarray (k, ).
+    """
+    f = dummy_file_handler(trips)
     try:
-        for line in f:
-            line = line.strip()
-            
-            # skip emtpy lines
-            if len(line) == 0:
-                continue
-
-            # skip comment lines
-            if is_comment_line(line):
-                continue
-            
-            # read metadata from line if availabe
-            m = re.findall(r'\<([\w\s]+)\>\s*(\w+)\s*', line)
-            if len(m) > 0:
-                continue
-            
-            cols = clever_split(line)
-            
-            # update current origin
-            if len(cols) > 0 and cols[0].strip().lower() == 'origin':
-                origin = cols[1].strip()
-                continue
-            
-            # read commodity data
-            for c in line.split(';'):
-                data = c.strip().split(':')
-                if len(data) > 1:
-                    target, load = data[0].strip(), data[1].strip()
-                    load = float(load)
-                    commodities.append((origin, target, load))
+        read_metadata(f)
+        body = f.read()
     finally:
         f.close()
     
-    return commodities
+    # drop comment and metadata lines, split by origin blocks
+    if "~" in body or "#" in body or "<" in body:
+        body = _RE_SKIP.sub("", body)
+    origins, blocks = _split_origin_blocks(body)
+    counts = np.array([b.count(":") for b in blocks], dtype=int)
+    
+    entries = "".join(blocks).replace(":", " ").replace(";", "\n")
+    if counts.sum() == 0:
+        df = pd.DataFrame({"t": np.empty(0, str), "r": np.empty(0)})
+    else:
+        df = pd.read_csv(io.StringIO(entries),
+                         sep=r'\s+',
+                         header=None,
+                         names=["t", "r"],
+                         dtype={"t": str, "r": float})
+    if len(df) != counts.sum():
+        raise ValueError(
+            "Invalid trips file: found {} entries, expected {}."
+            .format(len(df), counts.sum())
+        )
+    
+    sources = np.repeat(np.array(origins, dtype=str), counts)
+    sinks = df["t"].values.astype(str)
+    rates = df["r"].values
+    return sources, sinks, rates
+
+
+def load_trips(trips) -> list:
+    """Read network commodities from path.
+    
+    Parameters
+    ----------
+    tntp_trips : str
+        File path.
+    
+    Returns
+    -------
+    commodities : list of list
+        List of commodities (source, target, demand).
+    
+    See Also
+    --------
+    read_trips : Read commodities into arrays.
+    """
+    sources, sinks, rates = read_trips(trips)
+    return list(zip(sources.tolist(), sinks.tolist(), rates.tolist()))
 
 
 def load_nodes(tntp_nodes, ftn=None):
@@ -161,26 +234,89 @@ def load_nodes(tntp_nodes, ftn=None):
     return nodes
 
 
-def read_tntp(netfile, trips=None, nodefile=None, cost_type: str = "auto"):
-    net = pd.read_csv(netfile, skiprows=8, sep='\t')
-    net.columns = [s.strip().lower() for s in net.columns]
+def read_net(netfile) -> tuple:
+    """Read TNTP network file.
     
-    # Load network edges
-    st = net[["init_node", "term_node"]].values.astype(str)
-    bounds = np.c_[np.full(len(st), 0), np.full(len(st), np.inf)]
-    edge_data = (st, bounds)
-
-    # Get first through node
-    ftn = 1
+    Parameters
+    ----------
+    netfile : str or file
+        File path or open file.
+    
+    Returns
+    -------
+    net : pandas.DataFrame
+        Link data with lower case column names, e.g., ``init_node``,
+        ``term_node``, ``capacity``, ``free_flow_time``, ``b``,
+        ``power``.
+    metadata : dict
+        Metadata of file, see :func:`read_metadata`.
+    """
     f = dummy_file_handler(netfile)
     try:
+        metadata = read_metadata(f)
+        
+        # header line starts with '~'
+        columns = None
         for line in f:
-            if line.startswith("<FIRST THRU NODE>"):
-                ftn = int(line.split(">")[1].strip())
+            line = line.strip()
+            if line.startswith("~"):
+                columns = [c.strip().lower() for c in line[1:].split("\t")]
+                columns = [c for c in columns if c not in ("", ";")]
                 break
+        if columns is None:
+            raise ValueError("TNTP net file has no header line starting with '~'.")
+        net = pd.read_csv(f, sep=r'\s+', header=None, comment="~")
     finally:
         f.close()
     
+    # drop terminating ';'
+    net = net.iloc[:, :len(columns)]
+    last = net.columns[-1]
+    if net[last].dtype == object:
+        net[last] = pd.to_numeric(net[last].str.rstrip(";"))
+    net.columns = columns
+    return net, metadata
+
+
+def polynomial_bpr_coefficients(net: pd.DataFrame) -> np.ndarray:
+    """Get polynomial coefficients of BPR link travel times.
+    
+    Parameters
+    ----------
+    net : pandas.DataFrame
+        Link data with integer ``power``, see :func:`read_net`.
+    
+    Returns
+    -------
+    coeffs : ndarray
+        ndarray (m, max(power) + 1) of polynomial coefficients.
+    """
+    power = net["power"].values.astype(int)
+    fft = net["free_flow_time"].values
+    fac = net["b"].values / (net["capacity"].values**power) * fft
+    coeffs = np.zeros((len(net), power.max() + 1), dtype=float)
+    coeffs[:, 0] = fft
+    coeffs[np.arange(len(net)), power] = fac
+    return coeffs
+
+
+def read_tntp(
+        netfile,
+        trips=None,
+        nodefile=None,
+        cost_type: str = "auto",
+        single_pairs: bool = False,
+        ):
+    net, metadata = read_net(netfile)
+    
+    # Load network edges
+    st = net[["init_node", "term_node"]].values.astype(str)
+    bounds = np.c_[np.full(len(st), 0), np.full(len(st), np.inf)]
+    edge_data = (st, bounds)
+
+    # Get first through node
+    ftn = int(metadata.get("FIRST THRU NODE", 1))
+    
     # Build network cost
     cost_data = None
     
@@ -194,13 +330,7 @@ def read_tntp(netfile, trips=None, nodefile=None, cost_type: str = "auto"):
     if (cost_type == "polynomial"
             or (cost_type == "auto" and is_power_int(net.power))):
         # If powers are integers, prepare polynomial cost
-        net.power = net.power.astype(int)
-        coeffs = np.zeros((len(net), max(net.power) + 1), dtype=float)
-        fac = net.b / (net.capacity**net.power) * net.free_flow_time
-        coeffs[:, 0] = net.free_flow_time.values
-        for i, (p, fac) in enumerate(list(zip(net.power, fac))):
-            coeffs[i, p] = fac
-        cost_data = coeffs
+        cost_data = polynomial_bpr_coefficients(net)
     
     if cost_type == "symbolic":
         # Symbolic Cost with F = LINK_TRAVEL_TIME
@@ -225,6 +355,10 @@ def read_tntp(netfile, trips=None, nodefile=None, cost_type: str = "auto"):
     
     demand_data = None
     if trips is not None:
-        demand_data = load_trips(trips)
+        sources, sinks, rates = read_trips(trips)
+        if single_pairs is True:
+            demand_data = DemandVectorSP.from_arrays(sources, sinks, rates)
+        else:
+            demand_data = list(zip(sources.tolist(), sinks.tolist(), rates.tolist()))
     
     return edge_data, node_data, cost_data, demand_data
@@ -0,0 +1,102 @@
+"""Prebuilt bundled network instances.
+
+The bundled instances (SiouxFalls and the GasLib networks) are shipped
+as prebuilt ``.npz`` files in ``paminco/net/data``. They are loaded
+lazily on first request and memoized per process, such that the large
+modules holding the raw TNTP and GasLib data are only imported if the
+prebuilt files are (re)built or non-default import options are used.
+
+Use :func:`build_datasets` to rebuild the files.
+"""
+import copy
+import functools
+import os
+
+import numpy as np
+
+from .network import Network
+
+
+DATASET_DIR = os.path.join(os.path.dirname(__file__), "data")
+GAS_DATASETS = ("gas11", "gas24", "gas40", "gas135", "gas582")
+DATASETS = ("sioux", ) + GAS_DATASETS
+
+
+def dataset_file(name: str) -> str:
+    """Get path of prebuilt dataset ``name``."""
+    return os.path.join(DATASET_DIR, name + ".npz")
+
+
+def build_dataset(name: str, **kw) -> Network:
+    """Build bundled network ``name`` from its raw data.
+
+    Parameters
+    ----------
+    name : str
+        Name of dataset, one of ``DATASETS``.
+    kw : keyword arguments, optional
+        Further arguments passed to :meth:`Network.from_tntp
+        <paminco.net.network.Network.from_tntp>` or
+        :meth:`Network.from_gaslib
+        <paminco.net.network.Network.from_gaslib>`.
+
+    Returns
+    -------
+    Network
+    """
+    if name == "sioux":
+        from paminco.utils.readin import FileLineIterator
+        from ._data_sioux import TNTP_SIOUX_NET, TNTP_SIOUX_NODE, TNTP_SIOUX_TRIPS
+        tntp_net = FileLineIterator(TNTP_SIOUX_NET, is_string=True).dump()
+        tntp_node = FileLineIterator(TNTP_SIOUX_NODE, is_string=True).dump()
+        tntp_trips = FileLineIterator(TNTP_SIOUX_TRIPS, is_string=True).dump()
+        return Network.from_tntp(tntp_net, tntp_trips, tntp_node, **kw)
+
+    from ._data_gas import temporary_gas_files
+    with temporary_gas_files(name) as files:
+        return Network.from_gaslib(*files, **kw)
+
+
+def build_datasets(path: str = DATASET_DIR) -> None:
+    """(Re)build all prebuilt datasets in directory ``path``."""
+    os.makedirs(path, exist_ok=True)
+    for name in DATASETS:
+        build_dataset(name).save_to_numpy(os.path.join(path, name + ".npz"))
+
+
+@functools.lru_cache(maxsize=None)
+def _load(name: str) -> Network:
+    f = dataset_file(name)
+    if not os.path.exists(f):
+        # Not prebuilt, e.g., running from a source tree without data
+        return build_dataset(name)
+    with np.load(f) as data:
+        return Network.from_npz(data)
+
+
+def load_dataset(name: str) -> Network:
+    """Load bundled network ``name``.
+
+    The prebuilt network is read once per process, every call returns
+    an independent copy.
+
+    Parameters
+    ----------
+    name : str
+        Name of dataset, one of ``DATASETS``.
+
+    Returns
+    -------
+    Network
+    """
+    name = name.lower().strip()
+    if name not in DATASETS:
+        raise ValueError(f"Unknown dataset '{name}'")
+    net = _load(name)
+    # Index mappings are replaced on updates, never modified inplace
+    memo = {}
+    for d in (net.shared._nodes2edge, net.nodes._lbl2id, net.nodes._id2lbl,
+              net.nodes._lbl_index):
+        if d is not None:
+            memo[id(d)] = d
+    return copy.deepcopy(net, memo)
@@ -0,0 +1,90 @@
+"""Array-backed lookup of edges by their (source, target) node indices."""
+from collections.abc import Mapping
+
+import numpy as np
+
+from paminco.utils.math import segment_searchsorted
+
+
+class EdgeIndex(Mapping):
+    """Map (source, target) node indices to edge indices.
+
+    Edges are stored in compressed sparse row (CSR) format: sorted by
+    source and target, ``indptr[v]:indptr[v + 1]`` are the positions of
+    the outgoing edges of node ``v``. A lookup binary searches the
+    targets of the source and costs ``O(log deg)``. For parallel edges,
+    the last edge is returned.
+
+    Behaves like a read-only dict ``{(source, target): edge}``.
+
+    Parameters
+    ----------
+    st : ndarray
+        Source and target node indices of all edges, shape (m, 2).
+    n : int, optional
+        Number of nodes, at least the largest node index in ``st``
+        plus one.
+    """
+
+    def __init__(self, st: np.ndarray, n: int = None) -> None:
+        st = np.asarray(st).reshape(-1, 2)
+        s, t = st[:, 0], st[:, 1]
+        if len(st) > 0:
+            n = max(int(st.max()) + 1, 0 if n is None else n)
+        elif n is None:
+            n = 0
+        order = np.lexsort((t, s))
+        self.n = n
+        self.indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(s, minlength=n), out=self.indptr[1:])
+        self.targets = t[order]
+        self.edges = order
+
+    def get_ids(self, s, t, default=None) -> np.ndarray:
+        """Get indices of edges ``s[i] -> t[i]``, vectorized.
+
+        Parameters
+        ----------
+        s, t : int or array_like of int
+            Node indices of sources and targets.
+        default : int, optional
+            Index returned for pairs that are not connected by an edge.
+            If None, a KeyError is raised instead.
+
+        Returns
+        -------
+        ndarray of int
+            Edge indices of shape ``np.broadcast(s, t).shape``.
+        """
+        s, t = np.broadcast_arrays(s, t)
+        shape = s.shape
+        s, t = s.ravel(), t.ravel()
+        valid = (s >= 0) & (s < self.n)
+        s_ = np.where(valid, s, 0)
+        first, stop = self.indptr[s_], self.indptr[s_ + 1]
+        pos = segment_searchsorted(self.targets, first, stop - 1, t) - 1
+        found = valid & (pos >= first)
+        found[found] = self.targets[pos[found]] == t[found]
+        if found.all():
+            return self.edges[pos].reshape(shape)
+        if default is None:
+            miss = np.flatnonzero(~found)[0]
+            raise KeyError((s[miss], t[miss]))
+        return np.where(found, self.edges[np.where(found, pos, 0)], default).reshape(shape)
+
+    def __getitem__(self, key) -> int:
+        s, t = key
+        return int(self.get_ids(s, t))
+
+    def __iter__(self):
+        s = np.repeat(np.arange(self.n), np.diff(self.indptr))
+        last = np.ones(len(s), dtype=bool)
+        last[:-1] = (s[1:] != s[:-1]) | (self.targets[1:] != self.targets[:-1])
+        return zip(s[last].tolist(), self.targets[last].tolist())
+
+    def __len__(self) -> int:
+        if len(self.targets) == 0:
+            return 0
+        s = np.repeat(np.arange(self.n), np.diff(self.indptr))
+        new = (s[1:] != s[:-1]) | (self.targets[1:] != self.targets[:-1])
+        return 1 + int(new.sum())
@@ -0,0 +1,93 @@
+"""Products with the incidence matrix Gamma computed from edge indices.
+
+Gamma has a -1 in the row of the source and a +1 in the row of the
+target of every edge, products with Gamma therefore reduce to gathers
+and scatters along the sources ``s`` and targets ``t`` of the edges. No
+sparse matrix is built.
+"""
+import numpy as np
+
+
+def gather(s, t, x, out=None) -> np.ndarray:
+    """Compute ``x @ Gamma``, i.e., ``x[..., t] - x[..., s]``.
+
+    Parameters
+    ----------
+    s, t : ndarray of int
+        Sources and targets of all edges, shape (m, ).
+    x : ndarray
+        Node values of shape (n, ) or batch of shape (k, n).
+    out : ndarray, optional
+        Array of shape (m, ) or (k, m) to store the result in.
+
+    Returns
+    -------
+    ndarray
+        Difference of node values for every edge.
+    """
+    out = np.take(x, t, axis=-1, out=out)
+    return np.subtract(out, np.take(x, s, axis=-1), out=out)
+
+
+def scatter(s, t, y, n: int, out=None) -> np.ndarray:
+    """Compute ``Gamma @ y``, i.e., the net inflow of every node.
+
+    Parameters
+    ----------
+    s, t : ndarray of int
+        Sources and targets of all edges, shape (m, ).
+    y : ndarray
+        Edge values of shape (m, ) or batch of shape (m, k).
+    n : int
+        Number of nodes.
+    out : ndarray, optional
+        Array of shape (n, ) or (n, k) to store the result in.
+
+    Returns
+    -------
+    ndarray
+        Sum of values of entering minus leaving edges for every node.
+    """
+    y = np.asarray(y)
+    dtype = y.dtype if y.dtype.kind == "f" else np.result_type(y.dtype, np.int64)
+    if out is None:
+        out = np.empty((n, ) + y.shape[1:], dtype=dtype)
+    if y.ndim == 1:
+        out[:] = (np.bincount(t, weights=y, minlength=n)
+                  - np.bincount(s, weights=y, minlength=n))
+        return out
+    for j in range(y.shape[1]):
+        out[:, j] = (np.bincount(t, weights=y[:, j], minlength=n)
+                     - np.bincount(s, weights=y[:, j], minlength=n))
+    return out
+
+
+def potential_flow(s, t, pi, a, d=None, out=None) -> np.ndarray:
+    """Compute the flow ``(Gamma.T @ pi) / (2a) - d`` induced by a potential.
+
+    Parameters
+    ----------
+    s, t : ndarray of int
+        Sources and targets of all edges, shape (m, ).
+    pi : ndarray
+        Node potential, shape (n, ).
+    a : ndarray
+        Quadratic cost coefficients of all edges, shape (m, ).
+    d : ndarray, optional
+        Flow offsets of all edges, shape (m, ).
+    out : ndarray, optional
+        Array of shape (m, ) to store the result in.
+
+    Returns
+    -------
+    ndarray
+        Flow on all edges.
+    """
+    if out is None:
+        out = np.empty(len(t), dtype=np.result_type(pi, a, np.float32))
+    gather(s, t, pi, out=out)
+    out /= a
+    out *= 0.5
+    if d is not None:
+        out -= d
+    return out
@@ -0,0 +1,138 @@
+"""Interned storage of node labels."""
+import numpy as np
+
+
+class LabelTable:
+    """Table of distinct labels, referred to by integer codes.
+
+    Every label is stored once, nodes, edges and demand of a network
+    keep ``int32`` codes into the same table. Labels are materialized
+    as strings by :meth:`decode` only. New labels are appended, codes of
+    labels in the table never change. The arrays of a table are replaced
+    on updates, never modified inplace.
+
+    Parameters
+    ----------
+    labels : array_like of str, optional
+        Distinct labels, the code of ``labels[i]`` is ``i``.
+
+    Examples
+    --------
+    >>> table = LabelTable()
+    >>> table.encode(["b", "a", "b"])
+    array([1, 0, 1], dtype=int32)
+    >>> table.encode(["c", "a"])
+    array([2, 0], dtype=int32)
+    >>> table.decode([2, 1])
+    array(['c', 'b'], dtype='<U1')
+    >>> table.find(["a", "d"])
+    array([ 0, -1], dtype=int32)
+    """
+
+    dtype_code = np.int32
+
+    def __init__(self, labels=None) -> None:
+        if labels is None:
+            labels = np.empty(0, dtype=str)
+        self.labels = _as_str(labels)
+        self._sorted = None
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    def _get_sorted(self) -> tuple:
+        if self._sorted is None:
+            sorter = np.argsort(self.labels, kind="stable")
+            self._sorted = (self.labels[sorter], sorter.astype(self.dtype_code))
+        return self._sorted
+
+    def find(self, labels) -> np.ndarray:
+        """Get codes of labels by binary search.
+
+        Parameters
+        ----------
+        labels : str or array_like of str
+            Labels to look up.
+
+        Returns
+        -------
+        ndarray of int32
+            Codes, same shape as ``labels``. -1 for labels that are not
+            in the table.
+        """
+        labels = _as_str(labels)
+        if len(self) == 0:
+            return np.full(labels.shape, -1, dtype=self.dtype_code)
+        sorted_labels, sorter = self._get_sorted()
+        pos = np.minimum(np.searchsorted(sorted_labels, labels), len(self) - 1)
+        return np.where(sorted_labels[pos] == labels, sorter[pos], -1).astype(self.dtype_code)
+
+    def encode(self, labels) -> np.ndarray:
+        """Get codes of labels, labels not in the table are appended.
+
+        Parameters
+        ----------
+        labels : str or array_like of str
+            Labels to encode.
+
+        Returns
+        -------
+        ndarray of int32
+            Codes, same shape as ``labels``.
+        """
+        labels = _as_str(labels)
+        codes = np.array(self.find(labels), copy=True)
+        new = codes < 0
+        if new.any():
+            unique, inverse = np.unique(labels[new], return_inverse=True)
+            codes[new] = len(self) + inverse.ravel()
+            self.labels = np.concatenate((self.labels, unique))
+            self._sorted = None
+        return codes
+
+    def decode(self, codes) -> np.ndarray:
+        """Get labels of codes as strings.
+
+        Parameters
+        ----------
+        codes : int or array_like of int
+            Codes of labels in the table.
+
+        Returns
+        -------
+        ndarray of str
+            Labels, same shape as ``codes``.
+        """
+        return self.labels[codes]
+
+    def recode(self, codes, table) -> np.ndarray:
+        """Get codes in this table of labels coded in another table.
+
+        Labels of ``table`` not in this table are appended.
+
+        Parameters
+        ----------
+        codes : ndarray of int
+            Codes of labels in ``table``.
+        table : LabelTable
+            Table ``codes`` refer to.
+
+        Returns
+        -------
+        ndarray of int
+            Codes in this table, ``codes`` itself if the codes of both
+            tables agree.
+        """
+        if table is self:
+            return codes
+        translate = self.encode(table.labels)
+        if np.array_equal(translate, np.arange(len(translate))):
+            return codes
+        return translate[codes]
+
+
+def _as_str(labels) -> np.ndarray:
+    labels = np.asarray(labels)
+    if labels.dtype.kind != "U":
+        labels = labels.astype(str)
+    return labels
@@ -0,0 +1,140 @@
+"""Assembly of weighted Laplacian matrices on a fixed sparsity pattern."""
+import numpy as np
+import scipy.sparse as sps
+
+
+class LaplacianAssembler:
+    """Assemble weighted Laplacians of a fixed topology.
+
+    The sparsity pattern of the Laplacian (and of its reduced form
+    without first row and column) is computed once, together with a
+    scatter map from the four entries ``L[s, t]``, ``L[t, s]``,
+    ``L[s, s]`` and ``L[t, t]`` of every edge to the data slots of the
+    pattern. A new weight vector is then assembled by a single
+    :func:`numpy.bincount` pass into the data array, without building a
+    COO matrix or converting between formats.
+
+    The pattern is symmetric and stored with sorted indices, i.e., it
+    is valid in CSR and CSC format alike.
+
+    Parameters
+    ----------
+    st : ndarray
+        Source and target node indices of all edges, shape (m, 2).
+    n : int
+        Number of nodes.
+
+    Examples
+    --------
+    >>> asm = LaplacianAssembler(np.array([[0, 1], [1, 2]]), 3)
+    >>> asm.assemble(np.array([1., 2.]), return_as="array")
+    array([[ 1., -1.,  0.],
+           [-1.,  3., -2.],
+           [ 0., -2.,  2.]])
+    >>> asm.assemble(np.array([1., 2.]), reduced=True, return_as="array")
+    array([[ 3., -2.],
+           [-2.,  2.]])
+    """
+
+    def __init__(self, st: np.ndarray, n: int) -> None:
+        self._st = np.asarray(st).reshape(-1, 2)
+        self.m = len(self._st)
+        self.n = n
+        self._patterns = {}
+
+    def _pattern(self, reduced: bool) -> tuple:
+        # (shape, indptr, indices, flat positions, scatter, entries)
+        if reduced in self._patterns:
+            return self._patterns[reduced]
+        s, t = self._st[:, 0], self._st[:, 1]
+        i = np.concatenate((s, t, s, t))
+        j = np.concatenate((t, s, s, t))
+        k = self.n
+        entries = None
+        if reduced is True:
+            k = max(self.n - 1, 0)
+            entries = np.flatnonzero((i > 0) & (j > 0))
+            i, j = i[entries] - 1, j[entries] - 1
+        flat, scatter = np.unique(i.astype(np.int64) * k + j, return_inverse=True)
+        # Index dtype as chosen by scipy, avoids a copy on every call
+        idx_dtype = np.int32 if max(k, len(flat)) < 2**31 - 1 else np.int64
+        indptr = np.zeros(k + 1, dtype=idx_dtype)
+        np.cumsum(np.bincount(flat // max(k, 1), minlength=k), out=indptr[1:])
+        indices = (flat % max(k, 1)).astype(idx_dtype)
+        self._patterns[reduced] = ((k, k), indptr, indices, flat,
+                                   scatter.ravel(), entries)
+        return self._patterns[reduced]
+
+    def data(self, weight: np.ndarray, reduced: bool = False) -> np.ndarray:
+        """Get data array of Laplacian on the pattern of this assembler.
+
+        Parameters
+        ----------
+        weight : ndarray
+            Weights of all edges, shape (m, ).
+        reduced : bool, default=False
+            Whether to assemble the reduced form, i.e., without first
+            row and first column.
+
+        Returns
+        -------
+        ndarray
+            Data of Laplacian, same dtype as ``weight``. Aligned with
+            ``indptr`` and ``indices`` of the (reduced) pattern.
+        """
+        _, _, _, flat, scatter, entries = self._pattern(reduced)
+        w = np.concatenate((-weight, -weight, weight, weight))
+        if entries is not None:
+            w = w[entries]
+        data = np.bincount(scatter, weights=w, minlength=len(flat))
+        if weight.dtype.kind == "f":
+            return data.astype(weight.dtype, copy=False)
+        return data
+
+    def assemble(
+            self,
+            weight: np.ndarray,
+            reduced: bool = False,
+            return_as: str = "csr",
+            out=None,
+            ):
+        """Assemble weighted Laplacian.
+
+        Parameters
+        ----------
+        weight : ndarray
+            Weights of all edges, shape (m, ).
+        reduced : bool, default=False
+            Whether to assemble the reduced form, i.e., without first
+            row and first column.
+        return_as : str, default='csr'
+            Return format, one of 'csr', 'csc', 'coo' or 'array'.
+        out : csr_matrix or csc_matrix, optional
+            Matrix previously assembled by this assembler in the same
+            form, its data is overwritten inplace and ``out`` returned.
+
+        Returns
+        -------
+        spmatrix or ndarray
+            Laplacian matrix of shape (n, n) if ``reduced`` is False,
+            else of shape (n-1, n-1).
+        """
+        shape, indptr, indices, flat, _, _ = self._pattern(reduced)
+        data = self.data(weight, reduced=reduced)
+        if out is not None:
+            if out.shape != shape or len(out.data) != len(data):
+                raise ValueError("Matrix 'out' does not match pattern of Laplacian.")
+            out.data[:] = data
+            return out
+        if return_as == "array":
+            dense = np.zeros(shape, dtype=data.dtype)
+            dense.ravel()[flat] = data
+            return dense
+        if return_as == "csr":
+            return sps.csr_matrix((data, indices, indptr), shape=shape)
+        if return_as == "csc":
+            # Pattern and values are symmetric
+            return sps.csc_matrix((data, indices, indptr), shape=shape)
+        if return_as == "coo":
+            return sps.csr_matrix((data, indices, indptr), shape=shape).tocoo()
+        raise ValueError(f"{return_as} is invalid return format")
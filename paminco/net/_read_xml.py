@@ -0,0 +1,286 @@
+"""Single-pass reader for network XML files.
+
+The whole network (edges, nodes, costs and commodities) is read while
+streaming through the file with :func:`lxml.etree.iterparse`. Values are
+collected in growable numpy arrays and parsed elements are cleared
+immediately, such that the document tree is never fully built.
+"""
+import io
+import xml.etree.ElementTree as et
+
+import numpy as np
+from lxml import etree
+
+from paminco.utils.misc import GrowableArray
+from paminco.utils.readin import parse_number, parse_polynomial
+from .cost import (
+    XML_TAG_EDGE_COST,
+    XML_POLYCOST_TAG,
+    XML_PWQ_TAG,
+    XML_SYMCOST_TAG,
+    XML_SYMCOST_TAG_FUNCDEF,
+)
+from .demand import TAG_COMMODITIES
+
+
+_TAGS = ("edge", "node", "commodity", "demand_func", XML_SYMCOST_TAG_FUNCDEF)
+_PWQ_DEFAULT = (0., 0., 0., -np.inf)
+
+
+class _NetworkXMLReader:
+
+    def __init__(self, default_edge_cost=True) -> None:
+        self.default_edge_cost = default_edge_cost
+
+        # edges
+        self.st = []
+        self.bounds = GrowableArray(float)
+
+        # nodes
+        self.node_lbl = []
+        self.xy = GrowableArray(float)
+        self.zone = GrowableArray(bool)
+
+        # costs: edge types and edges without cost
+        self.cost_types = set()
+        self.no_cost = []
+        # polynomial: (edge, degree, value) triplets
+        self.poly_edge = GrowableArray(int)
+        self.poly_deg = GrowableArray(int)
+        self.poly_val = GrowableArray(float)
+        self.signed = GrowableArray(bool)
+        # piecewise quadratic: rows (a, b, c, tau)
+        self.pwq_edge = GrowableArray(int)
+        self.pwq_coeff = GrowableArray(float)
+        # symbolic: symbol -> values
+        self.sym = {}
+        self.sym_funcs = {}
+
+        # demand: commodities name -> list of commodities
+        self.commodities = {}
+        self.demand_func = None
+
+    @property
+    def m(self) -> int:
+        return len(self.st)
+
+    def handle(self, elem) -> None:
+        tag = elem.tag
+        if tag == "edge":
+            self._edge(elem)
+        elif tag == "node":
+            self._node(elem)
+        elif tag == "commodity":
+            self._commodity(elem, elem.getparent().get("name"))
+        elif tag == "demand_func":
+            self.demand_func = elem.text
+        elif tag == XML_SYMCOST_TAG_FUNCDEF:
+            for f in elem:
+                self.sym_funcs[f.tag] = f.text
+
+    def _edge(self, elem) -> None:
+        a = elem.attrib
+        i = self.m
+        self.st.append((a["from"], a["to"]))
+        lb = parse_number(a.get("lb", None))
+        ub = parse_number(a.get("ub", None))
+        self.bounds.extend((np.nan if lb is None else lb,
+                            np.nan if ub is None else ub))
+
+        # Cost (if any) is a child of edge
+        self.signed.append(True)
+        cost = elem.find(XML_TAG_EDGE_COST)
+        if cost is None or len(cost) == 0:
+            self.no_cost.append(i)
+            return
+        for fun in cost:
+            if fun.tag == XML_POLYCOST_TAG:
+                self._polynomial(i, fun)
+            elif fun.tag == XML_PWQ_TAG:
+                self._piecewise_quadratic(i, fun)
+            elif fun.tag == XML_SYMCOST_TAG:
+                self._symbolic(i, fun)
+            else:
+                continue
+            self.cost_types.add(fun.tag)
+
+    def _polynomial(self, i: int, elem) -> None:
+        signed = elem.attrib.get("signed", "").strip().lower() == "true"
+        self.signed.values[i] = signed
+        fct_literal = elem.attrib.get("function", None)
+        if fct_literal is not None:
+            coeff = parse_polynomial(fct_literal)
+            deg = np.arange(len(coeff))
+        else:
+            deg = [int(c.get("i")) for c in elem]
+            coeff = [float(c.text) for c in elem]
+        self.poly_edge.extend(np.full(len(deg), i))
+        self.poly_deg.extend(deg)
+        self.poly_val.extend(coeff)
+
+    def _piecewise_quadratic(self, i: int, elem) -> None:
+        for part in elem:
+            a = part.attrib
+            self.pwq_edge.append(i)
+            self.pwq_coeff.extend([parse_number(a.get(k, 0.0))
+                                   for k in ("a", "b", "c", "tau")])
+
+    def _symbolic(self, i: int, elem) -> None:
+        for symbol in elem:
+            if symbol.tag not in self.sym:
+                self.sym[symbol.tag] = GrowableArray(float)
+            self.sym[symbol.tag].append(float(symbol.text))
+
+    def _node(self, elem) -> None:
+        self.node_lbl.append(elem.get("node"))
+        self.xy.extend((parse_number(elem.get("x", 0.0)),
+                        parse_number(elem.get("y", 0.0))))
+        self.zone.append(elem.get("zone", "false").strip().lower() == "true")
+
+    def _commodity(self, elem, name) -> None:
+        a = elem.attrib
+        if all(k in a for k in ("from", "to", "rate")):
+            data = (a["from"], a["to"], float(a["rate"]))
+        else:
+            data = {b.attrib["node"]: float(b.attrib["value"])
+                    for b in elem.findall("b")}
+        self.commodities.setdefault(name, []).append(data)
+
+    def _missing_cost(self, kind: str):
+        # Handle edges without cost of type ``kind``
+        if len(self.no_cost) == 0 or self.default_edge_cost is True:
+            return None
+        if self.default_edge_cost is None or self.default_edge_cost is False:
+            s, t = self.st[self.no_cost[0]]
+            raise ValueError(f"no {kind} cost for edge from {s} to {t}")
+        return self.default_edge_cost
+
+    def cost_data(self) -> tuple:
+        """Get cost data and cost type."""
+        if len(self.cost_types) > 1:
+            raise IOError("Network has inconsistent cost types. "
+                          "The cost functions of all edges should be of "
+                          "the same type.")
+        if len(self.cost_types) == 0:
+            return None, None
+
+        kind = self.cost_types.pop()
+        if kind == XML_POLYCOST_TAG:
+            deg = self.poly_deg.values
+            coefficients = np.zeros((self.m, deg.max() + 1 if len(deg) else 1))
+            coefficients[self.poly_edge.values, deg] = self.poly_val.values
+            signed = self.signed.values.copy()
+            default = self._missing_cost("polynomial")
+            if default is not None:
+                c, s = default
+                c = np.asarray(c, dtype=float)
+                if len(c) > coefficients.shape[1]:
+                    coefficients = np.pad(coefficients,
+                                          ((0, 0), (0, len(c) - coefficients.shape[1])))
+                coefficients[np.ix_(self.no_cost, np.arange(len(c)))] = c
+                signed[self.no_cost] = s
+            return (coefficients, signed), "polynomial"
+
+        if kind == XML_PWQ_TAG:
+            edges = self.pwq_edge.values
+            coefficients = self.pwq_coeff.values.reshape(-1, 4)
+            if len(self.no_cost) > 0:
+                default = self._missing_cost("piecewise quadratic")
+                if default is None:
+                    default = _PWQ_DEFAULT
+                default = np.atleast_2d(default)
+                edges = np.concatenate([edges, np.repeat(self.no_cost, len(default))])
+                coefficients = np.vstack([coefficients,
+                                          np.tile(default, (len(self.no_cost), 1))])
+                order = np.argsort(edges, kind="stable")
+                edges, coefficients = edges[order], coefficients[order]
+            return (coefficients, edges), "piecewisequadratic"
+
+        # symbolic
+        if len(self.no_cost) > 0:
+            s, t = self.st[self.no_cost[0]]
+            raise ValueError(f"no symbolic cost for edge from {s} to {t}")
+        coeffs = {k: v.values for (k, v) in self.sym.items()}
+        funcs = {k: self.sym_funcs.get(k) for k in ("F", "f", "f1", "f2")}
+        return (coeffs, funcs), "symbolic"
+
+    def demand_data(self) -> tuple:
+        """Get demand data and mode for Network.set_demand."""
+        if len(self.commodities) == 0:
+            return None, None
+        if self.demand_func == "AffineDemandFunction":
+            return (self.commodities["b0"], self.commodities["b"]), "affine"
+        if self.demand_func not in (None, "LinearDemandFunction"):
+            raise ValueError(f"Invalid demand_func in XML: {self.demand_func}.")
+        # Use first commodities element
+        return next(iter(self.commodities.values())), "linear"
+
+    def result(self) -> dict:
+        if len(self.node_lbl) > 0:
+            node_data = (self.node_lbl,
+                         self.xy.values.reshape(-1, 2),
+                         self.zone.values)
+        else:
+            node_data = None
+
+        cost_data, cost_type = self.cost_data()
+        demand_data, demand_mode = self.demand_data()
+        return {
+            "edge_data": (np.array(self.st, dtype=str).reshape(-1, 2),
+                          self.bounds.values.reshape(-1, 2)),
+            "node_data": node_data,
+            "cost_data": cost_data,
+            "cost_type": cost_type,
+            "demand_data": demand_data,
+            "demand_mode": demand_mode,
+        }
+
+
+def _stream(source, reader: _NetworkXMLReader) -> None:
+    for (_, elem) in etree.iterparse(source, events=("end", ), tag=_TAGS):
+        reader.handle(elem)
+        if elem.tag in ("edge", "node", "commodity"):
+            # Free memory of processed elements
+            elem.clear(keep_tail=True)
+            parent = elem.getparent()
+            while elem.getprevious() is not None:
+                del parent[0]
+
+
+def read_network_xml(data, default_edge_cost=True) -> dict:
+    """Read edges, nodes, costs and demand from network XML in one pass.
+
+    Parameters
+    ----------
+    data : str, file, ElementTree or Element
+        File name, XML str, file object, the XML ElementTree, or its
+        root Element.
+    default_edge_cost : bool or tuple, default=True
+        Cost for edges without cost data, see
+        :meth:`PolynomialCost.from_xml
+        <paminco.net.cost.PolynomialCost.from_xml>`.
+
+    Returns
+    -------
+    dict
+        With keys ``edge_data``, ``node_data``, ``cost_data``,
+        ``cost_type``, ``demand_data`` and ``demand_mode``.
+    """
+    reader = _NetworkXMLReader(default_edge_cost=default_edge_cost)
+    if isinstance(data, (et.ElementTree, etree._ElementTree)):
+        data = data.getroot()
+    if isinstance(data, (et.Element, etree._Element)):
+        # Tree is already in memory, elements of xml.etree do not know
+        # their parent -> handle commodities separately
+        tags = set(_TAGS) - {"commodity"}
+        for elem in data.iter():
+            if elem.tag in tags:
+                reader.handle(elem)
+        for comms in data.iter(TAG_COMMODITIES):
+            for c in comms:
+                reader._commodity(c, comms.get("name"))
+    elif isinstance(data, str) and not data.endswith(".xml"):
+        _stream(io.BytesIO(data.encode()), reader)
+    else:
+        _stream(data, reader)
+    return reader.result()
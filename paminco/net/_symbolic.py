@@ -0,0 +1,311 @@
+"""Parsing, differentiation and compilation of symbolic cost expressions.
+
+Expressions follow the syntax of :func:`numexpr.evaluate`, e.g.,
+``"free_flow_time * (1 + b * (x / capacity)**power)"``, where ``x`` is
+the edge flow and all other names are coefficients of the edges.
+Parsed expressions, derivatives and compiled programs are memoized per
+expression string.
+"""
+import ast
+import functools
+
+import numpy as np
+
+
+# Functions of numexpr that are evaluated by numpy on scalars
+FUNCTIONS = (
+    "where", "sin", "cos", "tan", "arcsin", "arccos", "arctan", "arctan2",
+    "sinh", "cosh", "tanh", "arcsinh", "arccosh", "arctanh", "log", "log1p",
+    "log10", "exp", "expm1", "sqrt", "abs", "floor", "ceil",
+)
+_SCALAR_NAMESPACE = {name: getattr(np, name) for name in FUNCTIONS}
+_SCALAR_NAMESPACE["__builtins__"] = {}
+
+_BINOPS = {
+    ast.Add: "+", ast.Sub: "-", ast.Mult: "*", ast.Div: "/", ast.Pow: "**",
+    ast.Mod: "%", ast.BitAnd: "&", ast.BitOr: "|",
+}
+_UNARYOPS = {ast.USub: "-", ast.UAdd: "+", ast.Invert: "~"}
+_CMPOPS = {
+    ast.Lt: "<", ast.LtE: "<=", ast.Gt: ">", ast.GtE: ">=", ast.Eq: "==",
+    ast.NotEq: "!=",
+}
+
+
+@functools.lru_cache(maxsize=None)
+def parse(expr: str) -> ast.AST:
+    """Parse expression into the body of an ``ast.Expression``."""
+    try:
+        return ast.parse(expr.strip(), mode="eval").body
+    except SyntaxError as e:
+        raise ValueError(f"Invalid cost expression '{expr}'.") from e
+
+
+def to_str(node: ast.AST) -> str:
+    """Convert parsed expression back to a string."""
+    if isinstance(node, ast.Constant):
+        return repr(node.value)
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.BinOp) and type(node.op) in _BINOPS:
+        return f"({to_str(node.left)} {_BINOPS[type(node.op)]} {to_str(node.right)})"
+    if isinstance(node, ast.UnaryOp) and type(node.op) in _UNARYOPS:
+        return f"({_UNARYOPS[type(node.op)]}{to_str(node.operand)})"
+    if (isinstance(node, ast.Compare) and len(node.ops) == 1
+            and type(node.ops[0]) in _CMPOPS):
+        return (f"({to_str(node.left)} {_CMPOPS[type(node.ops[0])]} "
+                f"{to_str(node.comparators[0])})")
+    if isinstance(node, ast.Call) and isinstance(node.func, ast.Name):
+        return f"{node.func.id}({', '.join(to_str(a) for a in node.args)})"
+    raise ValueError(f"Unsupported element in cost expression: {ast.dump(node)}.")
+
+
+@functools.lru_cache(maxsize=None)
+def variables(expr: str) -> tuple:
+    """Get sorted names of all variables in expression."""
+    node = parse(expr)
+    funcs = {n.func.id for n in ast.walk(node)
+             if isinstance(n, ast.Call) and isinstance(n.func, ast.Name)}
+    names = {n.id for n in ast.walk(node) if isinstance(n, ast.Name)}
+    return tuple(sorted(names - funcs))
+
+
+# Builders that fold trivial constants to keep derivatives small
+
+def _const(value) -> ast.Constant:
+    return ast.Constant(value=value)
+
+
+def _is(node, value) -> bool:
+    return isinstance(node, ast.Constant) and node.value == value
+
+
+def _both_const(a, b) -> bool:
+    return isinstance(a, ast.Constant) and isinstance(b, ast.Constant)
+
+
+def _add(a, b):
+    if _is(a, 0):
+        return b
+    if _is(b, 0):
+        return a
+    if _both_const(a, b):
+        return _const(a.value + b.value)
+    return ast.BinOp(left=a, op=ast.Add(), right=b)
+
+
+def _sub(a, b):
+    if _is(b, 0):
+        return a
+    if _is(a, 0):
+        return _neg(b)
+    if _both_const(a, b):
+        return _const(a.value - b.value)
+    return ast.BinOp(left=a, op=ast.Sub(), right=b)
+
+
+def _mul(a, b):
+    if _is(a, 0) or _is(b, 0):
+        return _const(0)
+    if _is(a, 1):
+        return b
+    if _is(b, 1):
+        return a
+    if _both_const(a, b):
+        return _const(a.value * b.value)
+    if (isinstance(a, ast.Constant) and isinstance(b, ast.BinOp)
+            and isinstance(b.op, ast.Mult) and isinstance(b.left, ast.Constant)):
+        # c1 * (c2 * u) -> (c1 * c2) * u
+        return _mul(_const(a.value * b.left.value), b.right)
+    return ast.BinOp(left=a, op=ast.Mult(), right=b)
+
+
+def _div(a, b):
+    if _is(a, 0):
+        return _const(0)
+    if _is(b, 1):
+        return a
+    return ast.BinOp(left=a, op=ast.Div(), right=b)
+
+
+def _pow(a, b):
+    if _is(b, 0):
+        return _const(1)
+    if _is(b, 1):
+        return a
+    return ast.BinOp(left=a, op=ast.Pow(), right=b)
+
+
+def _neg(a):
+    if isinstance(a, ast.Constant):
+        return _const(-a.value)
+    return ast.UnaryOp(op=ast.USub(), operand=a)
+
+
+def _call(name: str, *args):
+    return ast.Call(func=ast.Name(id=name, ctx=ast.Load()), args=list(args), keywords=[])
+
+
+def _depends_on(node, var: str) -> bool:
+    return any(isinstance(n, ast.Name) and n.id == var for n in ast.walk(node))
+
+
+# Derivatives of functions f(u) with respect to u
+_CHAIN_RULES = {
+    "abs": lambda u: _div(u, _call("abs", u)),
+    "sqrt": lambda u: _div(_const(1), _mul(_const(2), _call("sqrt", u))),
+    "exp": lambda u: _call("exp", u),
+    "expm1": lambda u: _call("exp", u),
+    "log": lambda u: _div(_const(1), u),
+    "log1p": lambda u: _div(_const(1), _add(_const(1), u)),
+    "sin": lambda u: _call("cos", u),
+    "cos": lambda u: _neg(_call("sin", u)),
+    "tan": lambda u: _add(_const(1), _pow(_call("tan", u), _const(2))),
+    "sinh": lambda u: _call("cosh", u),
+    "cosh": lambda u: _call("sinh", u),
+    "tanh": lambda u: _sub(_const(1), _pow(_call("tanh", u), _const(2))),
+    "arctan": lambda u: _div(_const(1), _add(_const(1), _pow(u, _const(2)))),
+}
+
+
+def _diff(node, var: str):
+    if not _depends_on(node, var):
+        return _const(0)
+    if isinstance(node, ast.Name):
+        return _const(1)
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.USub, ast.UAdd)):
+        du = _diff(node.operand, var)
+        return _neg(du) if isinstance(node.op, ast.USub) else du
+    if isinstance(node, ast.BinOp):
+        a, b = node.left, node.right
+        da, db = _diff(a, var), _diff(b, var)
+        if isinstance(node.op, ast.Add):
+            return _add(da, db)
+        if isinstance(node.op, ast.Sub):
+            return _sub(da, db)
+        if isinstance(node.op, ast.Mult):
+            return _add(_mul(da, b), _mul(a, db))
+        if isinstance(node.op, ast.Div):
+            if _is(db, 0):
+                return _div(da, b)
+            return _div(_sub(_mul(da, b), _mul(a, db)), _pow(b, _const(2)))
+        if isinstance(node.op, ast.Pow):
+            if _is(db, 0):
+                # (u^n)' = n * u^(n-1) * u'
+                return _mul(_mul(b, _pow(a, _sub(b, _const(1)))), da)
+            # (u^v)' = u^v * (v' * log(u) + v * u' / u)
+            return _mul(node, _add(_mul(db, _call("log", a)),
+                                   _div(_mul(b, da), a)))
+    if isinstance(node, ast.Call) and isinstance(node.func, ast.Name):
+        name = node.func.id
+        if name == "where" and len(node.args) == 3:
+            cond, a, b = node.args
+            da, db = _diff(a, var), _diff(b, var)
+            if _is(da, 0) and _is(db, 0):
+                return _const(0)
+            return _call("where", cond, da, db)
+        if name in _CHAIN_RULES and len(node.args) == 1:
+            u = node.args[0]
+            return _mul(_CHAIN_RULES[name](u), _diff(u, var))
+    raise ValueError(f"Cannot differentiate '{to_str(node)}' with respect to '{var}'.")
+
+
+@functools.lru_cache(maxsize=None)
+def differentiate(expr: str, var: str = "x", order: int = 1) -> str:
+    """Differentiate expression symbolically.
+
+    Parameters
+    ----------
+    expr : str
+        Expression in :func:`numexpr.evaluate` syntax.
+    var : str, default="x"
+        Variable to differentiate with respect to.
+    order : int, default=1
+        Order of derivative.
+
+    Returns
+    -------
+    str
+        Expression of derivative.
+
+    Examples
+    --------
+    >>> differentiate("a * x**3 + b * x")
+    '((a * (3 * (x ** 2))) + b)'
+    >>> differentiate("a * x**3 + b * x", order=3)
+    '(a * 6)'
+    """
+    if order == 0:
+        return expr
+    if order > 1:
+        return differentiate(differentiate(expr, var, order - 1), var)
+    return to_str(_diff(parse(expr), var))
+
+
+def expression(funcs: dict, d: int, names=("F", "f", "f1", "f2")) -> str:
+    """Get expression of derivative order ``d`` from given functions.
+
+    Parameters
+    ----------
+    funcs : dict
+        Maps ``names`` (derivative orders 0, 1, ...) to expressions or
+        None if not given.
+    d : int
+        Derivative order.
+    names : tuple of str, default=("F", "f", "f1", "f2")
+        Names of derivative orders in ``funcs``.
+
+    Returns
+    -------
+    str
+        Given expression of order ``d``, or the derivative of the
+        highest given lower order.
+    """
+    if d < len(names) and funcs.get(names[d]) is not None:
+        return funcs[names[d]]
+    for d0 in range(min(d, len(names)) - 1, -1, -1):
+        if funcs.get(names[d0]) is not None:
+            return differentiate(funcs[names[d0]], "x", d - d0)
+    raise ValueError(f"No cost function to get derivative of order {d}.")
+
+
+@functools.lru_cache(maxsize=None)
+def _program(expr: str, signature: tuple):
+    import numexpr as ne
+    return ne.NumExpr(expr, signature=list(signature))
+
+
+def evaluate(expr: str, local_dict: dict):
+    """Evaluate expression on arrays by a compiled numexpr program.
+
+    The program is compiled once per expression and dtypes of the
+    variables and reused afterwards.
+    """
+    from numexpr.necompiler import getType
+
+    names = variables(expr)
+    if len(names) == 0:
+        return np.asarray(eval(_code(expr), _SCALAR_NAMESPACE, {}))
+    args = [np.asarray(local_dict[n]) for n in names]
+    signature = tuple((n, getType(a)) for (n, a) in zip(names, args))
+    return _program(expr, signature)(*args)
+
+
+@functools.lru_cache(maxsize=None)
+def _code(expr: str):
+    # Compile the expression rebuilt from its parsed tree: to_str only
+    # admits names, constants, operators, comparisons and calls
+    node = parse(expr)
+    code = to_str(node)
+    for n in ast.walk(node):
+        if isinstance(n, ast.Call) and n.func.id not in FUNCTIONS:
+            raise ValueError(f"Unsupported function '{n.func.id}' in cost expression '{expr}'.")
+        if isinstance(n, ast.Name) and n.id.startswith("__"):
+            raise ValueError(f"Invalid name '{n.id}' in cost expression '{expr}'.")
+    return compile(code, "<cost expression>", "eval")
+
+
+def evaluate_scalar(expr: str, local_dict: dict):
+    """Evaluate expression with numpy scalars, e.g., for a single edge."""
+    with np.errstate(all="ignore"):
+        return eval(_code(expr), _SCALAR_NAMESPACE, local_dict)
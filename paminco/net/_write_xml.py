@@ -0,0 +1,134 @@
+"""Streaming writer for network XML files.
+
+The network is written element by element: only the XML element of the
+edge (node, commodity) that is currently written is held in memory, the
+document tree is never built.
+"""
+import io
+import xml.etree.ElementTree as et
+from xml.sax.saxutils import quoteattr
+
+from paminco.utils.readin import xml_add_element
+from .cost import SymbolicCost
+
+
+_INDENT = "  "
+
+
+def _indent(elem: et.Element, level: int) -> None:
+    # Indent children of ``elem`` that is located at depth ``level``
+    if len(elem) == 0:
+        return
+    pad = "\n" + _INDENT * (level + 1)
+    elem.text = pad
+    for child in elem:
+        _indent(child, level + 1)
+        child.tail = pad
+    child.tail = "\n" + _INDENT * level
+
+
+class _Writer:
+
+    def __init__(self, prettify: bool = False) -> None:
+        self.prettify = prettify
+
+    def newline(self, level: int) -> bytes:
+        if self.prettify is False:
+            return b""
+        return ("\n" + _INDENT * level).encode()
+
+    def start(self, tag: str, level: int, **attrib) -> bytes:
+        attrib = "".join(f" {k}={quoteattr(v)}" for (k, v) in attrib.items())
+        return self.newline(level) + f"<{tag}{attrib}>".encode("ascii", "xmlcharrefreplace")
+
+    def end(self, tag: str, level: int) -> bytes:
+        return self.newline(level) + f"</{tag}>".encode()
+
+    def element(self, elem: et.Element, level: int) -> bytes:
+        if self.prettify is True:
+            _indent(elem, level)
+        return self.newline(level) + et.tostring(elem)
+
+
+def iter_network_xml(net, prettify: bool = False):
+    """Iterate over chunks of the XML representation of a network.
+
+    Parameters
+    ----------
+    net : Network
+        Network to write.
+    prettify : bool, default=False
+        Whether to indent elements.
+
+    Yields
+    ------
+    bytes
+        Consecutive chunks of the XML document.
+    """
+    w = _Writer(prettify=prettify)
+    yield b"<network>"
+
+    # Metadata: cost functions and type of demand function
+    metadata = et.Element("metadata")
+    if isinstance(net.cost, SymbolicCost):
+        net.cost.costfuncs_to_metadata(metadata)
+    xml_add_element(metadata, "demand_func").text = net.demand.__class__.__name__
+    yield w.element(metadata, 1)
+
+    # Edges with cost
+    yield w.start("edges", 1)
+    labels = net.edges.labels.astype(str)
+    bounds = net.edges.bounds.tolist()
+    for (i, ((s, t), (lb, ub))) in enumerate(zip(labels, bounds)):
+        edge = et.Element("edge", {"from": s, "to": t, "lb": str(lb), "ub": str(ub)})
+        net.cost.add_to_etree(edge, i, overwrite=True)
+        yield w.element(edge, 2)
+    yield w.end("edges", 1)
+
+    # Nodes
+    yield w.start("nodes", 1)
+    nodes = net.nodes
+    xy = None if nodes.xy is None else nodes.xy.tolist()
+    for (i, lbl) in enumerate(nodes.labels.astype(str)):
+        node = et.Element("node", {"node": lbl})
+        if xy is not None:
+            node.attrib["x"] = str(xy[i][0])
+            node.attrib["y"] = str(xy[i][1])
+        if nodes.zone[i]:
+            node.attrib["zone"] = "true"
+        yield w.element(node, 2)
+    yield w.end("nodes", 1)
+
+    # Demand
+    for (name, dv) in net.demand.demand_vectors.items():
+        yield w.start("commodities", 1, name=name)
+        for commodity in dv.iter_xml_commodities():
+            yield w.element(commodity, 2)
+        yield w.end("commodities", 1)
+
+    yield w.end("network", 0)
+    yield w.newline(0)
+
+
+def write_network_xml(net, file, prettify: bool = False) -> None:
+    """Write network to XML file element by element.
+
+    Parameters
+    ----------
+    net : Network
+        Network to write.
+    file : str or file object
+        File name, or a file object opened for writing.
+    prettify : bool, default=False
+        Whether to indent elements.
+    """
+    if isinstance(file, str):
+        with open(file, "wb") as f:
+            return write_network_xml(net, f, prettify=prettify)
+
+    if isinstance(file, io.TextIOBase):
+        for chunk in iter_network_xml(net, prettify=prettify):
+            file.write(chunk.decode("ascii"))
+    else:
+        for chunk in iter_network_xml(net, prettify=prettify):
+            file.write(chunk)
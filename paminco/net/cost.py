@@ -3,18 +3,16 @@ from __future__ import annotations
 import abc
 import copy
 import xml.etree.ElementTree as et
-from numpy.lib.shape_base import vsplit
-import psutil
+from itertools import zip_longest
 
 import numpy as np
-import numexpr as ne
-import pandas as pd
-import multiprocessing as mp
-from itertools import zip_longest
 
 from .shared import Shared
+from . import _symbolic as symbolic
+from . import _incidence
 from paminco.utils.typing import is_int
 from paminco.utils.misc import Cache
+from paminco.utils.math import segment_searchsorted
 from paminco.utils.readin import (
     xml_find_root,
     xml_add_element,
@@ -69,6 +67,23 @@ class NetworkCost(abc.ABC):
         """
         return self.value(*args, d=1, **kwargs)
 
+    def values(self, x, d=(0, 1)) -> tuple:
+        """Return values of several derivative orders.
+        
+        Parameters
+        ----------
+        x : float or ndarray
+            Edge flow. If float, value is broadcasted for all edges.
+        d : sequence of int, default=(0, 1)
+            Derivative orders.
+        
+        Returns
+        -------
+        tuple of ndarray
+            ``value(x, d=d_)`` for every order ``d_`` in ``d``.
+        """
+        return tuple(self.value(x, d=d_) for d_ in d)
+
     def F(self, x, dtype=None) -> np.ndarray:
         """Cost of edge.
         
@@ -133,36 +148,53 @@ class NetworkCost(abc.ABC):
         # return self.value(x, d=3, dtype=dtype)
         return self.value(x, d=3)
 
-    def edge_value(
-            self,
-            index: int,
-            x,
-            *args,
-            d: int = 0,
-            **kwargs
-            ):
+    def edge_value(self, index: int, x, d: int = 0):
         """Return value of edge cost function.
 
         Parameters
         ----------
         index : int
             The index of the edge.
-        x : float, np.array
-            The value where the cost functions are evaluated.
-            Can either be an array with values for every edge or a single
-            value that is used for all edges.
+        x : float
+            The value where the cost function of the edge is evaluated.
+        d : int, default=0
+            The derivative order. d=0 returns the function value.
+
+        Returns
+        -------
+        float
+            Cost of edge ``index`` at ``x``.
+
+        See Also
+        --------
+        edge_values : Evaluate several edges at once.
+        """
+        return self.edge_values(index, x, d=d)[()]
+
+    def edge_values(self, edges, x, d: int = 0) -> np.ndarray:
+        """Return values of the cost functions of selected edges.
+
+        Evaluates the cost of edge ``edges[i]`` at ``x[i]`` for all
+        ``i``, where ``edges`` and ``x`` are broadcast against each
+        other. Only the requested edges are evaluated.
+
+        Parameters
+        ----------
+        edges : int or array_like of int
+            Indices of edges, may contain duplicates.
+        x : float or array_like of float
+            Points where the cost functions are evaluated.
         d : int, default=0
             The derivative order. d=0 returns the function value.
 
         Returns
         -------
         ndarray
-            Costs of all edges, ndarray of float of shape (m, )
+            Costs of shape ``np.broadcast(edges, x).shape``.
         """
-        flow = np.zeros(len(self))
-        flow[index] = x
-        flow_cost = self.value(flow, *args, d=d, **kwargs)
-        return flow_cost[index]
+        edges, x = np.broadcast_arrays(edges, x)
+        out = [self.edge_cost(e)(x_e, d=d) for (e, x_e) in zip(edges.ravel(), x.ravel())]
+        return np.array(out, dtype=float).reshape(x.shape)
 
     def laplace_weights(self, x) -> np.ndarray:
         """Returns the Laplace weights for all edges at x.
@@ -229,15 +261,18 @@ class NetworkCost(abc.ABC):
             data,
             prefix: str = "",
             shared: Shared = None,
+            copy: bool = True,
             **kwargs
             ) -> PolynomialCost | PiecewiseQuadraticCost | SymbolicCost:
         if isinstance(data, str):
             data = np.load(data)
         if ("cost_type" not in data
                 or str(data["cost_type"]) == "PolynomialCost"):
-            return PolynomialCost.from_npz(data, prefix=prefix, shared=shared, **kwargs)
+            return PolynomialCost.from_npz(data, prefix=prefix, shared=shared,
+                                           copy=copy, **kwargs)
         elif str(data["cost_type"]) == "PiecewiseQuadraticCost":
-            return PiecewiseQuadraticCost.from_npz(data, prefix=prefix, shared=shared, **kwargs)
+            return PiecewiseQuadraticCost.from_npz(data, prefix=prefix, shared=shared,
+                                                   copy=copy, **kwargs)
         elif str(data["cost_type"]) == "SymbolicCost":
             return SymbolicCost.from_npz(data, prefix=prefix, shared=shared, **kwargs)
         else:
@@ -421,10 +456,46 @@ class SymbolicCost(NetworkCost):
             out += f"{k}: \t: {v}\n"
         return out
         
-    def edge_cost(self, edge: int):
-        # TODO: Create seperate class for cost functions of a single edge inheriting from EdgeCost
-        coeffs = {k: v[edge] for k, v in self.coeffs.items()}
-        return SymbolicCost(coeffs, **self.funcs, m=1)
+    def edge_cost(self, edge: int) -> SymbolicEdgeCost:
+        """Get cost of edge.
+        
+        Parameters
+        ----------
+        edge : int
+            Index of edge to get cost for.
+        
+        Returns
+        -------
+        SymbolicEdgeCost
+            Symbolic cost of single edge, evaluated on scalars.
+        """
+        coeffs = {k: (v[edge] if np.ndim(v) > 0 else v) for k, v in self.coeffs.items()}
+        return SymbolicEdgeCost(coeffs, self.funcs, edge=edge)
+    
+    def expression(self, d: int = 0) -> str:
+        """Get expression of derivative of order ``d``.
+        
+        If the function of order ``d`` is not given, it is derived
+        symbolically from the given function of the highest lower order.
+        
+        Parameters
+        ----------
+        d : int, default=0
+            Derivative order, 0 (``F``), 1 (``f``), 2 (``f1``), ...
+        
+        Returns
+        -------
+        str
+            Expression in :func:`numexpr.evaluate` syntax.
+        
+        Examples
+        --------
+        >>> import paminco
+        >>> cost = paminco.net.cost.SymbolicCost({"a": [1, 2]}, F="a * x**3")
+        >>> cost.expression(2)
+        '(a * (6 * x))'
+        """
+        return symbolic.expression(self.funcs, d, names=tuple(self.dtofunc.values()))
     
     def value(self, x, d: int = 0, dtype=None):
         if dtype is None:
@@ -434,16 +505,34 @@ class SymbolicCost(NetworkCost):
             x = np.full(self.m, x)
         local_dict = dict(self.coeffs)
         local_dict["x"] = x
-        f = self.funcs[self.dtofunc[d]]
-        val = ne.evaluate(f, local_dict)
+        val = symbolic.evaluate(self.expression(d), local_dict)
         if val.size == 1 and self.m > 1:
             return np.full(self.m, val, dtype=dtype)
         return val
     
+    def edge_values(self, edges, x, d: int = 0) -> np.ndarray:
+        edges, x = np.broadcast_arrays(edges, np.asarray(x, dtype=float))
+        local_dict = {k: (v[edges] if np.ndim(v) > 0 else v) for k, v in self.coeffs.items()}
+        local_dict["x"] = x
+        expr = self.expression(d)
+        if x.ndim == 0:
+            # Single value: compiled Python code is faster than numexpr
+            val = symbolic.evaluate_scalar(expr, local_dict)
+        else:
+            val = symbolic.evaluate(expr, local_dict)
+        # Derivatives may fold to integer constants
+        val = np.asarray(val, dtype=np.result_type(x, float))
+        if val.shape != x.shape:
+            return np.full(x.shape, val)
+        return val
+    
+    edge_values.__doc__ = NetworkCost.edge_values.__doc__
+    
     def delete_edges(self, edges) -> None:
         if len(edges) > 0:
-            for c in self.coeffs.values():
-                np.delete(c, edges)
+            for (k, c) in self.coeffs.items():
+                if np.ndim(c) > 0:
+                    self.coeffs[k] = np.delete(c, edges)
     
     def add_to_etree(
             self,
@@ -596,6 +685,42 @@ class SymbolicCost(NetworkCost):
         raise NotImplementedError()
 
 
+class SymbolicEdgeCost(EdgeCost):
+    """Symbolic cost of a single edge.
+    
+    Expressions are evaluated on numpy scalars by precompiled Python code
+    objects, which is much faster than numexpr for single values.
+    
+    Parameters
+    ----------
+    coeffs : dict
+        Values of function parameters of the edge.
+    funcs : dict
+        Expressions ``F``, ``f``, ``f1`` and ``f2`` (or None), see
+        :class:`SymbolicCost`.
+    edge : int, optional
+        Index of edge.
+    """
+    
+    def __init__(self, coeffs: dict, funcs: dict, edge: int = None) -> None:
+        super().__init__(edge)
+        self.coeffs = coeffs
+        self.funcs = funcs
+    
+    def ddx(self, x: float, d: int = 1) -> float:
+        expr = symbolic.expression(self.funcs, d, names=tuple(SymbolicCost.dtofunc.values()))
+        local_dict = dict(self.coeffs)
+        x = np.float64(x) if np.ndim(x) == 0 else np.asarray(x)
+        local_dict["x"] = x
+        val = symbolic.evaluate_scalar(expr, local_dict)
+        return np.asarray(val, dtype=np.result_type(x, float))[()]
+    
+    @property
+    def degree(self):
+        """Degree is unknown for symbolic costs, i.e., ``np.inf``."""
+        return np.inf
+
+
 class SimplePolynomial(EdgeCost):
     r"""Class representing a simple polynomial cost function.
     
@@ -783,7 +908,7 @@ class PolynomialCost(NetworkCost):
                 )
 
             # Init coeffs
-            self.coefficients = np.array(coeff, copy=True, dtype=self.dtype_float)
+            self.coefficients = np.array(coeff, copy=copy, dtype=self.dtype_float)
 
             # Init signed flags
             self.signed = signed
@@ -880,26 +1005,108 @@ class PolynomialCost(NetworkCost):
         >>> net.cost.value(1000)[:5]
         array([6.000002, 4.000002, 6.000002, 5.001241, 4.000002])
         """
-        if d > self.degree:
-            return np.zeros(len(self))
+        return self.values(x, d=(d, ))[0]
 
+    def values(self, x, d=(0, 1)) -> tuple:
+        """Return values of several derivative orders at once.
+        
+        All orders are evaluated in a single pass: powers of ``x`` are
+        computed once by repeated multiplication and shared by all
+        orders, degrees whose coefficients vanish on all edges are
+        skipped (e.g., BPR costs only use degrees 0 and 4).
+        
+        Parameters
+        ----------
+        x : float or ndarray
+            Network flow. If float, value is broadcasted for all edges.
+        d : sequence of int, default=(0, 1)
+            Derivative orders.
+        
+        Returns
+        -------
+        tuple of ndarray
+            Cost or derivative for every order in ``d``.
+        
+        Examples
+        --------
+        >>> import paminco
+        >>> net = paminco.net.load_sioux()
+        >>> F, f = net.cost.values(1000, d=(0, 1))
+        >>> np.array_equal(F, net.cost(1000))
+        True
+        """
         if isinstance(x, (int, float)):
             x = np.full(len(self), x, dtype=self.shared.dtype_float)
+        
+        # Degrees with at least one nonzero coefficient
+        nonzero = np.flatnonzero((self.coefficients != 0).any(axis=0))
+        
+        # Powers x^p (signed: sgn(x) * x^p) needed for any order
+        need = {k - d_ for d_ in d for k in nonzero if k >= d_}
+        pows = {}
+        if len(need) > 0 and max(need) > 0:
+            sgns = None
+            if np.any(self.signed):
+                sgns = np.where(self.signed & (x < 0), -1, 1).astype(x.dtype)
+            xp = x if sgns is None else sgns * x
+            for p in range(1, max(need) + 1):
+                if p > 1:
+                    xp = xp * x
+                if p in need:
+                    pows[p] = xp
+        
+        dtype = np.result_type(self.coefficients, x)
+        out = []
+        for d_ in d:
+            val = np.zeros(len(self), dtype=dtype)
+            for k in nonzero[nonzero >= d_]:
+                c_k = SimplePolynomial.derivative_factors(k, d_) * self.coefficients[:, k]
+                if k == d_:
+                    val += c_k
+                else:
+                    val += c_k * pows[k - d_]
+            out.append(val)
+        return tuple(out)
 
-        out = 0
-        sgns = None
-        # If at least one signed polynomial exists
-        if sum(self.signed) > 0:
-            sgns = np.array([-1 if self.signed[e] and v < 0 else 1 for e, v in enumerate(x)])
-
-        for k in range(d, self.degree + 1):
-            fac = SimplePolynomial.derivative_factors(k, d)
-            val_k = fac * self.coefficients[:, k] * (x ** (k - d))
-            if sgns is not None and k - d > 0:
-                val_k *= sgns
-            out += val_k
+    def edge_value(self, index: int, x, d: int = 0):
+        # Horner scheme on Python floats, numpy is slow on single values
+        idx = f"horner_{index}_{d}"
+        if self._cache.is_valid(idx) is False:
+            c = self.coefficients[index]
+            factors = [SimplePolynomial.derivative_factors(k, d) * c[k]
+                       for k in range(self.degree, d - 1, -1)]
+            self._cache[idx] = (np.array(factors, dtype=float).tolist(),
+                                bool(self.signed[index]))
+        factors, signed = self._cache[idx]
+        val = 0.
+        for c in factors[:-1]:
+            val = (val + c) * x
+        if signed and x < 0:
+            val = -val
+        if len(factors) > 0:
+            val += factors[-1]
+        return val
+    
+    edge_value.__doc__ = NetworkCost.edge_value.__doc__
 
-        return out
+    def edge_values(self, edges, x, d: int = 0) -> np.ndarray:
+        edges, x = np.broadcast_arrays(edges, x)
+        coeff = self.coefficients[edges]
+        dtype = np.result_type(coeff, x)
+        if d > self.degree:
+            return np.zeros(x.shape, dtype=dtype)
+        
+        # Horner scheme for sum_{p>=1} c_{p+d} (p+d)!/p! x^p
+        val = np.zeros(x.shape, dtype=dtype)
+        for k in range(self.degree, d, -1):
+            val += SimplePolynomial.derivative_factors(k, d) * coeff[..., k]
+            val *= x
+        if np.any(self.signed):
+            val *= np.where(np.asarray(self.signed)[edges] & (x < 0), -1, 1)
+        val += SimplePolynomial.derivative_factors(d, d) * coeff[..., d]
+        return val
+    
+    edge_values.__doc__ = NetworkCost.edge_values.__doc__
 
     def interpolate(self, rule: InterpolationRule, x_max=None, max_breakpoints_per_edge=1e5) -> PiecewiseQuadraticCost:
         """Interpolate this polynomial cost function with a piecewise quadratic cost function.
@@ -924,6 +1131,8 @@ class PolynomialCost(NetworkCost):
         return interpolator.interpolate()
     
     def _coeff_to_df(self) -> pd.DataFrame:
+        import pandas as pd
+        
         df = pd.DataFrame(self.coefficients)
         df.columns = [f"x^{i}" for i in range(df.shape[1])]
         return df
@@ -1118,10 +1327,11 @@ class PiecewiseQuadraticCoefficients:
         F_e(x) = a_{e,i} x^2 + b_{e,i} x + \mathrm{offset}_{e,i} \quad
         \text{for } x \in [\tau_{e,i}, \tau_{e,i+1})
 
-    The coefficients are stored in an array with columns ``a, b, offset,
-    tau, lap_weight, d, sig_l, sig_u``.
-    A row of this array contains the coefficients of a function part and
-    the associated lower breakpoint :math:`\tau_{e, i}`.
+    The coefficients are stored column by column (``a, b, offset, tau,
+    lap_weight, d, sig_l, sig_u``) in one contiguous array, every column
+    is a contiguous view into it. ``coefficients`` is the transposed
+    view with one row per function part, i.e., the coefficients of the
+    part and the associated lower breakpoint :math:`\tau_{e, i}`.
     Additionally to the coefficients and breakpoints ``a, b, offset, tau``
     of the function this object holds precomputed values for the
     Laplace matrix weights ``lap_weight`` defined as
@@ -1192,6 +1402,7 @@ class PiecewiseQuadraticCoefficients:
 
     PWC_COEFFICIENT_COLS = ['a', 'b', 'offset', 'tau', 'lap_weight', 'd',
                             'sig_l', 'sig_u']
+    _COL = {col: i for (i, col) in enumerate(PWC_COEFFICIENT_COLS)}
 
     def __init__(
             self,
@@ -1225,19 +1436,36 @@ class PiecewiseQuadraticCoefficients:
         if coefficients.shape[1] == 4:
             # data is coefficients of the piecewise functions that needs
             # further initialization
-            self._init_coefficients(coefficients, edge_indices, copy=copy)
+            self._init_coefficients(coefficients, edge_indices, dtype_float=dtype_float)
         else:
-            # data is array of all additionally precomputed coefficents
-            self.coefficients = np.array(coefficients, copy=copy)
+            # data is array of all additionally precomputed coefficents,
+            # (a transposed view of) column storage is not copied
+            if dtype_float is not None:
+                coefficients = coefficients.astype(dtype_float, copy=False)
+            columns = coefficients.T
+            if copy is True or columns.flags.c_contiguous is False:
+                columns = np.array(columns, order="C")
+            self._columns = columns
             self._edge_indices = np.array(edge_indices, copy=copy)
 
         self._init_position_offsets()
 
-        if dtype_float is not None:
-            self.coefficients = self.coefficients.astype(dtype_float)
         if dtype_int is None:
             dtype_int = np.int32
-        self._edge_indices = self._edge_indices.astype(dtype_int)
+        self._edge_indices = self._edge_indices.astype(dtype_int, copy=False)
+
+    @classmethod
+    def _from_columns(
+            cls,
+            columns: np.ndarray,
+            edge_indices: np.ndarray,
+            ) -> PiecewiseQuadraticCoefficients:
+        # Wrap precomputed column storage without checks or copies
+        obj = cls.__new__(cls)
+        obj._columns = columns
+        obj._edge_indices = edge_indices
+        obj._init_position_offsets()
+        return obj
 
     def __repr__(self) -> str:
         out = "Coefficients of Piecewise Quadratic Function\n"
@@ -1247,11 +1475,10 @@ class PiecewiseQuadraticCoefficients:
 
     def __getitem__(self, idx) -> PiecewiseQuadraticCoefficients:
         idx = np.ravel(idx)
-        return PiecewiseQuadraticCoefficients((self.coefficients[idx, :],
-                                               self._edge_indices[idx]))
+        return self._from_columns(self._columns[:, idx], self._edge_indices[idx])
 
     def __len__(self) -> int:
-        return len(self.coefficients)
+        return self._columns.shape[1]
 
     def __eq__(self, other) -> bool:
         if np.array_equal(self.coefficients, other.coefficients) is False:
@@ -1264,71 +1491,66 @@ class PiecewiseQuadraticCoefficients:
             self,
             coefficients: np.array,
             edge_indices: np.array,
-            copy: bool = True
+            dtype_float=None,
             ) -> None:
-        # Create (copy of) coefficent array and store (copy of) edge index array
-        self.coefficients = np.array(coefficients, copy=copy)
-        self._edge_indices = np.array(edge_indices, copy=copy)
-        self._finite_rows = np.isfinite(coefficients[:, 0])
+        # Allocate column storage once, copy a, b, offset, tau into it
+        coefficients = np.asarray(coefficients)
+        if dtype_float is None:
+            dtype_float = np.result_type(coefficients.dtype, np.float64)
+        self._columns = np.empty((len(self.PWC_COEFFICIENT_COLS), len(coefficients)),
+                                 dtype=dtype_float)
+        self._columns[:4] = coefficients.T
+        self._edge_indices = np.array(edge_indices)
+        self._finite_rows = np.isfinite(self.a)
 
         self._init_lap_weights()
         self._init_d()
         self._init_sigma()
+        del self._finite_rows
 
     def _init_lap_weights(self):
-        c = self.coefficients
         # Compute lapweights = 1 / (2 * a) (0 weights if a is infinite)
-        lap_weights = np.full((len(c), 1), 0.0)
-        lap_weights[self._finite_rows, 0] = 0.5 / c[self._finite_rows, 0]
-        # -> Append lapweights to coefficient array
-        c = np.append(c, lap_weights, axis=1)
-        self.coefficients = c
+        fr = self._finite_rows
+        lap_weight = self.lap_weight
+        lap_weight[:] = 0
+        np.divide(0.5, self.a, out=lap_weight, where=fr)
 
     def _init_d(self) -> None:
-        c = self.coefficients
-        d = np.full((len(c), 1), 0.0)
+        a, tau, d = self.a, self.tau, self.d
+        fr = self._finite_rows
+        d[:] = 0
         # Compute d = b / (2 * a) [ for finite regions ]
-        d[self._finite_rows, 0] = \
-            0.5 * c[self._finite_rows, 1] / c[self._finite_rows, 0]
+        d[fr] = 0.5 * self.b[fr] / a[fr]
 
         # Case: Infinite Rows with a = -inf
-        l_infinite_rows = ~np.logical_or(self._finite_rows, c[:, 0] > 0)
+        l_infinite_rows = ~np.logical_or(fr, a > 0)
         # -> Goto next rows
         bp_rows = np.insert(l_infinite_rows, 0, False)[:-1]
-
-        d[l_infinite_rows] = np.reshape(-c[bp_rows, 3], (-1, 1))
+        d[l_infinite_rows] = -tau[bp_rows]
 
         # Case: Infinite Rows with a = + inf
-        u_infinite_rows = ~np.logical_or(self._finite_rows, c[:, 0] < 0)
-        d[u_infinite_rows] = np.reshape(-c[u_infinite_rows, 3], (-1, 1))
-
-        # -> Append to coefficient array
-        c = np.append(c, d, axis=1)
-        self.coefficients = c
+        u_infinite_rows = ~np.logical_or(fr, a < 0)
+        d[u_infinite_rows] = -tau[u_infinite_rows]
 
     def _init_sigma(self) -> None:
-        c = self.coefficients
+        a, b, tau = self.a, self.b, self.tau
+        fr = self._finite_rows
 
         # Compute values of marginal cost at breakpoints
         # -> 2 * a * tau + b
-        sig_l = np.array(c[:, 5])
-        fr = self._finite_rows
-        sig_l[fr] = 2 * c[fr, 0] * c[fr, 3] + c[fr, 1]
+        sig_l = self.sig_l
+        sig_l[fr] = 2 * a[fr] * tau[fr] + b[fr]
         # -> At infinite rows, use the b value
-        sig_l[~self._finite_rows] = c[~self._finite_rows, 1]
+        sig_l[~fr] = b[~fr]
 
         # Values at upper breakpoints (tau_{i+1}) are just the shifted
         # values at lower breakpoints
-        sig_u = np.append(sig_l[1:], np.inf)
+        sig_u = self.sig_u
+        sig_u[:-1] = sig_l[1:]
         # Last upper breakpoints for all edges are always infinity
         # -> Identify last function parts
-        last_fct_part = (np.append(self._edge_indices[1:], [-1])
-                         - self._edge_indices) != 0
-        sig_u[last_fct_part.flatten()] = np.inf
-
-        c = np.c_[c, sig_l, sig_u]
-
-        self.coefficients = c
+        sig_u[:-1][np.diff(self._edge_indices) != 0] = np.inf
+        sig_u[-1:] = np.inf
 
     def _init_position_offsets(self) -> None:
         first_pos = np.concatenate([[0], 1 + np.diff(self.edge).nonzero()[0]])
@@ -1353,10 +1575,17 @@ class PiecewiseQuadraticCoefficients:
             An array with attribute(s) value(s)
         """
         if isinstance(attribute, list) and isinstance(attribute[0], str):
-            ret = np.array([getattr(self, a) for a in attribute]).T
-            if at is not None:
-                return ret[at, :]
-            return ret
+            if "edge" in attribute:
+                ret = np.array([getattr(self, a) for a in attribute]).T
+                return ret if at is None else ret[at, :]
+            rows = [self._COL[a] for a in attribute]
+            if at is None:
+                return self._columns[rows].T
+            at = np.asarray(at)
+            if at.dtype == bool:
+                at = np.flatnonzero(at)
+            # Gather only the requested rows of the requested columns
+            return self._columns[np.ix_(rows, np.ravel(at))].T.reshape(np.shape(at) + (-1, ))
         elif isinstance(attribute, str):
             ret = getattr(self, attribute)
             if at is not None:
@@ -1365,8 +1594,38 @@ class PiecewiseQuadraticCoefficients:
         else:
             raise ValueError("'attribute' must be (list of) strings.")
 
+    def take(self, at, out: PiecewiseQuadraticCoefficients = None) -> PiecewiseQuadraticCoefficients:
+        """Select coefficient rows at positions.
+        
+        Parameters
+        ----------
+        at : ndarray of int
+            Position indices of the rows to select.
+        out : PiecewiseQuadraticCoefficients, optional
+            Coefficients with ``len(at)`` rows whose arrays are
+            overwritten by the selection, e.g., from a previous call
+            with positions of the same edges. If None, new arrays are
+            allocated.
+        
+        Returns
+        -------
+        PiecewiseQuadraticCoefficients
+            Selected coefficients, ``out`` if given.
+        """
+        at = np.ravel(at)
+        if out is None or len(out) != len(at) or out.dtype_float != self.dtype_float:
+            return self[at]
+        np.take(self._columns, at, axis=1, out=out._columns)
+        edge = self._edge_indices[at]
+        if np.array_equal(edge, out._edge_indices) is False:
+            out._edge_indices = edge
+            out._init_position_offsets()
+        return out
+
     def to_df(self) -> pd.DataFrame:
         """Get piecewise coefficients as DataFrame."""
+        import pandas as pd
+        
         df = pd.DataFrame(
             self.coefficients,
             columns=PiecewiseQuadraticCoefficients.PWC_COEFFICIENT_COLS
@@ -1423,20 +1682,28 @@ class PiecewiseQuadraticCoefficients:
 
     from_npz.__func__.__doc__ = _doc.from_npz.__doc__
 
+    @property
+    def coefficients(self) -> np.ndarray:
+        """Coefficient array with columns ``PWC_COEFFICIENT_COLS``.
+        
+        Transposed view of the column storage, no copy.
+        """
+        return self._columns.T
+
     @property
     def a(self) -> np.ndarray:
         r"""All coefficients :math:`a_{e, t}`."""
-        return self.coefficients[:, 0]
+        return self._columns[0]
 
     @property
     def b(self) -> np.ndarray:
         r"""All coefficients :math:`b_{e, t}`."""
-        return self.coefficients[:, 1]
+        return self._columns[1]
 
     @property
     def d(self) -> np.ndarray:
         r"""All values :math:`d_{e, t} = \frac{b_{e,t}}{2 a_{e,t}}`."""
-        return self.coefficients[:, 5]
+        return self._columns[5]
 
     @property
     def edge(self) -> np.ndarray:
@@ -1446,12 +1713,12 @@ class PiecewiseQuadraticCoefficients:
     @property
     def lap_weight(self) -> np.ndarray:
         """All laplace weights."""
-        return self.coefficients[:, 4]
+        return self._columns[4]
         
     @property
     def offset(self) -> np.ndarray:
         r"""All coefficients :math:`\mathrm{offset}_{e, t}`."""
-        return self.coefficients[:, 2]
+        return self._columns[2]
 
     @property
     def first_pos(self) -> np.ndarray:
@@ -1466,17 +1733,17 @@ class PiecewiseQuadraticCoefficients:
     @property
     def sig_l(self) -> np.ndarray:
         """All derivative values at lower breakpoints."""
-        return self.coefficients[:, 6]
+        return self._columns[6]
 
     @property
     def sig_u(self) -> np.ndarray:
         """All derivative values at upper breakpoints."""
-        return self.coefficients[:, 7]
+        return self._columns[7]
 
     @property
     def tau(self) -> np.ndarray:
         r"""All breakpoints :math:`\tau_{e,t}` of all edges"""
-        return self.coefficients[:, 3]
+        return self._columns[3]
 
     @property
     def m(self) -> np.ndarray:
@@ -1486,7 +1753,7 @@ class PiecewiseQuadraticCoefficients:
     @property
     def dtype_float(self):
         """Datatype of coefficients."""
-        return self.coefficients.dtype
+        return self._columns.dtype
 
     @property
     def dtype_int(self):
@@ -1668,10 +1935,8 @@ class PiecewiseQuadraticCost(NetworkCost):
         e = e[fin]
         idx = np.concatenate([[0], 1 + np.diff(e).nonzero()[0]])
 
-        # calculate slopes
-        np.abs(a, out=a)
-        np.log2(a, out=a)
-        a = np.floor(a).astype(int)
+        # calculate slopes (a may be a read-only memory map)
+        a = np.floor(np.log2(np.abs(a))).astype(int)
 
         # get minimum for all edges
         self._rounding_margins = np.minimum.reduceat(a, idx)
@@ -1732,6 +1997,21 @@ class PiecewiseQuadraticCost(NetworkCost):
 
         return self._val_from_pos(flow=x, d=d, pos=at)
 
+    def edge_values(self, edges, x, d: int = 0) -> np.ndarray:
+        if d < 0:
+            raise ValueError("Invalid dervative order 'd' " + str(d))
+        edges, x = np.broadcast_arrays(edges, x)
+        if d > 2 or x.size == 0:
+            return np.zeros(x.shape)
+        
+        # Last piece of edge with tau <= x
+        first = self.first_pos[edges]
+        pos = segment_searchsorted(self._ec.tau, first, self.last_pos[edges], x) - 1
+        pos = np.maximum(pos, first)
+        return self._val_from_pos(flow=x.ravel(), d=d, pos=pos.ravel()).reshape(x.shape)
+    
+    edge_values.__doc__ = NetworkCost.edge_values.__doc__
+
     def _val_from_pos(
             self,
             flow,
@@ -1796,7 +2076,8 @@ class PiecewiseQuadraticCost(NetworkCost):
     def get_coefficients(
             self,
             at: np.ndarray,
-            is_region: bool = False
+            is_region: bool = False,
+            out: PiecewiseQuadraticCoefficients = None,
             ) -> PiecewiseQuadraticCoefficients:
         """Return PiecewiseQuadraticCoefficients for given positions.
         
@@ -1810,6 +2091,9 @@ class PiecewiseQuadraticCost(NetworkCost):
         is_region : bool, default=False
             If set to True, at is assumed to contain region indices
             rather than position indices.
+        out : PiecewiseQuadraticCoefficients, optional
+            Coefficients of a previous call whose arrays are reused,
+            see :meth:`PiecewiseQuadraticCoefficients.take`.
         
         Returns
         -------
@@ -1820,7 +2104,7 @@ class PiecewiseQuadraticCost(NetworkCost):
         if is_region is True:
             at = self._ec.region_to_pos(at)
 
-        return self._ec[at]
+        return self._ec.take(at, out=out)
 
     def delete_edges(
             self,
@@ -1829,8 +2113,7 @@ class PiecewiseQuadraticCost(NetworkCost):
 
         # delete from coefficients
         # 1) identify rows to keep
-        edges = np.array(edges).reshape(1, -1)
-        to_keep = ~((self._ec.edge.reshape(-1, 1) - edges) == 0).any(axis=1)
+        to_keep = ~np.isin(self._ec.edge, np.array(edges).ravel())
         self._ec = self._ec[to_keep]
 
         # 2) reset indexing of edge in coefficients
@@ -1948,35 +2231,51 @@ class PiecewiseQuadraticCost(NetworkCost):
             flow: np.ndarray,
             up_bias: float = 1e-05,
             ) -> np.ndarray:
-        # references for convenience
-        edge = self.get("edge").ravel()
-        tau = self.get("tau").ravel()
-
-        # map flows to edges in data
-        repeats = np.concatenate([[0],
-                                  1 + np.diff(edge).nonzero()[0],
-                                  [len(edge)]])
-        repeats = np.diff(repeats)
-        flows = np.repeat(flow, repeats) + up_bias
-
-        # determine the first positions where df.tau <= df.flow
-        tau_smaller_flow = (tau <= flows) * (edge + 1)
-        index = np.hstack(((np.diff(tau_smaller_flow) < 0), False))
-
-        out = np.copy(self.last_pos)
-        out[edge[index]] = np.where(index)[0]
-        return out
+        """Find the positions of the function parts at ``flow``.
+        
+        For every edge, binary search for the last breakpoint ``tau``
+        with ``tau <= flow + up_bias`` among the breakpoints of the edge.
+        Flows below the first breakpoint are mapped to the first part.
+        
+        Parameters
+        ----------
+        flow : ndarray
+            Flow on all edges.
+        up_bias : float, default=1e-05
+            Flows this close below a breakpoint are mapped to the part
+            that starts at the breakpoint.
+        
+        Returns
+        -------
+        ndarray of int
+            Position indices, one for every edge.
+        """
+        pos = segment_searchsorted(self._ec.tau, self.first_pos, self.last_pos,
+                                   np.asarray(flow) + up_bias) - 1
+        return np.maximum(pos, self.first_pos)
 
     def position_of_potential(self, potential: np.ndarray) -> np.ndarray:
-        pot_diff = potential * self._s.Gamma()
-        pos = np.zeros(self._s.m, dtype=self._s.dtype_int)
-        for e in range(self._s.m):
-            for i in range(self.first_pos[e], self.last_pos[e] + 1):
-                if self._ec.sigl[i] <= pot_diff[e] and \
-                   pot_diff[e] < self._ec.sigu[i]:
-                    pos[e] = i
-                    break
-        return pos
+        """Find the positions of the function parts at ``potential``.
+        
+        For every edge, find the part whose marginal cost interval
+        ``[sig_l, sig_u)`` contains the potential difference of the
+        edge by binary search.
+        
+        Parameters
+        ----------
+        potential : ndarray
+            Potential of all nodes.
+        
+        Returns
+        -------
+        ndarray of int
+            Position indices, one for every edge.
+        """
+        s, t = self._s.edges.indices.T
+        pot_diff = _incidence.gather(s, t, np.asarray(potential))
+        pos = segment_searchsorted(self._ec.sig_u, self.first_pos, self.last_pos,
+                                   pot_diff)
+        return np.minimum(pos, self.last_pos)
 
     def region_of(
             self,
@@ -2071,8 +2370,9 @@ class PiecewiseQuadraticCost(NetworkCost):
             If ``True``, existing cost data in edge_node will be
             overwritten.
         """
-        # Get edge coefficients for edge
-        ec = self._ec[(self._ec.edge == idx)]
+        # Get edge coefficients for edge (sorted by edge)
+        lo, hi = np.searchsorted(self._ec.edge, [idx, idx + 1])
+        ec = self._ec.coefficients[lo:hi, :4]
 
         cost_node = edge_node.find("cost")
         if cost_node is None:
@@ -2083,12 +2383,12 @@ class PiecewiseQuadraticCost(NetworkCost):
         if pcost_node is None:
             pcost_node = et.SubElement(cost_node, "piecewisequadratic")
 
-        for i in range(len(ec)):
+        for (a, b, c, tau) in ec:
             fp = et.SubElement(pcost_node, "functionpart")
-            fp.attrib['a'] = str(ec.a[i])
-            fp.attrib['b'] = str(ec.b[i])
-            fp.attrib['c'] = str(ec.offset[i])
-            fp.attrib['tau'] = str(ec.tau[i])
+            fp.attrib['a'] = str(a)
+            fp.attrib['b'] = str(b)
+            fp.attrib['c'] = str(c)
+            fp.attrib['tau'] = str(tau)
 
     @classmethod
     def from_xml(
@@ -2179,15 +2479,18 @@ class PiecewiseQuadraticCost(NetworkCost):
             data,
             shared: Shared = None,
             prefix: str = "",
+            copy: bool = True,
             **kwargs
             ) -> PiecewiseQuadraticCost:
         if isinstance(data, str):
             data = np.load(data)
-        ec = PiecewiseQuadraticCoefficients.from_npz(data, prefix=prefix + "ec_")
+        ec = PiecewiseQuadraticCoefficients.from_npz(data, prefix=prefix + "ec_",
+                                                     copy=copy)
         if any([k.startswith(prefix + "poly_") for k in data.keys()]):
             polycost = PolynomialCost.from_npz(data,
                                                shared=shared,
-                                               prefix=prefix + "poly_")
+                                               prefix=prefix + "poly_",
+                                               copy=copy)
             return cls((polycost, ec), **kwargs, shared=shared)
         return cls(ec, **kwargs, shared=shared)
 
@@ -2205,7 +2508,7 @@ class PiecewiseQuadraticCost(NetworkCost):
     @property
     def m(self) -> int:
         """Number of cost functions (= number of edges)."""
-        return len(self._pos)
+        return len(self)
 
     @property
     def first_pos(self) -> np.ndarray:
@@ -2227,8 +2530,19 @@ class InterpolationRule(abc.ABC):
     """Abstract class for a breakpoint computation rule for the interpolation."""
 
     @abc.abstractmethod
-    def step(self, edge_cost, edge: int, x: float):
-        """Compute the next breakpoint :math:`x_{i+1}`."""
+    def step(self, cost, edge: int, x: float):
+        """Compute the next breakpoint :math:`x_{i+1}`.
+
+        Parameters
+        ----------
+        cost : NetworkCost
+            The network cost that is interpolated, the cost of ``edge``
+            is evaluated by :meth:`NetworkCost.edge_value`.
+        edge : int
+            The index of the edge that is interpolated.
+        x : float
+            The last breakpoint.
+        """
         ...
 
 
@@ -2243,7 +2557,7 @@ class BreakpointsInterpolationRule(InterpolationRule):
     def __init__(self, breakpoints):
         self.breakpoints = breakpoints
 
-    def step(self, edge_cost, edge: int, x: float) -> float:
+    def step(self, cost, edge: int, x: float) -> float:
         """Return the closest breakpoint to ``x`` in ``self.breakpoints``"""
         for bp in self.breakpoints:
             if bp > x:
@@ -2266,10 +2580,10 @@ class EquidistantInterpolationRule(InterpolationRule):
     def __init__(self, delta_x: float):
         self.delta_x = delta_x
     
-    def step(self, edge_cost, edge: int, x: float):
+    def step(self, cost, edge: int, x: float):
         r"""Compute the next breakpoint :math:`x_{i+1} = x_{i} + \Delta x`.
         
-        Parameters ``edge_cost`` and ``edge`` are not used."""
+        Parameters ``cost`` and ``edge`` are not used."""
         return self.delta_x
 
 
@@ -2337,10 +2651,12 @@ class NetworkCostInterpolation():
             The piecewise quadratic network cost that interpolate the network cost
         """
         if multiprocessing is True:
+            import multiprocessing as mp
+            import psutil
+            
             num_cpus = psutil.cpu_count(logical=False) - 1
             pool = mp.Pool(num_cpus)
-            edge_idx = np.array_split(np.arange(self.shared.m), self.shared.m)
-            data = pool.map(self._interpolate_edge, edge_idx)
+            data = pool.map(self._interpolate_edge, range(self.shared.m))
             data = np.vstack([*data])
         else:
             data = []
@@ -2362,7 +2678,7 @@ class NetworkCostInterpolation():
         lb = self.shared.edges.lb[edge]
         ub = self.shared.edges.ub[edge]
         ei = EdgeCostInterpolation(edge,
-                                   self.cost[edge],
+                                   self.cost,
                                    self.rule,
                                    self.x_max,
                                    lb,
@@ -2383,8 +2699,10 @@ class EdgeCostInterpolation():
     ----------
     edge: int
         The index of the edge that is interpolated.
-    edge_cost: EdgeCost
-        The :class:`EdgeCost` function to interpolate
+    cost: NetworkCost
+        The :class:`NetworkCost` whose cost of ``edge`` is interpolated.
+        Evaluated by :meth:`NetworkCost.edge_value`, no :class:`EdgeCost`
+        objects are created.
     rule: InterpolationRule
             The :class:`InterpolationRule` for the breakpoint computation in the interpolation
     x_max: float, default=None
@@ -2403,7 +2721,7 @@ class EdgeCostInterpolation():
     def __init__(
             self,
             edge: int,
-            edge_cost: EdgeCost,
+            cost: NetworkCost,
             rule: InterpolationRule,
             x_max: float,
             lb: float = -np.inf,
@@ -2411,15 +2729,15 @@ class EdgeCostInterpolation():
             max_breakpoints: int = 1e5
             ) -> None:
         self.edge = edge
-        self.cost = edge_cost
+        self.cost = cost
         self.rule = rule
         self.x_max = x_max
         self.lb = lb
         self.ub = ub
         self.max_breakpoints = max_breakpoints
 
-        self.F = lambda x: edge_cost(x, d=0)
-        self.f = lambda x: edge_cost(x, d=1)
+        self.F = lambda x: cost.edge_value(edge, x, d=0)
+        self.f = lambda x: cost.edge_value(edge, x, d=1)
 
     def interpolate(self) -> np.ndarray:
         """Interpolate the Edge cost.
@@ -8,6 +8,7 @@ import numpy as np
 import scipy.sparse as sps
 
 from .shared import Shared, ID_UNMAPPED, LBL_UNMAPPED
+from ._labels import LabelTable
 from paminco.utils.readin import xml_find_root, xml_add_element
 from paminco.utils.typing import is_int
 from paminco.utils.misc import Cache
@@ -759,13 +760,23 @@ class _DV(abc.ABC):
         commodities = et.SubElement(root, 'commodities')
         if name is not None:
             commodities.attrib["name"] = name
+        commodities.extend(self.iter_xml_commodities())
+
+    def iter_xml_commodities(self):
+        """Iterate over commodities as xml.etree.ElementTree.Element.
         
-        spmat = self.sparse()
+        Yields
+        ------
+        xml.etree.ElementTree.Element
+            'commodity' element for every commodity (column) of the
+            demand vector.
+        """
+        spmat = sps.csc_matrix(self.sparse())
         for i in range(spmat.shape[1]):
-            col = spmat[:, i]
-            lbls = self.shared.get_node_label(col.indices)
-            data = col.data
-            com_node = et.SubElement(commodities, 'commodity')
+            sl = slice(spmat.indptr[i], spmat.indptr[i + 1])
+            lbls = self.shared.get_node_label(spmat.indices[sl])
+            data = spmat.data[sl]
+            com_node = et.Element('commodity')
             
             if len(data) == 2:
                 # Commodity with single source and single sink
@@ -780,6 +791,7 @@ class _DV(abc.ABC):
                         b_node = et.SubElement(com_node, 'b')
                         b_node.attrib['node'] = elem_lbl
                         b_node.attrib['value'] = str(elem_val)
+            yield com_node
 
     @classmethod
     def from_npz(
@@ -791,7 +803,7 @@ class _DV(abc.ABC):
             ) -> DemandVector | DemandVectorSP:
         if isinstance(data, str):
             data = np.load(data)
-        if prefix + "node_labels" in data:
+        if prefix + "node_label_codes" in data or prefix + "node_labels" in data:
             return DemandVectorSP.from_npz(data, shared=shared, prefix=prefix, **kwargs)
         return DemandVector.from_npz(data, shared=shared, prefix=prefix, **kwargs)
     
@@ -1306,6 +1318,7 @@ class DemandVectorSP(_DV):
     all_single
     rate
     total_rate
+    node_labels
     source_lbl
     sink_lbl
     source_id
@@ -1326,18 +1339,20 @@ class DemandVectorSP(_DV):
             dtype_int=dtype_int,
             dtype_float=dtype_float,
         )
+        self._label_table = _label_table_of(shared)
         if isinstance(data, DemandVectorSP):
-            self._node_labels = np.array(data._node_labels, copy=copy)
+            self._label_table = data._label_table
+            self._label_codes = np.array(data._label_codes, copy=copy)
             self._node_ids = np.array(data._node_ids, copy=copy)
             self._rates = np.array(data._rates, copy=copy)
         elif isinstance(data, (list, np.ndarray)):
             data = np.array(data, copy=False)
             if is_label is True:
-                self._node_labels = data[:, :2].astype(str)
-                self._node_ids = np.ones_like(self._node_labels, dtype=int) * ID_UNMAPPED
+                self.node_labels = data[:, :2]
+                self._node_ids = np.full(self._label_codes.shape, ID_UNMAPPED, dtype=int)
             else:
                 self._node_ids = data[:, :2].astype(int)
-                self._node_labels = np.full(self._node_ids.shape, LBL_UNMAPPED)
+                self.node_labels = np.full(self._node_ids.shape, LBL_UNMAPPED)
             self._rates = data[:, 2].astype(float)
         else:
             raise TypeError("Invalid input data.")
@@ -1346,7 +1361,7 @@ class DemandVectorSP(_DV):
         zc = (self._rates == 0)
         self._rates = np.delete(self._rates, zc)
         self._node_ids = np.delete(self._node_ids, zc, axis=0)
-        self._node_labels = np.delete(self._node_labels, zc, axis=0)
+        self._label_codes = np.delete(self._label_codes, zc, axis=0)
         
         self.cache = Cache()
 
@@ -1354,7 +1369,7 @@ class DemandVectorSP(_DV):
         return len(self._rates)
 
     def __eq__(self, other) -> bool:
-        for att in ["_rates", "_node_ids", "_node_labels"]:
+        for att in ["_rates", "_node_ids", "node_labels"]:
             if np.array_equal(getattr(self, att), getattr(other, att)) is False:
                 return False
         return True
@@ -1364,23 +1379,29 @@ class DemandVectorSP(_DV):
     
     reset_cache.__doc__ = _doc.reset_cache.__doc__
 
+    def _set_label_table(self, table: LabelTable) -> None:
+        self._label_codes = table.recode(self._label_codes, self._label_table)
+        self._label_table = table
+
     def map_node_label_to_id(self) -> None:
+        # Store labels in table of nodes -> map codes to node indices
+        nodes = self.shared.nodes
+        self._set_label_table(nodes.label_table)
         try:
-            self._node_ids = (self.shared.get_node_id(self._node_labels,
-                                                      vectorize=True)
-                              .astype(int))
+            self._node_ids = nodes.code_to_index(self._label_codes).astype(int)
         except KeyError as e:
             raise KeyError("Node id " + str(e) + " not in network nodes.")
     
     map_node_label_to_id.__doc__ = DemandVector.map_node_label_to_id.__doc__
 
     def map_node_id_to_label(self) -> None:
-        try:
-            self._node_labels = (self.shared.get_node_label(self._node_ids,
-                                                            vectorize=True)
-                                 .astype(str))
-        except KeyError as e:
-            raise KeyError("Node id " + str(e) + " not in network nodes.")
+        nodes = self.shared.nodes
+        ids = self._node_ids
+        if np.any((ids < 0) | (ids >= len(nodes))):
+            invalid = ids[(ids < 0) | (ids >= len(nodes))][0]
+            raise KeyError("Node id " + str(invalid) + " not in network nodes.")
+        self._label_table = nodes.label_table
+        self._label_codes = nodes.label_codes[ids]
 
     map_node_id_to_label.__doc__ = DemandVector.delete_nodes.__doc__
 
@@ -1410,16 +1431,14 @@ class DemandVectorSP(_DV):
 
     def delete_nodes(self, nodes) -> int:
         len_before = len(self)
-        nodes = np.array(nodes).reshape(1, -1)
+        nodes = np.array(nodes).ravel()
         
         # identify commodities where source or sink equals nodes
-        idx_source = ((self.source_id.reshape(-1, 1) - nodes) == 0).any(axis=1)
-        idx_sink = ((self.sink_id.reshape(-1, 1) - nodes) == 0).any(axis=1)
-        all_idx = idx_source | idx_sink
+        all_idx = np.isin(self.source_id, nodes) | np.isin(self.sink_id, nodes)
         
         # delete indices in data arrays
         self._rates = np.delete(self._rates, all_idx, axis=0)
-        self._node_labels = np.delete(self._node_labels, all_idx, axis=0)
+        self._label_codes = np.delete(self._label_codes, all_idx, axis=0)
         self._node_ids = np.delete(self._node_ids, all_idx, axis=0)
         
         self.reset_cache()
@@ -1480,12 +1499,13 @@ class DemandVectorSP(_DV):
             save_dict["demand_type"] = self.__class__.__name__
         
         save_att = {
-            "node_labels": "_node_labels",
+            "node_label_codes": "_label_codes",
             "node_ids": "_node_ids",
             "rates": "_rates",
         }
         for (k, v) in save_att.items():
             save_dict[prefix + k] = getattr(self, v)
+        save_dict[prefix + "node_label_table"] = self._label_table.labels
         
         return save_dict
     
@@ -1516,12 +1536,18 @@ class DemandVectorSP(_DV):
         
         # make empty edge object and fill with data
         dv = cls.__new__(cls)
+        dv._label_table = _label_table_of(shared)
         if len(data[prefix + "rates"]) == 0:
-            dv._node_labels = np.empty((0, 2), str)
+            dv._label_codes = np.empty((0, 2), LabelTable.dtype_code)
             dv._node_ids = np.empty((0, 2), int)
             dv._rates = np.empty(0)
+        elif prefix + "node_label_codes" in data:
+            dv._label_codes = data[prefix + "node_label_codes"]
+            dv._set_label_table(LabelTable(data[prefix + "node_label_table"]))
+            dv._node_ids = data[prefix + "node_ids"]
+            dv._rates = data[prefix + "rates"]
         else:
-            dv._node_labels = data[prefix + "node_labels"]
+            dv.node_labels = data[prefix + "node_labels"]
             dv._node_ids = data[prefix + "node_ids"]
             dv._rates = data[prefix + "rates"]
         dv._s = shared
@@ -1531,6 +1557,53 @@ class DemandVectorSP(_DV):
     
     from_npz.__func__.__doc__ = _doc.from_npz_shared.__doc__
 
+    @classmethod
+    def from_arrays(
+            cls,
+            sources,
+            sinks,
+            rates,
+            shared=None,
+            is_label: bool = True,
+            ) -> DemandVectorSP:
+        """Construct DemandVectorSP from arrays of OD pairs.
+        
+        Parameters
+        ----------
+        sources : ndarray
+            Node labels (or node indices if ``is_label == False``) of
+            sources, ndarray (k, ).
+        sinks : ndarray
+            Node labels (or indices) of sinks, ndarray (k, ).
+        rates : ndarray
+            Rates, ndarray (k, ) of float. Commodities with rate zero
+            are dropped.
+        shared : Shared, optional
+            Shared object for all network objects.
+        is_label : bool, default=True
+            Whether sources and sinks are node labels or indices.
+        
+        Returns
+        -------
+        DemandVectorSP
+        """
+        rates = np.asarray(rates, dtype=float)
+        nz = (rates != 0)
+        st = np.column_stack((np.asarray(sources)[nz], np.asarray(sinks)[nz]))
+        
+        dv = cls.__new__(cls)
+        _DV.__init__(dv, shared=shared)
+        dv._label_table = _label_table_of(shared)
+        if is_label is True:
+            dv.node_labels = st
+            dv._node_ids = np.full(st.shape, ID_UNMAPPED, dtype=int)
+        else:
+            dv._node_ids = st.astype(int)
+            dv.node_labels = np.full(st.shape, LBL_UNMAPPED)
+        dv._rates = rates[nz]
+        dv.cache = Cache()
+        return dv
+
     @property
     def all_single(self) -> bool:
         return True
@@ -1542,15 +1615,24 @@ class DemandVectorSP(_DV):
         """ndarray (k, ) of flow: rates."""
         return self._rates
 
+    @property
+    def node_labels(self) -> np.ndarray:
+        """ndarray (k, 2) of str: source and sink labels."""
+        return self._label_table.decode(self._label_codes)
+
+    @node_labels.setter
+    def node_labels(self, val) -> None:
+        self._label_codes = self._label_table.encode(val)
+
     @property
     def source_lbl(self) -> np.ndarray:
         """ndarray (k, ) of str: source labels."""
-        return self._node_labels[:, 0]
+        return self._label_table.decode(self._label_codes[:, 0])
 
     @property
     def sink_lbl(self) -> np.ndarray:
         """ndarray (k, ) of str: sink labels."""
-        return self._node_labels[:, 1]
+        return self._label_table.decode(self._label_codes[:, 1])
 
     @property
     def source_id(self) -> np.ndarray:
@@ -1569,6 +1651,13 @@ class DemandVectorSP(_DV):
     total_rate.__doc__ = DemandVector.total_rate.__doc__
 
 
+def _label_table_of(shared) -> LabelTable:
+    # Store labels in the table of the network nodes if available
+    if shared is None:
+        return LabelTable()
+    return shared.nodes.label_table
+
+
 def read_comm_from_xml(data):
     """Read commodity data from XML.
     
@@ -0,0 +1,470 @@
+r"""Synthetic network generators for benchmarks and stress tests.
+
+All generators build :class:`~paminco.net.network.Network` objects
+directly from arrays, i.e., without any round trip through XML or TNTP
+files. Edge costs are BPR travel time functions
+
+.. math::
+    F_e(x) = t_e \left(1 + \alpha \left(\frac{x}{c_e}\right)^{\beta}\right)
+
+stored as :class:`~paminco.net.cost.PolynomialCost`, and demand is
+derived from a gravity model and stored in an array-backed
+:class:`~paminco.net.demand.DemandVectorSP`.
+"""
+from __future__ import annotations
+
+import numpy as np
+
+from .network import Network
+from .cost import PolynomialCost
+from .demand import DemandVectorSP, LinearDemandFunction
+
+
+BPR_ALPHA = 0.15
+BPR_POWER = 4
+
+
+def bpr_coefficients(
+        free_flow_time,
+        capacity,
+        alpha=BPR_ALPHA,
+        power: int = BPR_POWER,
+        ) -> np.ndarray:
+    r"""Polynomial coefficients of BPR travel time functions.
+
+    Parameters
+    ----------
+    free_flow_time : float or array_like
+        Free flow travel times :math:`t_e`.
+    capacity : float or array_like
+        Edge capacities :math:`c_e`.
+    alpha : float or array_like, default=0.15
+        BPR scale parameter :math:`\alpha`.
+    power : int, default=4
+        BPR exponent :math:`\beta`.
+
+    Returns
+    -------
+    ndarray
+        Ndarray of shape (m, power + 1), only columns ``0`` and
+        ``power`` are nonzero.
+
+    Examples
+    --------
+    >>> from paminco.net.generate import bpr_coefficients
+    >>> bpr_coefficients([1., 2.], [10., 20.], alpha=1, power=2)
+    array([[1.   , 0.   , 0.01 ],
+           [2.   , 0.   , 0.005]])
+    """
+    if int(power) != power or power < 1:
+        raise ValueError(f"BPR power must be a positive integer, is: {power}.")
+    power = int(power)
+    free_flow_time, capacity, alpha = np.broadcast_arrays(
+        np.asarray(free_flow_time, dtype=float),
+        np.asarray(capacity, dtype=float),
+        np.asarray(alpha, dtype=float),
+    )
+    coeffs = np.zeros((free_flow_time.size, power + 1))
+    coeffs[:, 0] = free_flow_time.ravel()
+    coeffs[:, power] = (free_flow_time * alpha / capacity**power).ravel()
+    return coeffs
+
+
+def gravity_demand(
+        xy: np.ndarray,
+        zones=None,
+        production=None,
+        attraction=None,
+        total_demand: float = None,
+        deterrence: float = 1.,
+        min_rate: float = 0.,
+        ) -> np.ndarray:
+    r"""Origin-destination demand from a gravity model.
+
+    The rate between zones :math:`i \neq j` is given by
+
+    .. math::
+        T_{ij} \propto P_i A_j \exp(-\gamma \, d_{ij}),
+
+    where :math:`P` is the production, :math:`A` the attraction,
+    :math:`d_{ij}` the euclidean distance and :math:`\gamma` the
+    ``deterrence``. Rates are scaled such that they sum up to
+    ``total_demand``.
+
+    Parameters
+    ----------
+    xy : ndarray
+        Ndarray of shape (n, 2), coordinates of all nodes.
+    zones : array_like, optional
+        Node ids that act as origins and destinations. If None, all
+        nodes are zones.
+    production : array_like, optional
+        Production of every zone, defaults to ones.
+    attraction : array_like, optional
+        Attraction of every zone, defaults to ``production``.
+    total_demand : float, optional
+        Sum of all rates. If None, the sum of the production is used.
+    deterrence : float, default=1
+        Exponential decay of rates with distance.
+    min_rate : float, default=0
+        OD pairs with rates ``<= min_rate`` are dropped.
+
+    Returns
+    -------
+    ndarray
+        Ndarray of shape (k, 3) with rows ``[source_id, target_id,
+        rate]``, which can be passed to
+        :class:`~paminco.net.demand.DemandVectorSP` with
+        ``is_label=False``.
+    """
+    xy = np.asarray(xy, dtype=float)
+    if zones is None:
+        zones = np.arange(len(xy))
+    zones = np.asarray(zones, dtype=int)
+    nz = len(zones)
+    if production is None:
+        production = np.ones(nz)
+    production = np.broadcast_to(np.asarray(production, dtype=float), (nz, ))
+    if attraction is None:
+        attraction = production
+    attraction = np.broadcast_to(np.asarray(attraction, dtype=float), (nz, ))
+    if total_demand is None:
+        total_demand = production.sum()
+
+    # Distance decay between all zones, no intra zonal trips
+    zxy = xy[zones]
+    dist = np.sqrt(((zxy[:, None, :] - zxy[None, :, :])**2).sum(axis=2))
+    rates = np.exp(-deterrence * dist, out=dist)
+    rates *= production[:, None]
+    rates *= attraction[None, :]
+    np.fill_diagonal(rates, 0)
+
+    total = rates.sum()
+    if total > 0:
+        rates *= total_demand / total
+
+    src, tgt = np.nonzero(rates > min_rate)
+    od = np.empty((len(src), 3))
+    od[:, 0] = zones[src]
+    od[:, 1] = zones[tgt]
+    od[:, 2] = rates[src, tgt]
+    return od
+
+
+def from_arrays(
+        st: np.ndarray,
+        xy: np.ndarray = None,
+        free_flow_time=1.,
+        capacity=1.,
+        alpha=BPR_ALPHA,
+        power: int = BPR_POWER,
+        od: np.ndarray = None,
+        n: int = None,
+        ) -> Network:
+    """Build a network with BPR costs directly from arrays.
+
+    Node labels are the node ids as str.
+
+    Parameters
+    ----------
+    st : ndarray
+        Ndarray of shape (m, 2) with source and target ids of edges.
+    xy : ndarray, optional
+        Ndarray of shape (n, 2) with node coordinates.
+    free_flow_time : float or array_like, default=1
+        Free flow travel times of edges.
+    capacity : float or array_like, default=1
+        Capacities of edges.
+    alpha : float or array_like, default=0.15
+        BPR scale parameter.
+    power : int, default=4
+        BPR exponent.
+    od : ndarray, optional
+        Ndarray of shape (k, 3) with rows ``[source_id, target_id,
+        rate]``, see :func:`gravity_demand`.
+    n : int, optional
+        Number of nodes, inferred from ``xy`` or ``st`` if not given.
+
+    Returns
+    -------
+    Network
+        Network with linear demand function ``od`` (if given).
+    """
+    st = np.asarray(st, dtype=int)
+    if n is None:
+        n = len(xy) if xy is not None else int(st.max()) + 1
+    node_idx = np.arange(n)
+    node_lbl = node_idx.astype(str)
+    edge_data = (node_lbl[st], st, (0, np.inf))
+    node_data = (node_lbl, node_idx, xy, False)
+    cost = PolynomialCost(bpr_coefficients(free_flow_time, capacity,
+                                           alpha=alpha, power=power))
+    # Shared mappings are already set up by the constructor
+    net = Network(edge_data, node_data, cost_data=cost, update_shared=False)
+    if od is not None:
+        od = np.asarray(od, dtype=float).reshape(-1, 3)
+        b = DemandVectorSP(od, shared=net.shared, is_label=False)
+        b.map_node_id_to_label()
+        net.set_demand(LinearDemandFunction(b, shared=net.shared),
+                       map_label=False)
+    return net
+
+
+def _rng_and_zones(rng, n: int, n_zones) -> np.ndarray:
+    if n_zones is None:
+        n_zones = min(n, 100)
+    n_zones = min(int(n_zones), n)
+    return np.sort(rng.choice(n, size=n_zones, replace=False))
+
+
+def _grid_edges(rows: int, cols: int, bidirectional: bool = True) -> tuple:
+    # Horizontal and vertical edges of a rows x cols lattice, node id
+    # of (i, j) is i * cols + j
+    ids = np.arange(rows * cols).reshape(rows, cols)
+    horizontal = np.c_[ids[:, :-1].ravel(), ids[:, 1:].ravel()]
+    vertical = np.c_[ids[:-1, :].ravel(), ids[1:, :].ravel()]
+    st = np.vstack([horizontal, vertical])
+    # row, col of the line the edge lies on: -1 if not applicable
+    on_row = np.r_[np.repeat(np.arange(rows), cols - 1), np.full(len(vertical), -1)]
+    on_col = np.r_[np.full(len(horizontal), -1), np.tile(np.arange(cols), rows - 1)]
+    if bidirectional is True:
+        st = np.vstack([st, st[:, ::-1]])
+        on_row = np.r_[on_row, on_row]
+        on_col = np.r_[on_col, on_col]
+    return st, on_row, on_col
+
+
+def _edge_length(st: np.ndarray, xy: np.ndarray) -> np.ndarray:
+    return np.sqrt(((xy[st[:, 1]] - xy[st[:, 0]])**2).sum(axis=1))
+
+
+def grid(
+        rows: int,
+        cols: int = None,
+        bidirectional: bool = True,
+        speed: float = 1.,
+        capacity=1.,
+        n_zones: int = None,
+        total_demand: float = None,
+        deterrence: float = 1.,
+        seed=None,
+        **kw
+        ) -> Network:
+    """Grid network with BPR costs and gravity demand.
+
+    Nodes are placed on integer coordinates, node ``(i, j)`` has id
+    ``i * cols + j``.
+
+    Parameters
+    ----------
+    rows : int
+        Number of node rows.
+    cols : int, optional
+        Number of node columns, defaults to ``rows``.
+    bidirectional : bool, default=True
+        Whether to add edges in both directions.
+    speed : float, default=1
+        Free flow speed, free flow time is ``length / speed``.
+    capacity : float or array_like, default=1
+        Edge capacities.
+    n_zones : int, optional
+        Number of randomly chosen zones for the gravity demand,
+        defaults to ``min(n, 100)``. If 0, no demand is set.
+    total_demand : float, optional
+        Total demand of all OD pairs, defaults to number of zones.
+    deterrence : float, default=1
+        Distance decay of gravity model.
+    seed : None, int or numpy.random.Generator
+        Seed for reproducible zones and productions.
+    kw : keyword arguments
+        Further keyword arguments passed to :func:`from_arrays`, e.g.,
+        ``alpha`` and ``power``.
+
+    Returns
+    -------
+    Network
+
+    Examples
+    --------
+    >>> from paminco.net import generate
+    >>> net = generate.grid(3, 4, n_zones=4, seed=0)
+    >>> net
+    Network with 12 nodes and 34 edges.
+    >>> len(net.demand)
+    12
+    """
+    if cols is None:
+        cols = rows
+    rng = np.random.default_rng(seed)
+    xy = np.c_[np.repeat(np.arange(rows), cols), np.tile(np.arange(cols), rows)]
+    xy = xy.astype(float)
+    st, _, _ = _grid_edges(rows, cols, bidirectional=bidirectional)
+    return _finish(st, xy, _edge_length(st, xy) / speed, capacity, rng,
+                   n_zones, total_demand, deterrence, **kw)
+
+
+def random_geometric(
+        n: int,
+        radius: float = None,
+        speed: float = 1.,
+        capacity=1.,
+        n_zones: int = None,
+        total_demand: float = None,
+        deterrence: float = 1.,
+        seed=None,
+        **kw
+        ) -> Network:
+    """Planar random geometric network with BPR costs and gravity demand.
+
+    Nodes are sampled uniformly in the unit square and connected by
+    their Delaunay triangulation, which yields a connected planar graph
+    with about ``6 n`` directed edges.
+
+    Parameters
+    ----------
+    n : int
+        Number of nodes.
+    radius : float, optional
+        If given, edges that are longer than ``radius`` are dropped.
+        Note that this may disconnect the graph.
+    speed : float, default=1
+        Free flow speed, free flow time is ``length / speed``.
+    capacity : float or array_like, default=1
+        Edge capacities.
+    n_zones : int, optional
+        Number of randomly chosen zones for the gravity demand,
+        defaults to ``min(n, 100)``. If 0, no demand is set.
+    total_demand : float, optional
+        Total demand of all OD pairs, defaults to number of zones.
+    deterrence : float, default=1
+        Distance decay of gravity model.
+    seed : None, int or numpy.random.Generator
+        Seed for node positions, zones and productions.
+    kw : keyword arguments
+        Further keyword arguments passed to :func:`from_arrays`.
+
+    Returns
+    -------
+    Network
+    """
+    from scipy.spatial import Delaunay
+
+    rng = np.random.default_rng(seed)
+    xy = rng.random((n, 2))
+
+    # Unique undirected edges of triangulation
+    tri = Delaunay(xy).simplices
+    st = np.vstack([tri[:, [0, 1]], tri[:, [1, 2]], tri[:, [2, 0]]])
+    st = np.unique(np.sort(st, axis=1), axis=0)
+    if radius is not None:
+        st = st[_edge_length(st, xy) <= radius]
+    st = np.vstack([st, st[:, ::-1]])
+
+    return _finish(st, xy, _edge_length(st, xy) / speed, capacity, rng,
+                   n_zones, total_demand, deterrence, **kw)
+
+
+def hierarchical(
+        rows: int,
+        cols: int = None,
+        spacing=(5, 25),
+        speed=(1., 2., 4.),
+        capacity=(1., 4., 16.),
+        n_zones: int = None,
+        total_demand: float = None,
+        deterrence: float = 1.,
+        seed=None,
+        **kw
+        ) -> Network:
+    """Hierarchical road-like network with BPR costs and gravity demand.
+
+    The base is a bidirectional grid of local roads. Every
+    ``spacing[0]``-th row and column is upgraded to an arterial road,
+    every ``spacing[1]``-th to a highway, and so on. Road classes
+    differ in speed and capacity.
+
+    Parameters
+    ----------
+    rows : int
+        Number of node rows.
+    cols : int, optional
+        Number of node columns, defaults to ``rows``.
+    spacing : tuple of int, default=(5, 25)
+        Spacing of rows/columns of every road class above local roads.
+    speed : tuple of float, default=(1, 2, 4)
+        Free flow speed of every road class, must be of length
+        ``len(spacing) + 1``.
+    capacity : tuple of float, default=(1, 4, 16)
+        Capacity of every road class, must be of length
+        ``len(spacing) + 1``.
+    n_zones : int, optional
+        Number of randomly chosen zones for the gravity demand,
+        defaults to ``min(n, 100)``. If 0, no demand is set.
+    total_demand : float, optional
+        Total demand of all OD pairs, defaults to number of zones.
+    deterrence : float, default=1
+        Distance decay of gravity model.
+    seed : None, int or numpy.random.Generator
+        Seed for reproducible zones and productions.
+    kw : keyword arguments
+        Further keyword arguments passed to :func:`from_arrays`.
+
+    Returns
+    -------
+    Network
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from paminco.net import generate
+    >>> net = generate.hierarchical(11, spacing=(5, ), speed=(1, 2), capacity=(1, 3), seed=0)
+    >>> np.unique(net.cost.coefficients[:, 0])
+    array([0.5, 1. ])
+    """
+    if cols is None:
+        cols = rows
+    speed = np.asarray(speed, dtype=float)
+    capacity = np.asarray(capacity, dtype=float)
+    if len(speed) != len(spacing) + 1 or len(capacity) != len(spacing) + 1:
+        raise ValueError(
+            "speed and capacity must contain one value for every road class: "
+            f"{len(spacing) + 1} != {len(speed)} or {len(capacity)}."
+        )
+    rng = np.random.default_rng(seed)
+    xy = np.c_[np.repeat(np.arange(rows), cols), np.tile(np.arange(cols), rows)]
+    xy = xy.astype(float)
+    st, on_row, on_col = _grid_edges(rows, cols, bidirectional=True)
+
+    # Road class of edge: highest class whose spacing divides its line
+    road_class = np.zeros(len(st), dtype=int)
+    line = np.where(on_row >= 0, on_row, on_col)
+    for (c, sp) in enumerate(spacing, start=1):
+        road_class[line % int(sp) == 0] = c
+
+    fft = _edge_length(st, xy) / speed[road_class]
+    return _finish(st, xy, fft, capacity[road_class], rng,
+                   n_zones, total_demand, deterrence, **kw)
+
+
+def _finish(
+        st,
+        xy,
+        free_flow_time,
+        capacity,
+        rng,
+        n_zones,
+        total_demand,
+        deterrence,
+        **kw
+        ) -> Network:
+    od = None
+    if n_zones is None or n_zones > 0:
+        zones = _rng_and_zones(rng, len(xy), n_zones)
+        production = rng.uniform(0.5, 1.5, size=len(zones))
+        if total_demand is None:
+            total_demand = float(len(zones))
+        od = gravity_demand(xy, zones=zones, production=production,
+                            total_demand=total_demand,
+                            deterrence=deterrence)
+    return from_arrays(st, xy, free_flow_time=free_flow_time,
+                       capacity=capacity, od=od, **kw)
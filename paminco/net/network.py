@@ -1,11 +1,11 @@
 from __future__ import annotations
 
+import copy
 import warnings
 import xml.etree.ElementTree as et
 import sys
 
 import numpy as np
-import pandas as pd
 import scipy.sparse as sps
 
 from .cost import NetworkCost, PolynomialCost, SymbolicCost, PiecewiseQuadraticCost
@@ -14,11 +14,11 @@ from .demand import (
     LinearDemandFunction,
     AffineDemandFunction,
 )
-from .path import csr_dijkstra, csr_dijkstra_mp, get_path_edges
+from .path import csr_dijkstra, csr_dijkstra_mp, get_paths_edges
+from ._laplacian import LaplacianAssembler
+from . import _incidence
 from .shared import Shared, Edges, Nodes, FlowDirection
-from ._convert_traffic import read_tntp
-from ._convert_gas import gaslib_to_network_data
-from paminco.utils.io import prettify_xml
+from paminco.utils.io import prettify_xml, save_npy_dir, NpyDirectory
 from paminco.linalg import (
     SingularLaplaceError,
     star_inv,
@@ -31,6 +31,33 @@ from paminco import _doc
 import paminco.net.demand as netdemand
 
 
+def _share_arrays(obj, memo: dict, seen: set) -> None:
+    """Register read-only views of all arrays reachable from ``obj``.
+    
+    Registering the views in the memo of :func:`copy.deepcopy` makes
+    deep copies share the underlying data instead of copying it.
+    """
+    if id(obj) in seen:
+        return
+    seen.add(id(obj))
+    if isinstance(obj, np.ndarray):
+        view = obj.view()
+        view.flags.writeable = False
+        memo[id(obj)] = view
+        return
+    if isinstance(obj, dict):
+        children = obj.values()
+    elif isinstance(obj, (list, tuple)):
+        children = obj
+    elif ((sps.issparse(obj) or type(obj).__module__.startswith("paminco"))
+          and hasattr(obj, "__dict__")):
+        children = vars(obj).values()
+    else:
+        return
+    for child in children:
+        _share_arrays(child, memo, seen)
+
+
 class Support:
     """A class representing the support (of a flow).
     
@@ -246,6 +273,64 @@ class Network:
     def reset_cache(self, hard: bool = False) -> None:
         self.cache.reset(hard=hard)
 
+    def view(self, share_demand: bool = False) -> Network:
+        """Get a lightweight copy-on-write view of the network.
+        
+        The view shares all arrays of edges, nodes, costs and caches
+        as well as node and edge index mappings with this network, only
+        container objects (and the demand) are copied. Shared arrays
+        are read-only in the view. Operations that change the view,
+        e.g., :meth:`clean`, :meth:`set_demand`, :meth:`set_cost` or
+        deleting edges, replace arrays instead of modifying them and
+        thus do not affect this network.
+        
+        Parameters
+        ----------
+        share_demand : bool, default=False
+            Whether to share arrays of the demand function as well.
+        
+        Returns
+        -------
+        Network
+            View of the network.
+        
+        Notes
+        -----
+        Modifying arrays of this network inplace is reflected in its
+        views.
+        
+        Examples
+        --------
+        >>> import paminco
+        >>> net = paminco.net.load_sioux()
+        >>> view = net.view()
+        >>> view.edges.indices.base is net.edges.indices
+        True
+        >>> _ = view.clean(remove_zones=True)
+        >>> (net.n, view.n)
+        (24, 24)
+        >>> view.delete_edges([0, 1])
+        2
+        >>> (net.m, view.m)
+        (76, 74)
+        """
+        memo, seen = {}, set()
+        # Index mappings are replaced on updates, never modified inplace
+        nodes = self._s.nodes
+        for d in (getattr(self._s, "_nodes2edge", None),
+                  getattr(nodes, "_lbl2id", None),
+                  getattr(nodes, "_id2lbl", None),
+                  getattr(nodes, "_lbl_index", None)):
+            if d is not None:
+                memo[id(d)] = d
+                seen.add(id(d))
+        _share_arrays(self._s, memo, seen)
+        _share_arrays(self._c, memo, seen)
+        _share_arrays(getattr(self, "cache", None), memo, seen)
+        if share_demand is True and hasattr(self, "_d"):
+            _share_arrays(self._d, memo, seen)
+        return copy.deepcopy(self, memo)
+
     def h(self, param: float = 1) -> sps.csc_matrix:
         """Demand function."""
         return self.demand(param)
@@ -474,14 +559,19 @@ class Network:
             self,
             x,
             node=None,
-            return_as: str = 'csr'
+            return_as: str = 'csr',
+            out=None,
             ) -> sps.spmatrix:
         """Calculate Gamma @ x.
         
+        For an ndarray ``x``, the product is computed by scattering
+        ``x`` to the sources and targets of the edges, Gamma is not
+        built.
+        
         Parameters
         ----------
-        x : ndarray
-            Argument.
+        x : ndarray or spmatrix
+            Argument of shape (m, ) or (m, k).
         node : int, optional
             If given, result of dot product from row slice
             Gamma[node, :] and x is returned::
@@ -490,6 +580,9 @@ class Network:
                 
         return_as : str, default="csr"
             Return type of dot product if result is spmatrix.
+        out : ndarray, optional
+            Array of shape (n, ) or (n, k) to store the result in, if
+            ``x`` is an ndarray and ``node`` is None.
         
         Returns
         -------
@@ -500,6 +593,10 @@ class Network:
         --------
         numpy.dot
         """
+        if node is None and isinstance(x, np.ndarray):
+            s, t = self.edges.indices.T
+            return _incidence.scatter(s, t, x, self.n, out=out)
+        
         G = self.Gamma(return_as=return_as)
         if node is None:
             out = G @ x
@@ -515,14 +612,19 @@ class Network:
             self,
             x,
             edge=None,
-            return_as: str = 'csr'
+            return_as: str = 'csr',
+            out=None,
             ):
         """Calculate x @ Gamma.
         
+        For an ndarray ``x``, the product is computed as difference of
+        ``x`` at the targets and sources of the edges, Gamma is not
+        built.
+        
         Parameters
         ----------
         x : ndarray or spmatrix
-            Argument.
+            Argument of shape (n, ) or (k, n).
         edge : int, optional
             If given, result of dot product of x and column slice is
             returned::
@@ -531,6 +633,9 @@ class Network:
             
         return_as : str, default="csr"
             Return type of dot product if result is spmatrix.
+        out : ndarray, optional
+            Array of shape (m, ) or (k, m) to store the result in, if
+            ``x`` is an ndarray and ``edge`` is None.
         
         Returns
         -------
@@ -542,7 +647,10 @@ class Network:
         numpy.dot
         """
         if edge is None:
-            # Standard computation via dot product
+            if isinstance(x, np.ndarray):
+                s, t = self.edges.indices.T
+                return _incidence.gather(s, t, x, out=out)
+            # Sparse argument: dot product
             out = x @ self.Gamma(return_as='csr')
         else:
             # Use sparseness of Gamma
@@ -557,6 +665,38 @@ class Network:
         
         return out
 
+    def potential_flow(self, pi, a, d=None, out=None) -> np.ndarray:
+        """Calculate flow induced by a potential for quadratic costs.
+        
+        For edge costs with derivative ``2 a x + b``, the flow is::
+        
+            (pi @ Gamma) / (2 a) - d
+        
+        and is computed in a single pass over the edges.
+        
+        Parameters
+        ----------
+        pi : ndarray
+            Potential of all nodes, shape (n, ).
+        a : ndarray
+            Quadratic cost coefficients, shape (m, ).
+        d : ndarray, optional
+            Flow offsets, shape (m, ).
+        out : ndarray, optional
+            Array of shape (m, ) to store the result in.
+        
+        Returns
+        -------
+        ndarray
+            Flow on all edges.
+        
+        See Also
+        --------
+        Network.times_gamma
+        """
+        s, t = self.edges.indices.T
+        return _incidence.potential_flow(s, t, pi, a, d=d, out=out)
+
     def laplacian(
             self,
             weight=None,
@@ -583,13 +723,19 @@ class Network:
             else of shape (n-1, n-1). Type of return matrix is
             determined by parameter ``return_as``.
         
+        Notes
+        -----
+        The sparsity pattern of the Laplacian is computed once per
+        topology and cached, a new ``weight`` is scattered directly into
+        the CSR (CSC) data array.
+        
         References
         ----------
         .. [1] https://en.wikipedia.org/wiki/Laplacian_matrix
         """
         # Cast weight to array of len(m) if not np.ndarray
         if weight is None:
-            w = np.ones(self.m)
+            w = np.ones(self.m, dtype=self.dtype_float)
         elif isinstance(weight, float):
             w = np.full(self.m, weight, dtype=self.dtype_float)
         elif isinstance(weight, np.ndarray):
@@ -597,22 +743,14 @@ class Network:
         else:
             raise TypeError(f"Invalid argument for weight: {weight}.")
         
-        w = np.hstack([-w, -w, w, w])
-        if self.cache.is_valid("lap") is False:
-            # Rebuild if not valid in cache
-            s, t = self.edges.indices.T
-            i = np.hstack([s, t, s, t])
-            j = np.hstack([t, s, s, t])
-            coo = sps.coo_matrix((w, (i, j)), shape=(self.n, self.n))
-            self.cache["lap"] = coo
-        else:
-            # Pull from cache
-            coo = self.cache["lap"]
-            coo.data = w
-            
-        if reduced is True:
-            return sparse_format(coo, return_as)[1:, 1:]
-        return sparse_format(coo, return_as)
+        asm = self.cache["lap"] if self.cache.is_valid("lap") else None
+        if asm is None or (asm.m, asm.n) != (self.m, self.n):
+            # Rebuild pattern and scatter map if topology changed
+            asm = LaplacianAssembler(self.edges.indices, self.n)
+            self.cache["lap"] = asm
+        
+        return self.cache["lap"].assemble(w, reduced=reduced,
+                                          return_as=return_as)
     
     def L(
             self,
@@ -663,14 +801,19 @@ class Network:
             reduced: bool = False,
             method: InverseMethod = InverseMethod.CHOLESKY,
             safe: bool = True,
+            cache=None,
             **kwargs
             ):
         """Pseudo-inverse of weighted Laplacian.
         
+        The Laplacian is built and inverted in float64, independent of
+        the float type of the network.
+        
         Parameters
         ----------
         weight : np.ndarray, optional
             If None, weigths of Laplacian are determined based on flow.
+            Promoted to float64.
         flow : np.ndarray, optional
             Use flow to determine weights if ``weights is None``.
         reduced : bool, default=False
@@ -681,6 +824,10 @@ class Network:
         safe : bool, default=True
             If True (default), matrix will only be inverted if network is
             connected.
+        cache : FactorizationCache, optional
+            If given, look up the inverse for the Laplace weights in
+            ``cache`` and store it there after computation. The returned
+            object must then not be modified inplace.
         
         Returns
         -------
@@ -700,14 +847,28 @@ class Network:
         Network.L : Laplacian matrix.
         paminco.linalg.star_inv : generalized inverse of a matrix.
         paminco.linalg.CholeskyInverse : Inverting a matrix using choleksy decomposition.
+        paminco.linalg.FactorizationCache : Cache of inverses.
         """
         method = InverseMethod.make(method)
         
+        # Laplacians are inverted in float64, also for float32 networks
+        if weight is None:
+            weight = self.cost.laplace_weights(flow, **kwargs)
+        weight = np.asarray(weight, dtype=np.float64)
+        
+        if cache is not None:
+            key = cache.key(weight, int(method), reduced, self.n)
+            lstar = cache.get(key)
+            if lstar is not None:
+                return lstar
+            lstar = self.Lstar(weight, reduced=reduced, method=method,
+                               safe=safe)
+            cache.put(key, lstar)
+            return lstar
+        
         # Safemode checks connectedness of graph beforehand in order to
         # detect singular laplace matrix
         if safe is True:
-            if weight is None:
-                weight = self.cost.laplace_weights(flow, **kwargs)
             n_cc, cc = self.connected_components(np.where(weight != 0)[0])
             if n_cc > 1:
                 raise SingularLaplaceError(network=self,
@@ -715,16 +876,14 @@ class Network:
                                            n_cc=n_cc,
                                            cc=cc)
         
-        lap = self.L(weight, flow, reduced=reduced, return_as='array', **kwargs)
+        # Inverse is taken of the reduced Laplacian in any case
+        lap = self.L(weight, flow, reduced=True, return_as='array', **kwargs)
         raise_laplace_error = False
         
         try:
-            lstar = star_inv(lap, reduced=reduced, method=method)
+            lstar = star_inv(lap, reduced=True, method=method)
         except np.linalg.LinAlgError as lae:
             # Laplace inverse can not be obtained
-            if weight is None:
-                # Recover the weights used, if not specified
-                weight = self.cost.laplace_weights(flow, **kwargs)
             if not self.is_connected(edges=np.where(weight != 0)[0]):
                 # If the error is due to multiple connected components
                 # of active edges, raise SingularLaplaceError
@@ -868,31 +1027,28 @@ class Network:
                                       s=unique_sources,
                                       multiprocessing=multiprocessing,
                                       return_source_indices=True)
-        if Pr.shape[0] == 1:
-            Pr = Pr.ravel()
         
         # For all commodities: update flow on shortest path between pairs
         # (s -> t with rate r)
+        if len(demand_triples) > 0:
+            sources, targets, rates = zip(*demand_triples)
+        else:
+            sources, targets, rates = [], [], []
+        path_edges, comm = get_paths_edges(Pr=Pr,
+                                           s=[d[s] for s in sources],
+                                           t=targets,
+                                           lookup_id=self.shared.nodes2edge)
+        rates = np.asarray(rates, dtype=float)
         if commodity_wise is True:
             # Individual flow for each commodity
-            flow = sps.lil_matrix((self.shared.m, len(demand_triples)))
-            for (s, t, r), idx in enumerate(demand_triples):
-                path_edges = get_path_edges(Pr=Pr,
-                                            s=d[s],
-                                            t=t,
-                                            lookup_id=self.shared.nodes2edge,
-                                            reversed=True)
-                flow[path_edges, idx] = r
+            flow = sps.coo_matrix((rates[comm], (path_edges, comm)),
+                                  shape=(self.shared.m, len(demand_triples)),
+                                  dtype=self.dtype_float)
+            flow = flow.tolil()
         else:
             # Aggregated edge flow across commodities
-            flow = np.zeros(self.shared.m)
-            for (s, t, r) in demand_triples:
-                path_edges = get_path_edges(Pr=Pr,
-                                            s=d[s],
-                                            t=t,
-                                            lookup_id=self.shared.nodes2edge,
-                                            reversed=True)
-                flow[path_edges] += r
+            flow = np.bincount(path_edges, weights=rates[comm], minlength=self.shared.m)
+            flow = flow.astype(self.dtype_float, copy=False)
         
         return flow
 
@@ -1081,37 +1237,52 @@ class Network:
         remove_unreachable_nodes : bool, default=False
             Whether to remove nodes that are unreachable from
             ``start_node_unreachables``. If this is not given,
-            unreachable nodes from the first node in network.nodes are
-            removed.
+            unreachable nodes from the first node of the largest weakly
+            connected component are removed.
         remove_commodities : bool, default=False
             Whether to remove commodities made up by nodes which are
             deleted in the cleaning process.
+        start_node_unreachables : int or str, optional
+            Index (before cleaning) or label of start node for
+            ``remove_unreachable_nodes``.
         
         Returns
         -------
         str
             Summary of cleaning process.
+        
+        Notes
+        -----
+        The rules are applied in the order of the parameters above, each
+        rule acts on the network left by the previous ones. All rules
+        only update boolean masks of nodes and edges to keep; edges,
+        nodes, cost and demand are compacted once at the end.
         """
         # Get network size before cleaning (nodes, edges, commodities)
         n, m, c = self.n, self.m, len(self.demand)
         
-        out = ""
-        if remove_zones is True:
-            out += self._remove_zones(remove_commodities=remove_commodities,
-                                      update_shared=True)
-        if remove_parallel_edges is True:
-            out += self._remove_parallel_edges(update_shared=True)
-        if remove_zero_cost_edges is True:
-            out += self._remove_zero_cost_edges(update_shared=True)
-        if remove_isolated_nodes is True:
-            # nodes that are in nodes but not in edges
-            out += self._remove_isolated_nodes(remove_commodities=remove_commodities,
-                                               update_shared=True)
-        if remove_unreachable_nodes is True:
-            # update indices if a previous method has manipulated network
-            out += self._remove_unreachable_nodes(start_node=start_node_unreachables,
-                                                  remove_commodities=remove_commodities,
-                                                  update_shared=True)
+        # Combine all rules into a single keep mask for nodes and edges
+        keep_nodes, keep_edges, out = self._clean_masks(
+            remove_zones=remove_zones,
+            remove_parallel_edges=remove_parallel_edges,
+            remove_zero_cost_edges=remove_zero_cost_edges,
+            remove_isolated_nodes=remove_isolated_nodes,
+            remove_unreachable_nodes=remove_unreachable_nodes,
+            start_node_unreachables=start_node_unreachables,
+        )
+        
+        # Compact edges, cost, nodes and demand once
+        del_edges = np.flatnonzero(~keep_edges)
+        del_nodes = np.flatnonzero(~keep_nodes)
+        if len(del_edges) > 0:
+            self.delete_edges(del_edges, update_shared=False)
+        if len(del_nodes) > 0:
+            self.delete_nodes(del_nodes,
+                              is_label=False,
+                              update_shared=True,
+                              remove_commodities=remove_commodities)
+        elif len(del_edges) > 0:
+            self.shared._set_edge_id_mapping()
         
         if (self.m == 0 and not remove_zones and remove_zero_cost_edges and
                 remove_unreachable_nodes):
@@ -1134,6 +1305,93 @@ class Network:
                 .format(n, self.n, m, self.m, c, len(self._d)))
         return out
 
+    def _clean_masks(
+            self,
+            remove_zones: bool = False,
+            remove_parallel_edges: bool = True,
+            remove_zero_cost_edges: bool = True,
+            remove_isolated_nodes: bool = False,
+            remove_unreachable_nodes: bool = False,
+            start_node_unreachables=None,
+            ) -> tuple:
+        # Get masks of nodes and edges that are kept by Network.clean
+        # and a summary of nodes and edges removed per rule
+        keep_nodes = np.ones(self.n, dtype=bool)
+        keep_edges = np.ones(self.m, dtype=bool)
+        s, t = self.edges.indices.T
+        
+        def drop_nodes(mask):
+            # Drop nodes in mask and all their edges, return counts
+            mask = mask & keep_nodes
+            keep_nodes[mask] = False
+            edges = keep_edges & ~(keep_nodes[s] & keep_nodes[t])
+            keep_edges[edges] = False
+            return ("\t{:d} nodes\n".format(np.count_nonzero(mask))
+                    + "\t{:d} edges\n".format(np.count_nonzero(edges)))
+        
+        def drop_edges(mask):
+            mask = mask & keep_edges
+            keep_edges[mask] = False
+            return "\t{:d} edges\n".format(np.count_nonzero(mask))
+        
+        out = ""
+        if remove_zones is True:
+            out += "Cleaning zones:\n"
+            if self.nodes.has_zones is False:
+                out += "\tNo zone nodes in network.\n"
+            else:
+                out += drop_nodes(np.asarray(self.nodes.zone, dtype=bool))
+        
+        if remove_parallel_edges is True:
+            # First of parallel edges among remaining edges is kept
+            dup = np.zeros(self.m, dtype=bool)
+            idx = np.flatnonzero(keep_edges)
+            if len(idx) > 0:
+                _, first = np.unique(self.edges.indices[idx], axis=0, return_index=True)
+                dup[idx] = True
+                dup[idx[first]] = False
+            out += "Removing parallel edges:\n" + drop_edges(dup)
+        
+        if remove_zero_cost_edges is True:
+            if isinstance(self._c, PolynomialCost) is False:
+                out += "No zero cost edges removed. Cost are not polynomial.\n"
+            else:
+                zc = (abs(self._c.coefficients).sum(axis=1) == 0)
+                out += "Removing zero cost edges:\n" + drop_edges(zc)
+        
+        if remove_isolated_nodes is True:
+            # nodes that are not incident to any remaining edge
+            deg = np.bincount(self.edges.indices[keep_edges].ravel(), minlength=self.n)
+            out += "Removing isolated nodes:\n" + drop_nodes(deg == 0)
+        
+        if remove_unreachable_nodes is True:
+            # Directed graph of remaining edges, respecting bounds
+            s_dir, t_dir, w = self.edges.get_directed(keep_edges.astype(float))
+            adj = sps.csr_matrix((w, (s_dir, t_dir)), shape=(self.n, self.n))
+            adj.eliminate_zeros()
+            
+            start_node = start_node_unreachables
+            if start_node is None:
+                # First node of largest weakly connected component
+                _, cc = sps.csgraph.connected_components(adj,
+                                                         directed=True,
+                                                         connection='weak',
+                                                         return_labels=True)
+                size = np.bincount(cc, weights=keep_nodes)
+                start_node = np.argmax(keep_nodes & (cc == np.argmax(size)))
+            elif isinstance(start_node, str):
+                start_node = self.shared.get_node_id(start_node)
+            
+            reachable = np.zeros(self.n, dtype=bool)
+            reachable[sps.csgraph.breadth_first_order(adj, start_node,
+                                                      directed=True,
+                                                      return_predecessors=False)] = True
+            out += ("Removing unreachable nodes from '{:s}':\n"
+                    .format(str(self.shared.get_node_label(start_node))))
+            out += drop_nodes(~reachable)
+        
+        return keep_nodes, keep_edges, out
+
     def update_shared(
             self,
             map_demand_labels: bool = True
@@ -1258,123 +1516,6 @@ class Network:
     def get_flow_df(self, x: np.ndarry, labels: bool = True) -> pd.DataFrame:
         return self.edges.get_flow_df(x, labels=labels)
 
-    def _remove_isolated_nodes(
-            self,
-            update_shared: bool = True,
-            remove_commodities: bool = True,
-            ) -> str:
-        nodes_in_edges = np.unique(self.edges.labels.ravel()).tolist()
-        all_nodes = self.nodes.labels.tolist()
-        isolated_nodes = list(set(all_nodes) - set(nodes_in_edges))
-
-        n_n, n_m, n_c = 0, 0, 0
-        if len(isolated_nodes) > 0:
-            n_n, n_m, n_c = self.delete_nodes(isolated_nodes,
-                                              is_label=True,
-                                              update_shared=update_shared,
-                                              remove_commodities=remove_commodities)
-
-        out = "Removing isolated nodes:\n"
-        out += "\t{:d} nodes\n".format(n_n)
-        out += "\t{:d} edges\n".format(n_m)
-        out += "\t{:d} commodities\n".format(n_c)
-        return out
-
-    def _remove_parallel_edges(
-            self,
-            update_shared: bool = True,
-            ) -> str:
-        duplicate_idx = self.edges.get_duplicate_edges()
-        
-        # remove duplicates from data structs
-        n_m = self.delete_edges(duplicate_idx, update_shared=update_shared)
-        
-        out = "Removing parallel edges:\n"
-        out += "\t{:d} edges\n".format(n_m)
-        return out
-
-    def _remove_unreachable_nodes(
-            self,
-            start_node=None,
-            update_shared: bool = True,
-            remove_commodities: bool = True,
-            ) -> str:
-        # Build adjaceny matrix with uniform weights = 1
-        adj_matrix = self.shared.csgraph(np.ones(self.m),
-                                         respect_bounds=True,
-                                         backward_positive=True)
-        
-        # If no start_node is specified, use the first node from the
-        # largest strongly connected component
-        if start_node is None:
-            coco = sps.csgraph.connected_components
-            num_cc, cc = coco(adj_matrix,
-                              directed=True,
-                              connection='weak',
-                              return_labels=True)
-
-            id_u, cnt_u = np.unique(cc, return_counts=True)
-            comp = id_u[np.argmax(cnt_u)]
-            start_node = np.argmin(id_u == comp)
-        
-        elif isinstance(start_node, str):
-            start_node = self.shared.get_node_id(start_node)
-        
-        node_name = self.shared.get_node_label(start_node)
-        
-        # Get all distances between nodes for weight = 1 and identity
-        # unreachables where distance matrix is infinite
-        D, _ = csr_dijkstra(adj_matrix, indices=start_node)
-        idx_unreachables = np.where(~np.isfinite(D))[0]
-        
-        n_n, n_m, n_c = 0, 0, 0
-        if len(idx_unreachables) > 0:
-            # Delete nodes in nodes and reset mapping
-            n_n, n_m, n_c = self.delete_nodes(idx_unreachables,
-                                              is_label=False,
-                                              update_shared=update_shared,
-                                              remove_commodities=remove_commodities)
-        
-        out = "Removing unreachable nodes from '{:s}':\n".format(node_name)
-        out += "\t{:d} nodes\n".format(n_n)
-        out += "\t{:d} edges\n".format(n_m)
-        out += "\t{:d} commodities\n".format(n_c)
-        return out
-
-    def _remove_zero_cost_edges(
-            self,
-            update_shared: bool = True,
-            ) -> str:
-        if isinstance(self._c, PolynomialCost) is False:
-            return "No zero cost edges removed. Cost are not polynomial.\n"
-        zc_edges = np.where(abs(self._c.coefficients).sum(axis=1) == 0)[0]
-        
-        self.delete_edges(zc_edges, update_shared=update_shared)
-        
-        out = "Removing zero cost edges:\n"
-        out += "\t{:d} edges\n".format(len(zc_edges))
-        return out
-
-    def _remove_zones(
-            self,
-            update_shared: bool = True,
-            remove_commodities: bool = True,
-            ) -> str:
-        out = "Cleaning zones:\n"
-        if self.nodes.has_zones is False:
-            return out + "\tNo zone nodes in network."
-        # Get zone nodes and delete
-        zone_nodes = self.nodes.labels[self.nodes.zone].tolist()
-        n_n, n_m, n_c = self.delete_nodes(zone_nodes,
-                                          is_label=True,
-                                          update_shared=update_shared,
-                                          remove_commodities=remove_commodities)
-
-        out += "\t{:d} nodes\n".format(n_n)
-        out += "\t{:d} edges\n".format(n_m)
-        out += "\t{:d} commodities\n".format(n_c)
-        return out
-
     def _flow_to_nx(self, x, return_pos: bool = True):
         if isinstance(x, (int, float)):
             x = np.full(self.m, x)
@@ -1427,8 +1568,11 @@ class Network:
             cost_type: str = "auto",
             **kw
             ) -> Network:
+        # Read OD pairs into arrays directly if DemandVectorSP requested
+        single_pairs = (kw.get("kw_demand") or {}).get("single_pairs", False)
+        from ._convert_traffic import read_tntp
         edge_data, node_data, cost_data, demand_data = read_tntp(
-            netfile, tripsfile, nodefile, cost_type
+            netfile, tripsfile, nodefile, cost_type, single_pairs=single_pairs
         )
         # if cost_type != "auto":
         #     if "kw_cost" not in kw:
@@ -1465,6 +1609,7 @@ class Network:
         network : Network
             The network read from the files
         """
+        from ._convert_gas import gaslib_to_network_data
         data = gaslib_to_network_data(
             network_file, scenario_file, contract_aux_elements, debug
         )
@@ -1507,30 +1652,23 @@ class Network:
         --------
         xml.etree.ElementTree.ElementTree.write
         """
+        from ._convert_gas import gaslib_to_network_data
         data = gaslib_to_network_data(
             network_file, scenario_file, contract_aux_elements, debug
         )
         network = Network(data)
         network.to_xml(outfile, prettify=prettify, **kw_write)
 
-    def to_xml(
-            self,
-            file,
-            prettify: bool = False,
-            **write_kw
-            ):
-        """Save Network as XML.
+    def to_etree(self) -> et.ElementTree:
+        """Get XML representation of Network as ElementTree.
         
-        Parameters
-        ----------
-        file : str or file object
-            File name, or a file object opened for writing.
-        prettify : bool, default=False
-            Whether to prettify resulting XML file.
+        Returns
+        -------
+        xml.etree.ElementTree.ElementTree
         
         See Also
         --------
-        xml.etree.ElementTree.ElementTree.write
+        to_xml
         """
         # Init tree
         root = et.Element('network')
@@ -1547,8 +1685,42 @@ class Network:
             self.cost.costfuncs_to_metadata(metadata)
         root = self.nodes.add_to_etree(root, overwrite=True)
         root = self.demand.add_to_etree(root, overwrite=True)
+        return tree
+
+    def to_xml(
+            self,
+            file,
+            prettify: bool = False,
+            **write_kw
+            ):
+        """Save Network as XML.
         
-        tree.write(file, **write_kw)
+        Edges, nodes and commodities are streamed to ``file`` one
+        element at a time, such that memory usage is bounded by the
+        size of a single element. If ``write_kw`` are passed, the
+        XML tree is built in memory and written by
+        :meth:`xml.etree.ElementTree.ElementTree.write` instead.
+        
+        Parameters
+        ----------
+        file : str or file object
+            File name, or a file object opened for writing.
+        prettify : bool, default=False
+            Whether to indent the resulting XML file.
+        write_kw : keyword arguments, optional
+            Further arguments passed to
+            :meth:`xml.etree.ElementTree.ElementTree.write`.
+        
+        See Also
+        --------
+        to_etree
+        """
+        if len(write_kw) == 0:
+            from ._write_xml import write_network_xml
+            write_network_xml(self, file, prettify=prettify)
+            return
+        
+        self.to_etree().write(file, **write_kw)
         if prettify:
             prettify_xml(file)
 
@@ -1561,6 +1733,10 @@ class Network:
             ) -> Network:
         """Read network from ``XML``.
         
+        The data is read in a single pass: edges, nodes, costs and
+        commodities are streamed into arrays while parsing, such that
+        the XML tree is never built in memory for files.
+        
         Parameters
         ----------
         data : str, file, ElementTree or Element
@@ -1571,9 +1747,11 @@ class Network:
                 * or the root Element of the ElementTree.
         return_dict : bool, default=False,
             If ``True``, the data is returned as a dict with entries
-            ``edge_data``, ``node_data``, ``demand_data`` and ``cost_data``.
-            If ``False`` (default), a ``Network`` object created from
-            this data is returned
+            ``edge_data``, ``node_data``, ``demand_data``, ``cost_data``,
+            ``demand_mode`` and ``cost_type``. If ``False`` (default),
+            a ``Network`` object created from this data is returned
+        kwargs : keyword arguments, optional
+            Further arguments passed to the constructor.
         
         Returns
         -------
@@ -1583,7 +1761,7 @@ class Network:
         
         See Also
         --------
-        xml.etree.ElementTree
+        lxml.etree.iterparse
         :func:`~paminco.net.shared.Edges.from_xml`
             ``from_xml`` method of Edges class
         :func:`~paminco.net.shared.Nodes.from_xml`
@@ -1591,22 +1769,23 @@ class Network:
         :func:`~paminco.net.cost.NetworkCost.from_xml`
             ``from_xml`` method of NetworkCost class
         """
-        edge_data = Edges.from_xml(file, return_data=True)
-        node_data = Nodes.from_xml(file, return_data=True)
-        demand_data = file
-        # Reading and initialization of Cost Function is
-        # deferred to set_cost method
-        cost_data = file
-
+        from ._read_xml import read_network_xml
+        kw_cost = dict(kwargs.pop("kw_cost", None) or {})
+        default_edge_cost = kw_cost.pop("default_edge_cost", True)
+        data = read_network_xml(file, default_edge_cost=default_edge_cost)
         if return_dict:
-            return {
-                'edge_data': edge_data,
-                'node_data': node_data,
-                'cost_data': cost_data,
-                'demand_data': demand_data,
-            }
-
-        return cls(edge_data, node_data, cost_data, demand_data, **kwargs)
+            return data
+        
+        if data["cost_type"] is not None:
+            kw_cost.setdefault("cost_type", data["cost_type"])
+        if data["demand_mode"] is not None:
+            kwargs.setdefault("demand_mode", data["demand_mode"])
+        return cls(data["edge_data"],
+                   data["node_data"],
+                   data["cost_data"],
+                   data["demand_data"],
+                   kw_cost=kw_cost,
+                   **kwargs)
 
     def make_save_dict(
             self,
@@ -1644,6 +1823,7 @@ class Network:
             **kwargs
             ) -> Network:
         net = cls.__new__(cls)
+        net.cache = Cache()
         if isinstance(data, str):
             data = np.load(data)
         
@@ -1662,6 +1842,148 @@ class Network:
     
     from_npz.__func__.__doc__ = _doc.from_npz.__doc__
 
+    def save_to_npy_dir(
+            self,
+            path: str,
+            **kwargs
+            ) -> None:
+        """Save network into a directory with one ``.npy`` file per array.
+        
+        Unlike :meth:`save_to_numpy`, the arrays can be memory-mapped
+        when loading the network with :meth:`from_npy_dir`.
+        
+        Parameters
+        ----------
+        path : str
+            Directory, created if it does not exist.
+        kwargs : keyword arguments, optional
+            Keyword arguments saved to directory.
+        
+        See Also
+        --------
+        from_npy_dir
+        paminco.utils.io.save_npy_dir
+        """
+        save_dict = self.make_save_dict()
+        save_dict.update(kwargs)
+        save_npy_dir(path, save_dict)
+
+    @classmethod
+    def from_npy_dir(
+            cls,
+            path: str,
+            mmap_mode: str = "r",
+            prefix: str = "",
+            ) -> Network:
+        """Load network saved by :meth:`save_to_npy_dir`.
+        
+        Edges, nodes, cost coefficients and array-backed demand use the
+        (memory-mapped) arrays in place. Label and edge index mappings
+        are built on first use. With the default ``mmap_mode='r'``, the
+        arrays are read-only and shared by all processes that load the
+        same directory.
+        
+        Parameters
+        ----------
+        path : str
+            Directory written by :meth:`save_to_npy_dir`.
+        mmap_mode : {None, 'r', 'r+', 'c'}, default='r'
+            Memory-map mode, see :func:`numpy.load`. If None, arrays
+            are read into memory.
+        prefix : str, default=""
+            Object data is stored with ``key = (prefix + internal_name)``.
+        
+        Returns
+        -------
+        Network
+            Loaded network.
+        
+        Examples
+        --------
+        >>> import tempfile
+        >>> import paminco
+        >>> net = paminco.net.load_sioux()
+        >>> path = tempfile.mkdtemp()
+        >>> net.save_to_npy_dir(path)
+        >>> net2 = paminco.net.Network.from_npy_dir(path)
+        >>> type(net2.edges.bounds)
+        <class 'numpy.memmap'>
+        >>> net2 == net
+        True
+        """
+        data = NpyDirectory(path, mmap_mode=mmap_mode)
+        return cls._from_saved(data, prefix=prefix)
+
+    @classmethod
+    def _from_saved(cls, data, prefix: str = "") -> Network:
+        # Use arrays saved by make_save_dict as they are (dtypes, memory
+        # maps) without copying them
+        net = cls.__new__(cls)
+        net._s = Shared._from_saved(data, prefix=prefix)
+        net.cache = Cache()
+        
+        # demand is stored with node ids -> no need to map labels
+        class_ = getattr(netdemand, str(data["demand_type"]))
+        demand = class_.from_npz(data, shared=net.shared, prefix=prefix + "dem_")
+        net.set_demand(demand, map_label=False)
+        
+        net._c = NetworkCost.from_npz(data,
+                                      shared=net.shared,
+                                      prefix=prefix + "cost_",
+                                      copy=False)
+        return net
+
+    def astype(
+            self,
+            dtype_float=None,
+            dtype_int=None,
+            ) -> Network:
+        """Get a copy of the network with float and int data cast.
+        
+        Sets the precision of the whole network. With ``numpy.float32``
+        and ``numpy.int32``, edge indices are stored as int32, and cost
+        evaluation, the iterates of :class:`~paminco.optim.NetworkFW`
+        and the weights of shortest path computations are float32,
+        which halves their memory traffic. Objective values of the
+        Frank-Wolfe algorithm are summed up in float64, Laplacian solves
+        (:meth:`Lstar`, e.g., in EFA) promote the weights to float64.
+        
+        Parameters
+        ----------
+        dtype_float : dtype, optional
+            Datatype of all float arrays. If None, it is not changed.
+        dtype_int : dtype, optional
+            Datatype of all node and edge indices. If None, it is not
+            changed.
+        
+        Returns
+        -------
+        Network
+            Copy of the network.
+        
+        Examples
+        --------
+        >>> import numpy as np
+        >>> import paminco
+        >>> net = paminco.net.load_sioux().astype(np.float32, np.int32)
+        >>> net.edges.indices.dtype, net.cost.coefficients.dtype
+        (dtype('int32'), dtype('float32'))
+        >>> net.demand(1).dtype
+        dtype('float32')
+        """
+        dtype_int, dtype_float = self.shared._get_dtypes(dtype_int, dtype_float)
+        data = self.make_save_dict()
+        for (k, v) in data.items():
+            if not isinstance(v, np.ndarray):
+                continue
+            dtype = v.dtype
+            if dtype.kind == "f":
+                dtype = dtype_float
+            elif dtype.kind in "iu" and not k.endswith("label_codes"):
+                dtype = dtype_int
+            data[k] = v.astype(dtype)
+        return Network._from_saved(data)
+
     @property
     def cost(self):
         """Cost associated with network.
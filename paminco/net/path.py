@@ -1,9 +1,7 @@
 """Module contaning path related methods for a network."""
 
-import psutil
 from functools import partial
 
-import multiprocessing as mp
 import numpy as np
 from numpy.ctypeslib import as_ctypes_type
 import scipy.sparse as sps
@@ -17,6 +15,9 @@ def csr_dijkstra(data, indices=None, **kwargs):
 def csr_dijkstra_mp(data, indices, num_cpus=None, chunks_per_cpu: int = 1, **kwargs):
     # TODO: to be tested on unix where fork(), does not work on windoof
     # due to child process creation
+    import multiprocessing as mp
+    import psutil
+    
     spmat = sps.csr_matrix(data, copy=False)
     
     # Shared csr data
@@ -69,7 +70,7 @@ def get_path_edges(
         Index of source.
     t : int
         Index of target.
-    lookup_id : dict
+    lookup_id : EdgeIndex or dict
         Mapping of (node_id, node_id) -> edge_id.
     reversed : bool, default=False
         Whether to reverse the path from ``s`` to ``t``.
@@ -79,7 +80,7 @@ def get_path_edges(
     ndarray
         Indices of path edges.
     """
-    edges = []
+    nodes = [t]
     w = t
     # TODO: pass proper Pr here to not worry about indices.
     while True:
@@ -89,10 +90,64 @@ def get_path_edges(
             v = Pr[w]
         if v == -9999:
             break
-        edges.append(lookup_id[(v, w)])
+        nodes.append(v)
         w = v
-    edges = np.array(edges)
+    nodes = np.array(nodes, dtype=int)
+    
+    # Look up all edges (v, w) of the path at once
+    if hasattr(lookup_id, "get_ids"):
+        edges = lookup_id.get_ids(nodes[1:], nodes[:-1])
+    else:
+        edges = np.array([lookup_id[(v, w)] for (v, w) in zip(nodes[1:], nodes[:-1])])
     
     if reversed is True:
         edges = np.flip(edges)
     return edges
+
+
+def get_paths_edges(
+        Pr: np.ndarray,
+        s,
+        t,
+        lookup_id,
+        ) -> tuple:
+    """Get edges on paths ``s[i]`` -> ``t[i]`` for all ``i`` at once.
+    
+    All paths are traced back simultaneously, one vectorized step per
+    edge of the longest path, and all edges are looked up at once.
+    
+    Parameters
+    ----------
+    Pr : ndarray
+        Predecessor matrix, or predecessor array of a single source.
+    s : ndarray of int
+        Row indices of sources in ``Pr``.
+    t : ndarray of int
+        Indices of targets.
+    lookup_id : EdgeIndex
+        Mapping of (node_id, node_id) -> edge_id.
+    
+    Returns
+    -------
+    edges : ndarray
+        Indices of path edges of all paths.
+    path : ndarray
+        Index ``i`` of the path of every edge in ``edges``.
+    """
+    Pr = np.atleast_2d(Pr)
+    s = np.asarray(s, dtype=int)
+    w = np.asarray(t, dtype=int)
+    path = np.arange(len(w))
+    vs, ws, paths = [], [], []
+    while len(w) > 0:
+        v = Pr[s, w]
+        on = v != -9999
+        s, w, v, path = s[on], w[on], v[on], path[on]
+        vs.append(v)
+        ws.append(w)
+        paths.append(path)
+        w = v
+    if len(vs) == 0:
+        return np.array([], dtype=int), np.array([], dtype=int)
+    edges = lookup_id.get_ids(np.concatenate(vs), np.concatenate(ws))
+    return edges, np.concatenate(paths)
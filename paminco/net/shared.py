@@ -1,15 +1,18 @@
 """Module that handles shared information for all network objects."""
+from __future__ import annotations
+
 import xml.etree.ElementTree as et
 import numbers
 
 import numpy as np
-import pandas as pd
 import scipy.sparse as sps
 
 from paminco.utils.readin import parse_number, xml_find_root
 from paminco.utils.misc import Cache
 from paminco.utils.typing import sparse_format, is_int, is_iterable, IntEnum2
 import paminco._doc as _doc
+from ._edge_index import EdgeIndex
+from ._labels import LabelTable
 
 
 ID_UNMAPPED = -9999
@@ -82,9 +85,17 @@ class Edges:
         Datatype for edge bounds.
     copy : bool, default=False
         Whether to create a copy of the inputs in data.
+    label_table : LabelTable, optional
+        Table that labels are stored in, e.g., the table of the nodes.
+        If None, a new table is created.
     
     Attributes
     ----------
+    label_codes : ndarray
+        Ndarray of shape (m, 2), codes of source and target labels in
+        ``label_table``.
+    label_table : LabelTable
+        Table of distinct node labels.
     flow_directions : ndarray
         Ndarray of shape (m, ). A ``-1`` denotes an edge with lb < 0 and
         ub <= 0. A ``0`` denotes an edge with lb < 0 and ub > 0.
@@ -100,7 +111,10 @@ class Edges:
             dtype_float=None,
             dtype_int=None,
             copy: bool = False,
+            label_table: LabelTable = None,
             ) -> None:
+        if label_table is None:
+            label_table = LabelTable()
         # Collect kwargs
         kw = {
             "directed_flow": directed_flow,
@@ -109,12 +123,14 @@ class Edges:
             "dtype_float": dtype_float,
             "dtype_int": dtype_int,
             "copy": copy,
+            "label_table": label_table,
         }
         if isinstance(data, Edges):
             d = (data.labels, data.indices, data.bounds)
             return self.__init__(d,
                                  dtype_float=data.dtype_float,
-                                 dtype_int=data.dtype_int)
+                                 dtype_int=data.dtype_int,
+                                 label_table=label_table)
         elif isinstance(data, tuple):
             if len(data) == 3:
                 pass
@@ -128,14 +144,16 @@ class Edges:
                         st_ids = np.vectorize(map_labels_to_indices.__getitem__)(st)
                     elif map_labels_to_indices is True:
                         # Automap labels
-                        # Get unique labels and sort them if quasi-ints
-                        unique_lbl = np.unique(st)
+                        # Get unique labels and sort them (as ints if quasi-ints)
+                        codes, st_ids = np.unique(label_table.encode(st), return_inverse=True)
+                        unique_lbl = label_table.decode(codes)
                         try:
-                            unique_lbl = sorted(unique_lbl, key=int)
+                            order = np.argsort([int(lbl) for lbl in unique_lbl], kind="stable")
                         except ValueError:
-                            pass
-                        d = dict(zip(unique_lbl, np.arange(len(unique_lbl))))
-                        st_ids = np.vectorize(d.__getitem__)(st)
+                            order = np.argsort(unique_lbl, kind="stable")
+                        rank = np.empty(len(order), dtype=int)
+                        rank[order] = np.arange(len(order))
+                        st_ids = rank[st_ids].reshape(st.shape)
                     elif map_labels_to_indices is None or map_labels_to_indices is False:
                         # Set to invalid indices
                         st_ids = np.full(st.shape, ID_UNMAPPED, dtype=int)
@@ -179,7 +197,8 @@ class Edges:
         
         # Unpack data
         labels, indices, bounds = data
-        self.labels = np.array(labels, dtype=str, copy=copy)
+        self.label_table = label_table
+        self.labels = labels
         self.indices = np.array(indices, dtype=dtype_int, copy=copy)
         
         # Broadcast bounds if lower, upper for all edges given
@@ -208,18 +227,22 @@ class Edges:
                                               **bkw)
         
         # Check consistency of labels, indices and bounds
-        if self.labels.shape[1] != 2:
+        if self.label_codes.ndim != 2 or self.label_codes.shape[1] != 2:
             raise ValueError(
-                f"Invalid edge data, labels are of shape {self.labels.shape}."
+                f"Invalid edge data, labels are of shape {self.label_codes.shape}."
             )
-        if (self.labels.shape == self.indices.shape == self.bounds.shape) is False:
+        if (self.label_codes.shape == self.indices.shape == self.bounds.shape) is False:
             raise ValueError(
                 "Inconsistent shapes. "
-                f"Labels: {self.labels.shape}, "
+                f"Labels: {self.label_codes.shape}, "
                 f"indices: {self.indices.shape}, "
                 f"bounds: {self.bounds.shape}."
             )
         
+        self._set_flow_directions()
+        self.cache = Cache()
+
+    def _set_flow_directions(self) -> None:
         # Set edge directions and get type of graph
         self.flow_directions = np.zeros(len(self))
         self.flow_directions[self.lb < 0] -= 1
@@ -231,8 +254,6 @@ class Edges:
             self.flow_dir = FlowDirection.DIRECTED
         else:
             self.flow_dir = FlowDirection.MIXED
-            
-        self.cache = Cache()
 
     def __eq__(self, other) -> bool:
         for att in ["labels", "indices", "bounds"]:
@@ -263,6 +284,8 @@ class Edges:
             Edges with source/target labels, source/target ids, lower
             and upper bounds.
         """
+        import pandas as pd
+        
         data = np.hstack([self.labels, self.indices, self.bounds])
         df = pd.DataFrame(data, **kwargs)
         df.columns = ["source_lbl", "target_lbl", "s", "t", "lb", "ub"]
@@ -277,6 +300,8 @@ class Edges:
             labels: bool = True,
             colname_flow: str = "flow"
             ) -> pd.DataFrame:
+        import pandas as pd
+        
         if isinstance(x, (int, float)):
             x = np.full(len(self), x)
         
@@ -326,13 +351,21 @@ class Edges:
         return s, t
 
     def get_duplicate_edges(self) -> np.ndarray:
-        # Dubplicates -> s/t both are the same
-        st = pd.Series([str(a) + "-" + str(b) for (a, b) in self.indices])
-        return np.where(st.duplicated())[0]
-
-    def map_labels(self, d: dict) -> None:
-        """Map edge labels by d."""
-        self.indices = np.vectorize(d.__getitem__)(self.labels).astype(self.dtype_int)
+        # Dubplicates -> s/t both are the same, first edge is kept
+        if len(self.indices) == 0:
+            return np.array([], dtype=int)
+        s, t = self.indices.T
+        order = np.lexsort((t, s))
+        is_dup = np.zeros(len(order), dtype=bool)
+        is_dup[1:] = (s[order[1:]] == s[order[:-1]]) & (t[order[1:]] == t[order[:-1]])
+        return np.sort(order[is_dup])
+
+    def map_labels(self, d) -> None:
+        """Map edge labels by d (dict or vectorized callable)."""
+        if isinstance(d, dict):
+            self.indices = np.vectorize(d.__getitem__)(self.labels).astype(self.dtype_int)
+        else:
+            self.indices = np.asarray(d(self.labels)).astype(self.dtype_int)
 
     def _delete_edges(
             self,
@@ -342,7 +375,7 @@ class Edges:
         del_idx = np.array(del_idx)
         
         # Delete edges in all numpy arrays
-        self.labels = np.delete(self.labels, del_idx, axis=0)
+        self.label_codes = np.delete(self.label_codes, del_idx, axis=0)
         self.indices = np.delete(self.indices, del_idx, axis=0)
         self.bounds = np.delete(self.bounds, del_idx, axis=0)
         self.flow_directions = np.delete(self.flow_directions, del_idx, axis=0)
@@ -360,11 +393,9 @@ class Edges:
             nodes,
             return_indices: bool = False
             ):
-        nodes = np.array(nodes).reshape(1, -1)
+        nodes = np.array(nodes).ravel()
         # get indices of edges to delete
-        idx_s = ((self.s.reshape(-1, 1) - nodes) == 0).any(axis=1)
-        idx_t = ((self.t.reshape(-1, 1) - nodes) == 0).any(axis=1)
-        del_idx = idx_s | idx_t
+        del_idx = np.isin(self.indices, nodes).any(axis=1)
         
         return self._delete_edges(del_idx, return_indices=return_indices)
 
@@ -450,8 +481,9 @@ class Edges:
         if save_dict is None:
             save_dict = {}
         
-        for k in ["labels", "indices", "bounds"]:
+        for k in ["label_codes", "indices", "bounds"]:
             save_dict[prefix + k] = getattr(self, k)
+        save_dict[prefix + "label_table"] = self.label_table.labels
         return save_dict
     
     make_save_dict.__doc__ = _doc.make_save_dict.__doc__
@@ -477,7 +509,7 @@ class Edges:
         if isinstance(data, str):
             data = np.load(data)
         
-        edge_data = (data[prefix + "labels"],
+        edge_data = (_load_labels(data, prefix),
                      data[prefix + "indices"],
                      data[prefix + "bounds"])
         
@@ -485,6 +517,20 @@ class Edges:
     
     from_npz.__func__.__doc__ = _doc.from_npz.__doc__
 
+    @classmethod
+    def _from_saved(cls, data, prefix: str = ""):
+        # Arrays saved by make_save_dict are already consistent -> use
+        # them as they are (e.g., memory-mapped) without copying
+        edges = cls.__new__(cls)
+        edges.label_codes, edges.label_table = _load_label_codes(data, prefix)
+        edges.indices = data[prefix + "indices"]
+        edges.bounds = data[prefix + "bounds"]
+        edges._dtype_int = edges.indices.dtype.type
+        edges._dtype_float = edges.bounds.dtype.type
+        edges._set_flow_directions()
+        edges.cache = Cache()
+        return edges
+
     @property
     def flow_forward(self) -> np.ndarray:
         return np.where(self.flow_directions == 1)[0]
@@ -517,15 +563,29 @@ class Edges:
         """ndarray (m, ) of int: target ids."""
         return self.indices[:, 1]
 
+    @property
+    def labels(self) -> np.ndarray:
+        """ndarray (m, 2) of str: source and target labels."""
+        return self.label_table.decode(self.label_codes)
+
+    @labels.setter
+    def labels(self, val) -> None:
+        self.label_codes = self.label_table.encode(val)
+
     @property
     def source_lbl(self) -> np.ndarray:
         """ndarray (m, ) of str: sources labels."""
-        return self.labels[:, 0]
+        return self.label_table.decode(self.label_codes[:, 0])
 
     @property
     def target_lbl(self) -> np.ndarray:
         """ndarray (m, ) of str: target labels."""
-        return self.labels[:, 1]
+        return self.label_table.decode(self.label_codes[:, 1])
+
+    def set_label_table(self, table: LabelTable) -> None:
+        """Store labels in ``table``, e.g., the table of the nodes."""
+        self.label_codes = table.recode(self.label_codes, self.label_table)
+        self.label_table = table
 
     @property
     def dtype_int(self):
@@ -579,9 +639,16 @@ class Nodes:
         ``labels = callable(indices)``.
     copy : bool, default=False
         Whether to create a copy of the inputs in data.
+    label_table : LabelTable, optional
+        Table that labels are stored in. If None, a new table is
+        created.
     
     Attributes
     ----------
+    label_codes : ndarray
+        Ndarray of shape (n, ), codes of node labels in ``label_table``.
+    label_table : LabelTable
+        Table of distinct node labels.
     index
     node
     zone
@@ -597,6 +664,7 @@ class Nodes:
             dtype_int=None,
             map_labels=True,  # optional
             copy: bool = False,
+            label_table: LabelTable = None,
             ) -> None:
         # Collect kwargs
         kw = {
@@ -604,13 +672,15 @@ class Nodes:
             "dtype_float": dtype_float,
             "dtype_int": dtype_int,
             "copy": copy,
+            "label_table": label_table,
         }
         
         if isinstance(data, Nodes):
             d = (data.labels, data.indices, data.xy, data.zone)
             return self.__init__(d,
                                  dtype_float=data.dtype_float,
-                                 dtype_int=data.dtype_int)
+                                 dtype_int=data.dtype_int,
+                                 label_table=label_table)
         elif isinstance(data, tuple):
             if len(data) == 4:
                 pass
@@ -663,23 +733,24 @@ class Nodes:
         
         labels, indices, xy, zone = data
         indices = np.argsort(indices)
-        self.labels = np.array(labels, dtype=str, copy=copy)[indices]
+        self.label_table = LabelTable() if label_table is None else label_table
+        self.labels = np.asarray(labels)[indices]
         if isinstance(zone, bool):
-            zone = [zone] * len(self.labels)
+            zone = [zone] * len(self)
         self.zone = np.array(zone, dtype=bool, copy=copy)[indices]
 
         if xy is not None:
             xy = np.array(xy)
-            if xy.shape != (len(self.labels), 2):
+            if xy.shape != (len(self), 2):
                 raise ValueError(f"Coordinates have wrong shape: {xy.shape}, should be {len(labels), 2}.")
             self.xy = np.array(xy, dtype=dtype_float, copy=copy)[indices]
         else:
             self.xy = None
             
-        if (len(self.labels) == len(indices) == len(self.zone)) is False:
+        if (len(self) == len(indices) == len(self.zone)) is False:
             raise ValueError(
                 "Invalid shape of node data, "
-                f"labels: {self.labels.shape}, "
+                f"labels: {self.label_codes.shape}, "
                 f"indices: {indices.shape}, "
                 f"zone: {self.zone.shape}."
             )
@@ -687,7 +758,7 @@ class Nodes:
         self.set_mappings()
 
     def __len__(self) -> int:
-        return len(self.labels)
+        return len(self.label_codes)
 
     def __eq__(self, other) -> bool:
         for att in ["labels", "indices", "zone"]:
@@ -696,9 +767,126 @@ class Nodes:
         return True
 
     def set_mappings(self) -> None:
-        """(Re)-set labels <-> indices mappings."""
-        self.lbl2id = dict(zip(self.labels, self.indices))
-        self.id2lbl = dict(zip(self.indices, self.labels))
+        """(Re)-set labels <-> indices mappings, built on first access."""
+        self._lbl2id = None
+        self._id2lbl = None
+        self._lbl_index = None
+
+    @property
+    def lbl2id(self) -> dict:
+        """dict: maps node label (str) -> node index (int)."""
+        if getattr(self, "_lbl2id", None) is None:
+            self._lbl2id = dict(zip(self.labels, self.indices))
+        return self._lbl2id
+
+    @property
+    def id2lbl(self) -> dict:
+        """dict: maps node index (int) -> node label (str)."""
+        if getattr(self, "_id2lbl", None) is None:
+            self._id2lbl = dict(zip(self.indices, self.labels))
+        return self._id2lbl
+
+    @property
+    def labels(self) -> np.ndarray:
+        """ndarray (n, ) of str: node labels."""
+        return self.label_table.decode(self.label_codes)
+
+    @labels.setter
+    def labels(self, val) -> None:
+        self.label_codes = self.label_table.encode(val)
+        self._lbl_index = None
+
+    def _get_code_index(self) -> np.ndarray:
+        # Node index of every code in the label table, -1 if the label
+        # is not a node label. The last entry is -1 for unknown codes.
+        lookup = getattr(self, "_lbl_index", None)
+        if lookup is None or len(lookup) != len(self.label_table) + 1:
+            lookup = np.full(len(self.label_table) + 1, -1, dtype=self.dtype_int)
+            lookup[self.label_codes] = self.indices
+            self._lbl_index = lookup
+        return lookup
+
+    def label_to_index(self, labels) -> np.ndarray:
+        """Map node labels to node indices, vectorized.
+        
+        Labels are binary searched in the label table. For duplicate
+        labels, the last index is returned.
+        
+        Parameters
+        ----------
+        labels : str or array_like of str
+            Node labels.
+        
+        Returns
+        -------
+        ndarray of int
+            Node indices, same shape as ``labels``.
+        
+        Raises
+        ------
+        KeyError
+            If a label is not a node label.
+        """
+        labels = np.asarray(labels)
+        indices = self._get_code_index()[self.label_table.find(labels)]
+        missing = indices < 0
+        if np.any(missing):
+            raise KeyError(np.atleast_1d(labels)[np.atleast_1d(missing)][0])
+        return indices
+
+    def code_to_index(self, codes) -> np.ndarray:
+        """Map codes of node labels to node indices, vectorized.
+        
+        Parameters
+        ----------
+        codes : int or array_like of int
+            Codes of labels in ``label_table``.
+        
+        Returns
+        -------
+        ndarray of int
+            Node indices, same shape as ``codes``.
+        
+        Raises
+        ------
+        KeyError
+            If a code is not the code of a node label.
+        """
+        codes = np.asarray(codes)
+        lookup = self._get_code_index()
+        invalid = (codes < 0) | (codes >= len(lookup) - 1)
+        indices = lookup[np.where(invalid, -1, codes)]
+        missing = indices < 0
+        if np.any(missing):
+            code = np.atleast_1d(codes)[np.atleast_1d(missing)][0]
+            if 0 <= code < len(self.label_table):
+                raise KeyError(self.label_table.decode(code))
+            raise KeyError(code)
+        return indices
+
+    def index_to_label(self, indices) -> np.ndarray:
+        """Map node indices to node labels, vectorized.
+        
+        Parameters
+        ----------
+        indices : int or array_like of int
+            Node indices.
+        
+        Returns
+        -------
+        ndarray of str
+            Node labels, same shape as ``indices``.
+        
+        Raises
+        ------
+        KeyError
+            If an index is not a node index.
+        """
+        indices = np.asarray(indices)
+        invalid = (indices < 0) | (indices >= len(self))
+        if np.any(invalid):
+            raise KeyError(indices[invalid].ravel()[0] if indices.ndim > 0 else indices[()])
+        return self.label_table.decode(self.label_codes[indices])
 
     def get_pos(self) -> dict:
         if self.xy is None:
@@ -729,7 +917,7 @@ class Nodes:
         --------
         numpy.delete
         """
-        self.labels = np.delete(self.labels, nodes)
+        self.label_codes = np.delete(self.label_codes, nodes)
         self.zone = np.delete(self.zone, nodes)
         if self.xy is not None:
             self.xy = np.delete(self.xy, nodes, axis=0)
@@ -754,6 +942,8 @@ class Nodes:
             Nodes data with node label, coordinates (x, y) and zone
             (bool).
         """
+        import pandas as pd
+        
         df = pd.DataFrame({"label": self.labels, "zone": self.zone}, **kwargs)
         df["label"] = df["label"].astype(str)
         df["zone"] = df["zone"].astype(bool)
@@ -801,12 +991,20 @@ class Nodes:
             cls,
             edges: Edges,
             **kw):
-        d = dict(zip(edges.labels.ravel(), edges.indices.ravel()))
-        labels = np.array(list(d.keys()))
-        indices = np.array(list(d.values()))
-        if np.array_equal(np.sort(indices), np.arange(len(indices))) is False:
+        codes, indices = edges.label_codes.ravel(), edges.indices.ravel()
+        n = indices.max() + 1 if len(indices) > 0 else 0
+        if len(indices) > 0 and indices.min() < 0:
             raise ValueError("Invalid edge indices.")
-        return cls(labels[indices.argsort()], **kw)
+        # Label of every index, every index must have exactly one label
+        node_codes = np.empty(n, dtype=codes.dtype)
+        node_codes[indices] = codes
+        if (np.array_equal(node_codes[indices], codes) is False
+                or not np.bincount(indices, minlength=n).all()
+                or len(np.unique(node_codes)) != n):
+            raise ValueError("Invalid edge indices.")
+        return cls(edges.label_table.decode(node_codes),
+                   label_table=edges.label_table,
+                   **kw)
 
     @classmethod
     def from_xml(
@@ -841,8 +1039,9 @@ class Nodes:
     def make_save_dict(self, prefix: str = "", save_dict=None) -> dict:
         if save_dict is None:
             save_dict = {}
-        for k in ["labels", "zone", "xy"]:
+        for k in ["label_codes", "zone", "xy"]:
             save_dict[prefix + k] = getattr(self, k)
+        save_dict[prefix + "label_table"] = self.label_table.labels
         return save_dict
     
     make_save_dict.__doc__ = _doc.make_save_dict.__doc__
@@ -869,7 +1068,7 @@ class Nodes:
             data = np.load(data)
         # make empty edge object and fill with data
         node_data = (
-            data[prefix + "labels"],
+            _load_labels(data, prefix),
             data[prefix + "xy"],
             data[prefix + "zone"],
         )
@@ -877,6 +1076,29 @@ class Nodes:
     
     from_npz.__func__.__doc__ = _doc.from_npz.__doc__
 
+    @classmethod
+    def _from_saved(
+            cls,
+            data,
+            prefix: str = "",
+            dtype_int=int,
+            ):
+        # Nodes are saved sorted by index -> use arrays as they are
+        nodes = cls.__new__(cls)
+        nodes.label_codes, nodes.label_table = _load_label_codes(data, prefix)
+        nodes.zone = data[prefix + "zone"]
+        xy = data[prefix + "xy"]
+        if xy is None or np.ndim(xy) != 2:
+            # saved without coordinates
+            xy = None
+        nodes.xy = xy
+        nodes.dtype_int = dtype_int
+        nodes.dtype_float = (np.float64 if nodes.xy is None
+                             else nodes.xy.dtype.type)
+        # mappings are built on first access
+        nodes.set_mappings()
+        return nodes
+
     def _get_node(self, idx):
         return {att: getattr(self, att)[idx]
                 for att in ["index", "node", "x", "z", "zone"]}
@@ -884,7 +1106,7 @@ class Nodes:
     @property
     def indices(self) -> np.ndarray:
         """ndarray (m, ) of int: node indices."""
-        return np.arange(len(self.labels), dtype=self.dtype_int)
+        return np.arange(len(self), dtype=self.dtype_int)
 
     @property
     def has_zones(self) -> bool:
@@ -906,6 +1128,21 @@ class Nodes:
         return self.xy[:, 1]
 
 
+def _load_label_codes(data, prefix: str = "") -> tuple:
+    # Label codes and table as saved by make_save_dict, or encode labels
+    # saved as strings by previous versions
+    if prefix + "label_codes" in data:
+        table = LabelTable(data[prefix + "label_table"])
+        return data[prefix + "label_codes"], table
+    table = LabelTable()
+    return table.encode(data[prefix + "labels"]), table
+
+
+def _load_labels(data, prefix: str = "") -> np.ndarray:
+    codes, table = _load_label_codes(data, prefix)
+    return table.decode(codes)
+
+
 class Shared:
     """Class that acts as a shared object for a Network.
     
@@ -945,18 +1182,21 @@ class Shared:
             self.nodes = Nodes.from_edges(self.edges,
                                           dtype_float=dtype_float,
                                           dtype_int=dtype_int)
+            # Edges are already mapped consistently with their nodes
+            self._set_edge_id_mapping()
         else:
             self.nodes = Nodes(node_data,
                                dtype_float=dtype_float,
                                dtype_int=dtype_int)
             self.edges = Edges(edge_data,
-                               map_labels_to_indices=self.nodes.lbl2id,
-                               map_indices_to_labels=self.nodes.id2lbl,
+                               map_labels_to_indices=self.nodes.label_to_index,
+                               map_indices_to_labels=self.nodes.index_to_label,
                                dtype_float=dtype_float,
                                dtype_int=dtype_int,
+                               label_table=self.nodes.label_table,
                                **kwargs)
+            self._update_edges()
 
-        self._update_edges()
         self.cache = Cache()
 
     def __eq__(self, other) -> bool:
@@ -980,13 +1220,15 @@ class Shared:
         self._set_edge_indices()
 
     def _set_edge_indices(self) -> None:
-        self.edges.map_labels(self.node2id)
+        # Nodes and edges share their label table -> map label codes
+        self.edges.set_label_table(self.nodes.label_table)
+        indices = self.nodes.code_to_index(self.edges.label_codes)
+        self.edges.indices = indices.astype(self.edges.dtype_int, copy=False)
         self._set_edge_id_mapping()
 
     def _set_edge_id_mapping(self) -> None:
         # create mapping (nodeid, nodeid) -> edgeid
-        k_id = [tuple(row) for row in self.edges.indices]
-        self._nodes2edge = dict(zip(k_id, range(len(k_id))))
+        self._nodes2edge = EdgeIndex(self.edges.indices, n=self.n)
 
     def _get_dtypes(
             self,
@@ -1245,17 +1487,27 @@ class Shared:
         
         Parameters
         ----------
-        nodes : (sequence of) tuple (int, int)
-            Node indices (source, target) to be mapped to edge indices.
+        nodes : tuple (int, int), sequence of tuple, or ndarray
+            Node indices (source, target) to be mapped to edge indices,
+            ndarray of shape (k, 2).
         
         Returns
         -------
-        int, or list of int
-            Edge indices for nodes.
+        int, list of int, or ndarray
+            Edge indices for nodes, ndarray if ``nodes`` is ndarray.
+        
+        Raises
+        ------
+        KeyError
+            If nodes are not connected by an edge.
         """
         if isinstance(nodes, tuple):
             return self.nodes2edge[nodes]
-        return [self.get_edge_id(n) for n in nodes]
+        st = np.asarray(nodes, dtype=int).reshape(-1, 2)
+        ids = self.nodes2edge.get_ids(st[:, 0], st[:, 1])
+        if isinstance(nodes, np.ndarray):
+            return ids
+        return ids.tolist()
 
     def get_node_id(
             self,
@@ -1285,15 +1537,15 @@ class Shared:
         """
         # Single entry
         if isinstance(nodes, str):
-            return self.node2id[nodes]
+            return int(self.nodes.label_to_index(nodes))
         
         # Vectorize for arrays, better performance for larger arrays
         if (isinstance(nodes, np.ndarray) and 
                 (vectorize is True or nodes.ndim > 1)):
-            return np.vectorize(self.node2id.__getitem__)(nodes)
+            return self.nodes.label_to_index(nodes)
         
         if is_iterable(nodes):
-            return [self.node2id[n] for n in nodes]
+            return self.nodes.label_to_index(list(nodes)).tolist()
         
         return ValueError("'nodes' must be either str, iterable or array.")
 
@@ -1328,20 +1580,17 @@ class Shared:
         ValueError:
             Nodes is neither int, ndarray or iterable.
         """
-        # Reverse dict
-        d = self.nodes.id2lbl
-        
         # Case single entry
         if is_int(nodes):
-            return d[nodes]
+            return self.nodes.index_to_label(nodes)
         
         # Vectorize for numpy arrays, better performance for larger arrays
         if (isinstance(nodes, np.ndarray) and 
                 (vectorize is True or nodes.ndim > 1)):
-            return np.vectorize(d.__getitem__)(nodes)
+            return self.nodes.index_to_label(nodes)
         
         if is_iterable(nodes):
-            return [d[n] for n in nodes]
+            return self.nodes.index_to_label(list(nodes)).tolist()
         
         return ValueError("'nodes' must be either int, iterable or array.")
 
@@ -1420,6 +1669,18 @@ class Shared:
                                **kw_edges)
         return cls(edges, nodes)
 
+    @classmethod
+    def _from_saved(cls, data, prefix: str = ""):
+        # Skip label mapping, index mappings are built on first use
+        s = cls.__new__(cls)
+        s.edges = Edges._from_saved(data, prefix + "edge_")
+        s.nodes = Nodes._from_saved(data, prefix + "node_",
+                                    dtype_int=s.edges.dtype_int)
+        s.edges.set_label_table(s.nodes.label_table)
+        s._nodes2edge = None
+        s.cache = Cache()
+        return s
+
     @property
     def flow_direction(self) -> FlowDirection:
         """The direction of flow on the edges.
@@ -1441,8 +1702,15 @@ class Shared:
         return len(self.edges)
 
     @property
-    def nodes2edge(self) -> dict:
-        """Get dict that maps (node_id, node_id) -> edge_id."""
+    def nodes2edge(self) -> EdgeIndex:
+        """Get read-only mapping (node_id, node_id) -> edge_id.
+        
+        See Also
+        --------
+        paminco.net._edge_index.EdgeIndex
+        """
+        if getattr(self, "_nodes2edge", None) is None:
+            self._set_edge_id_mapping()
         return self._nodes2edge
 
     @property
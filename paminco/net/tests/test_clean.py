@@ -97,7 +97,10 @@ class TestCost:
     def test_delete_edges_poly(self, rng):
         rng = np.random.default_rng(rng)
         net = load_sioux()
-        net._remove_zones()
+        net.clean(remove_zones=True,
+                  remove_parallel_edges=False,
+                  remove_zero_cost_edges=False,
+                  remove_commodities=True)
         del_idx = rng.choice(net.n, 20, replace=False)
         net2 = copy.deepcopy(net)
 
@@ -254,3 +257,38 @@ class TestCleanSioux:
 
         assert len(net_sioux.shared.edges) == len(net_sioux.cost.coefficients), \
             "Cost and edgelist do not have same size."
+
+
+@pytest.mark.parametrize("zones", [[], [2, 7, 13]])
+@pytest.mark.parametrize("remove_commodities", [False, True])
+def test_clean_rules_combined(zones, remove_commodities):
+    # All rules at once equals applying the rules one after another
+    rules = ["remove_zones", "remove_parallel_edges", "remove_zero_cost_edges",
+             "remove_isolated_nodes", "remove_unreachable_nodes"]
+    
+    def dirty():
+        net = load_sioux()
+        net.nodes.zone[zones] = True
+        net.cost.coefficients[[4, 30], :] = 0
+        net.delete_nodes(["11", "15", "20"], is_label=True)
+        return net
+    
+    net = dirty()
+    net.clean(**{r: True for r in rules}, remove_commodities=remove_commodities)
+    
+    net2 = dirty()
+    for r in rules:
+        net2.clean(**{k: (k == r) for k in rules}, remove_commodities=remove_commodities)
+    
+    assert net.shared == net2.shared
+    assert net.shared.nodes2edge == net2.shared.nodes2edge
+    assert np.array_equal(net.cost.coefficients, net2.cost.coefficients)
+    if remove_commodities is True:
+        assert (net.demand(1) != net2.demand(1)).nnz == 0
+
+
+def test_duplicate_edges():
+    net = load_sioux()
+    assert len(net.edges.get_duplicate_edges()) == 0
+    net.edges.indices[[5, 9]] = net.edges.indices[3]
+    assert net.edges.get_duplicate_edges().tolist() == [5, 9]
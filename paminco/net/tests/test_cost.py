@@ -8,7 +8,7 @@ from paminco.net._data_gas import temporary_gas_files
 from paminco.net._data_examples import (NET_SIMPLE_POLYNOMIAL,
                                        NET_ELECTRICAL_PIECEWISE)
 from paminco.net.network import Network
-from paminco.net.cost import EquidistantInterpolationRule, PiecewiseQuadraticCost, SymbolicCost, SimplePolynomial, BreakpointsInterpolationRule, EdgeCostInterpolation
+from paminco.net.cost import EquidistantInterpolationRule, PiecewiseQuadraticCost, PiecewiseQuadraticCoefficients, SymbolicCost, SimplePolynomial, PolynomialCost, BreakpointsInterpolationRule, EdgeCostInterpolation
 from paminco.algo.mca import MCAInterpolationRule
 
 
@@ -145,6 +145,129 @@ def test_signed_polycost():
         assert np.array_equal(poly_result, target_vals[i])
 
 
+@pytest.mark.parametrize("signed", [False, True])
+def test_polycost_values(signed):
+    """Test fused evaluation of derivatives against SimplePolynomial."""
+    rng = np.random.default_rng(0)
+    coefficients = rng.normal(size=(6, 5))
+    coefficients[:, [1, 3]] = 0  # skipped degrees
+    signed = np.full(6, signed)
+    signed[::2] = False
+    m_edges = [[str(e), str(e + 1)] for e in range(6)]
+    dummy_net = Network(m_edges, cost_data=(coefficients, signed))
+    polynomials = [SimplePolynomial(coefficients[i], signed[i]) for i in range(6)]
+    
+    x = rng.normal(size=6) * 10
+    d = (3, 0, 1, 6)
+    vals = dummy_net.cost.values(x, d=d)
+    assert len(vals) == len(d)
+    for (d_, val) in zip(d, vals):
+        assert np.array_equal(val, dummy_net.cost(x, d=d_))
+        expected = [p(x[i], d=d_) for (i, p) in enumerate(polynomials)]
+        assert np.allclose(val, expected)
+    assert np.array_equal(vals[-1], np.zeros(6))
+
+
+def test_symbolic_derivatives():
+    """Test derivatives and single edges of SymbolicCost given only F."""
+    net = load_sioux()
+    coeffs = {"fft": net.cost.coefficients[:, 0], "a": net.cost.coefficients[:, 4]}
+    sc = SymbolicCost(coeffs, F="x*fft + a/5 * x**5")
+    net.integrate_cost()
+    x = np.random.default_rng(0).random(net.m) * 10000
+    for d in range(4):
+        assert np.allclose(sc(x, d=d), net.cost(x, d=d))
+        for i in [0, 7, net.m - 1]:
+            assert np.isclose(sc[i](x[i], d=d), sc(x, d=d)[i])
+    assert sc.expression(3) == "((a / 5) * (60 * (x ** 2)))"
+    
+    # Derivatives that fold to constants are float
+    assert sc.edge_values([0, 1, 2], 1.0, d=5).dtype == float
+    assert isinstance(sc[1](2.0, d=6), float)
+
+
+def test_symbolic_rejects_code():
+    """Test that expressions outside the expression syntax are rejected."""
+    sc = SymbolicCost({"a": np.ones(3)},
+                      F="x*a + ().__class__.__base__.__subclasses__().__len__()*0")
+    with pytest.raises(ValueError):
+        sc[0](1.0)
+    with pytest.raises(ValueError):
+        sc.edge_values([0, 1], 1.0)
+    sc = SymbolicCost({"a": np.ones(3)}, F="x*a + __import__('os').getpid()*0")
+    with pytest.raises(ValueError):
+        sc[0](1.0)
+
+
+def test_edge_values():
+    """Test batched evaluation of selected edges against edge costs."""
+    rng = np.random.default_rng(0)
+    coefficients = rng.normal(size=(6, 5))
+    signed = np.arange(6) % 2 == 0
+    m_edges = [[str(e), str(e + 1)] for e in range(6)]
+    poly = Network(m_edges, cost_data=(coefficients, signed)).cost
+    
+    sioux = load_sioux()
+    coeffs = {"fft": sioux.cost.coefficients[:, 0], "a": sioux.cost.coefficients[:, 4]}
+    sym = SymbolicCost(coeffs, F="x*fft + a/5 * x**5", shared=sioux.shared)
+    sioux.integrate_cost()
+    pwq = sioux.cost.interpolate(MCAInterpolationRule(1.5, 1, sioux.m, 1e4))
+    
+    for (cost, lo) in [(poly, -10), (sym, 0), (pwq, 0)]:
+        edges = rng.integers(0, cost.m, 50)
+        x = rng.uniform(lo, 1e4 if lo == 0 else 10, 50)
+        for d in range(4):
+            expected = [cost[e](x_e, d=d) for (e, x_e) in zip(edges, x)]
+            assert np.allclose(cost.edge_values(edges, x, d=d), expected)
+            assert np.allclose([cost.edge_value(e, x_e, d=d) for (e, x_e) in zip(edges, x)],
+                               expected)
+        assert cost.edge_values(edges.reshape(5, 10), 1.0).shape == (5, 10)
+
+
+def test_position_of():
+    """Test binary search of function parts against linear scans."""
+    net = load_sioux()
+    net.integrate_cost()
+    pwq = net.cost.interpolate(MCAInterpolationRule(1.01, 1, net.m, 1e4))
+    net.set_cost(pwq)
+    ec = pwq.coefficients
+    rng = np.random.default_rng(0)
+    
+    flow = rng.uniform(-10, 1e4, net.m)
+    flow[:10] = ec.tau[pwq.first_pos[:10] + 1]  # at breakpoints
+    pos = pwq.position_of(flow, up_bias=0)
+    for e in range(net.m):
+        parts = np.arange(pwq.first_pos[e], pwq.last_pos[e] + 1)
+        assert pos[e] == parts[ec.tau[parts] <= flow[e]][-1]
+    
+    potential = rng.uniform(0, 50, net.n)
+    pos = pwq.position_of_potential(potential)
+    pot_diff = potential * net.shared.Gamma()
+    assert np.all((ec.sig_l[pos] <= pot_diff) & (pot_diff < ec.sig_u[pos]))
+    assert np.array_equal(pwq.region_of_potential(potential), pos - pwq.first_pos)
+
+
+def test_pwq_coefficient_columns():
+    """Test column storage, selection and reuse of coefficient buffers."""
+    net = Network.from_xml(NET_ELECTRICAL_PIECEWISE)
+    ec = net.cost.coefficients
+    for col in PiecewiseQuadraticCoefficients.PWC_COEFFICIENT_COLS:
+        assert getattr(ec, col).flags.c_contiguous
+        assert np.shares_memory(getattr(ec, col), ec.coefficients)
+    
+    region = np.zeros(net.m, dtype=int)
+    sel = net.cost.get_coefficients(region, is_region=True)
+    assert np.array_equal(sel.coefficients, ec.coefficients[net.cost.first_pos])
+    assert np.array_equal(ec.get(["a", "tau"], at=net.cost.first_pos),
+                          ec.coefficients[net.cost.first_pos][:, [0, 3]])
+    
+    region[0] = 1
+    reused = net.cost.get_coefficients(region, is_region=True, out=sel)
+    assert reused is sel
+    assert np.array_equal(sel.coefficients, ec.coefficients[net.cost.first_pos + region])
+    assert sel == ec[net.cost.first_pos + region]
+
+
 def numerical_function_compare(f1, f2, a, b, k, exact=False, x_shape=None):
     """Compare two functions f1 and f2 by checking values numerically.
     
@@ -364,10 +487,11 @@ def test_edge_interpolation(rng):
     rng = np.random.default_rng(rng)
     degree = rng.integers(3, 6)
     coeffs = rng.integers(-10, 10, degree + 1)
-    ec = SimplePolynomial(coeffs)
+    cost = PolynomialCost(coeffs.reshape(1, -1).astype(float))
+    ec = cost[0]
     step = 10
     irule = EquidistantInterpolationRule(step)
-    eci = EdgeCostInterpolation(0, ec, irule, 1000 + step, 0, 1000 + step)
+    eci = EdgeCostInterpolation(0, cost, irule, 1000 + step, 0, 1000 + step)
     coeff = eci.interpolate()
     a = 2 * coeff[1:-1, 0]
     b = coeff[1:-1, 1]
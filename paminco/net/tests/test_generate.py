@@ -0,0 +1,80 @@
+import pytest
+import numpy as np
+
+from paminco.net import generate
+from paminco.net.cost import PolynomialCost
+from paminco.net.demand import DemandVectorSP
+
+
+def test_bpr_coefficients():
+    coeffs = generate.bpr_coefficients([2., 3.], [10., 5.], alpha=0.5, power=3)
+    assert coeffs.shape == (2, 4)
+    x = np.array([4., 7.])
+    expected = np.array([2., 3.]) * (1 + 0.5 * (x / np.array([10., 5.]))**3)
+    assert np.allclose(PolynomialCost(coeffs).value(x), expected)
+    with pytest.raises(ValueError):
+        generate.bpr_coefficients(1., 1., power=2.5)
+
+
+def test_gravity_demand():
+    xy = np.array([[0., 0.], [1., 0.], [5., 0.]])
+    od = generate.gravity_demand(xy, total_demand=10.)
+    assert np.isclose(od[:, 2].sum(), 10.)
+    assert (od[:, 0] != od[:, 1]).all()
+    rate = {(int(s), int(t)): r for (s, t, r) in od}
+    assert rate[(0, 1)] > rate[(0, 2)]
+    od = generate.gravity_demand(xy, zones=[0, 2])
+    assert np.array_equal(od[:, :2], [[0, 2], [2, 0]])
+
+
+def test_grid():
+    net = generate.grid(4, 5, n_zones=6, seed=0)
+    assert (net.n, net.m) == (20, 2 * (4 * 4 + 3 * 5))
+    assert isinstance(net.cost, PolynomialCost)
+    assert isinstance(net.demand.b, DemandVectorSP)
+    assert len(net.demand) == 30
+    assert net.is_connected()
+    assert np.allclose(net.demand(1).sum(axis=0), 0)
+    assert np.array_equal(net.demand.b.source_lbl.astype(int),
+                          net.demand.b.source_id)
+    net = generate.grid(4, bidirectional=False, n_zones=0)
+    assert net.m == 24
+    with pytest.raises(AttributeError):
+        net.demand
+
+
+def test_seed():
+    a = generate.random_geometric(200, seed=42)
+    b = generate.random_geometric(200, seed=42)
+    c = generate.random_geometric(200, seed=43)
+    assert a == b
+    assert a != c
+    assert np.allclose(a.nodes.xy, b.nodes.xy)
+
+
+def test_random_geometric():
+    net = generate.random_geometric(300, seed=1)
+    assert net.is_connected()
+    assert net.m % 2 == 0
+    assert len(net.edges.get_duplicate_edges()) == 0
+    sparse = generate.random_geometric(300, radius=0.05, seed=1)
+    assert sparse.m < net.m
+
+
+def test_hierarchical():
+    net = generate.hierarchical(11, spacing=(5, 10), speed=(1., 2., 4.),
+                                capacity=(1., 2., 4.), seed=0)
+    fft = net.cost.coefficients[:, 0]
+    assert np.array_equal(np.unique(fft), [0.25, 0.5, 1.])
+    # rows/cols 0 and 10 are highways, row/col 5 arterial
+    assert (fft == 0.25).sum() == 2 * 2 * 2 * 10
+    with pytest.raises(ValueError):
+        generate.hierarchical(11, spacing=(5, ), speed=(1., 2., 4.))
+
+
+def test_fw_on_generated():
+    from paminco.optim import NetworkFW
+    net = generate.grid(5, n_zones=5, seed=3)
+    fw = NetworkFW(net)
+    fw.run(max_iter=20)
+    assert np.allclose(net.gamma_times(fw.x), net.demand(1).sum(axis=1).A.ravel())
@@ -19,3 +19,56 @@ def test_laplacian():
                 - laplacian2(net, weight, reduced=reduced))
         assert (diff > 1e-8).nnz == 0, \
             "laplacian calc does not work."
+
+
+def test_laplacian_pattern_reuse():
+    net = load_sioux()
+    w1, w2 = np.random.random((2, net.m))
+    lap = net.laplacian(w1, reduced=True)
+    asm = net.cache["lap"]
+    assert np.allclose(net.laplacian(w2, reduced=True).toarray(),
+                       (-net.Gamma() @ sps.diags(w2) @ -net.Gamma().T)[1:, 1:].toarray())
+    assert net.cache["lap"] is asm
+    
+    # Formats agree, previously returned matrices are not modified
+    for fmt in ["csc", "coo", "array"]:
+        other = net.laplacian(w1, reduced=True, return_as=fmt)
+        other = other if isinstance(other, np.ndarray) else other.toarray()
+        assert np.array_equal(other, lap.toarray())
+    
+    # Refill data inplace
+    out = asm.assemble(w2, reduced=True, out=lap)
+    assert out is lap
+    assert np.allclose(lap.toarray(), net.laplacian(w2, reduced=True).toarray())
+    
+    # Pattern is rebuilt after topology changed
+    net.delete_edges([0, 1])
+    assert net.laplacian().shape == (net.n, net.n)
+    assert net.cache["lap"] is not asm
+
+
+def test_incidence_kernels():
+    net = load_sioux()
+    G = net.Gamma()
+    x = np.random.random(net.n)
+    X = np.random.random((3, net.n))
+    y = np.random.random(net.m)
+    Y = np.random.random((net.m, 2))
+    assert np.allclose(net.times_gamma(x), x @ G)
+    assert np.allclose(net.times_gamma(X), X @ G)
+    assert np.allclose(net.gamma_times(y), G @ y)
+    assert np.allclose(net.gamma_times(Y), G @ Y)
+    assert np.array_equal(net.gamma_times(np.ones(net.m, dtype=int)),
+                          G @ np.ones(net.m, dtype=int))
+    
+    # Results are written to out
+    out = np.empty((3, net.m))
+    assert net.times_gamma(X, out=out) is out
+    assert np.allclose(out, X @ G)
+    
+    # Flow induced by potential
+    a, d = np.random.random((2, net.m)) + 1
+    assert np.allclose(net.potential_flow(x, a, d), 1 / (2 * a) * (x @ G) - d)
+    
+    # Sparse arguments still return sparse matrices
+    assert sps.isspmatrix(net.times_gamma(sps.csr_matrix(X)))
@@ -3,7 +3,7 @@ import numpy as np
 
 from paminco.algo.mca import MCAInterpolationRule
 from paminco.net import load_sioux
-from paminco.net.shared import ID_UNMAPPED, LBL_UNMAPPED, FlowDirection, Edges
+from paminco.net.shared import ID_UNMAPPED, LBL_UNMAPPED, FlowDirection, Edges, Shared
 from paminco.net.network import Network
 from paminco.net.demand import LinearDemandFunction, AffineDemandFunction
 from paminco.utils.testing import assert_raises
@@ -128,6 +128,35 @@ class TestShared:
         net = load_sioux()
         net.shared.delete_edges([1, 2, 3])
         assert net.shared.Gamma().shape == (24, 73)
+    
+    def test_vectorized_lookup(self, net_sioux):
+        s = net_sioux.shared
+        st = s.edges.indices
+        assert np.array_equal(s.get_edge_id(st), np.arange(s.m))
+        assert s.get_edge_id(tuple(st[5])) == 5
+        assert dict(s.nodes2edge) == {tuple(e): i for (i, e) in enumerate(st.tolist())}
+        assert np.array_equal(s.get_node_id(s.nodes.labels), np.arange(s.n))
+        assert list(s.get_node_label(np.arange(s.n))) == list(s.nodes.labels)
+        with pytest.raises(KeyError):
+            s.nodes2edge[(0, 0)]
+        with pytest.raises(KeyError):
+            s.get_node_id(["not a node"])
+    
+    def test_label_table(self, net_sioux, tmp_path):
+        s = net_sioux.shared
+        assert s.edges.label_table is s.nodes.label_table
+        assert s.nodes.label_codes.dtype == np.int32
+        assert len(s.nodes.label_table) == s.n
+        assert np.array_equal(s.edges.labels,
+                              s.nodes.labels[s.edges.indices])
+        
+        # labels saved as strings are encoded on load
+        data = s.make_save_dict()
+        for p in ["edge_", "node_"]:
+            codes = data.pop(p + "label_codes")
+            data[p + "labels"] = data.pop(p + "label_table")[codes]
+        np.savez(tmp_path / "shared.npz", **data)
+        assert Shared.from_npz(str(tmp_path / "shared.npz")) == s
 
 
 @pytest.mark.parametrize("dtype", [np.float32, np.float64])
@@ -154,6 +183,23 @@ def test_dtyping_float(dtype):
     assert net_sioux.cost.ddx(np.ones(net_sioux.m, dtype=dtype)).dtype == dtype
 
 
+def test_astype():
+    net = load_sioux()
+    net32 = net.astype(np.float32, np.int32)
+    assert net32.edges.indices.dtype == np.int32
+    assert net32.dtype_float == np.float32
+    assert net32.demand(1).dtype == np.float32
+    assert net32.laplacian().dtype == np.float32
+    assert net.dtype_float == np.float64
+    assert np.allclose(net32.cost(np.ones(net.m, dtype=np.float32)),
+                       net.cost(np.ones(net.m)))
+    assert np.array_equal(net32.edges.labels, net.edges.labels)
+    
+    # Laplacian solves are promoted to float64
+    w = np.ones(net.m, dtype=np.float32)
+    assert net32.Lstar(w, method="inverse").dtype == np.float64
+
+
 @pytest.mark.parametrize("del_nodes",
     [
         ["2", "5", "11", "13"],
@@ -202,3 +248,49 @@ def test_set_demand():
     assert_raises(ValueError, net.set_demand, mode="t_linar")
     assert_raises(TypeError, net.set_demand, (12, 3, 77))
     assert_raises(TypeError, net.set_demand, ("12", 3, 77))
+
+
+class TestView:
+    def test_shares_arrays(self, net_sioux):
+        view = net_sioux.view()
+        assert np.shares_memory(view.edges.indices, net_sioux.edges.indices)
+        assert np.shares_memory(view.cost.coefficients, net_sioux.cost.coefficients)
+        assert view.shared is not net_sioux.shared
+        assert view.cost.shared is view.shared
+        assert view.demand.shared is view.shared
+        assert view == net_sioux
+    
+    def test_readonly(self, net_sioux):
+        view = net_sioux.view()
+        with pytest.raises(ValueError):
+            view.edges.bounds[0, 0] = 1
+        net_sioux.edges.bounds[0, 0] = 0
+    
+    def test_copy_on_write(self, net_sioux):
+        n, m, k = net_sioux.n, net_sioux.m, len(net_sioux.demand)
+        lbl = net_sioux.edges.labels.copy()
+        view = net_sioux.view()
+        view.delete_nodes(["1", "2"], is_label=True)
+        view.set_demand(("3", "20", 100))
+        view.integrate_cost()
+        assert (view.n, view.m, len(view.demand)) == (n - 2, m - 6, 1)
+        assert (net_sioux.n, net_sioux.m, len(net_sioux.demand)) == (n, m, k)
+        assert np.array_equal(net_sioux.edges.labels, lbl)
+        assert net_sioux.shared.get_edge_id((0, 1)) == 0
+        assert net_sioux.shared.get_node_id("1") == 0
+        # integrating costs of view does not change network costs
+        assert net_sioux.cost.coefficients.shape[1] == 5
+        assert view.cost.coefficients.shape[1] == 6
+    
+    def test_solver_uses_view(self, net_sioux):
+        from paminco import MCA
+        
+        net_sioux.set_demand(("1", "20", 10000))
+        before = net_sioux.edges.indices.copy()
+        mca_view = MCA(net_sioux, lambda_max=1)
+        mca_view.run()
+        mca_deep = MCA(net_sioux, lambda_max=1, copy_network="deep")
+        mca_deep.run()
+        assert np.array_equal(net_sioux.edges.indices, before)
+        assert np.shares_memory(mca_view.network.edges.indices, net_sioux.edges.indices)
+        np.testing.assert_allclose(mca_view.flow_at(0.7), mca_deep.flow_at(0.7))
@@ -1,9 +1,14 @@
+import io
+import subprocess
+import sys
 import tempfile
+import xml.etree.ElementTree as et
 
 import pytest
 import numpy as np
 
-from paminco.net import load_sioux
+from paminco.net import load_sioux, TNTP_SIOUX_NET
+from paminco.utils.readin import FileLineIterator
 from paminco.net.network import Network
 from paminco.utils.readin import (parse_polynomial,
                                  xml_find_root)
@@ -17,7 +22,18 @@ from paminco.utils.typing import is_int
 from paminco.utils.testing import assert_raises
 
 from paminco.net._data_gas import temporary_gas_files
-from paminco.net._data_examples import NET_ELECTRICAL_BRAESS
+from paminco.net._data_examples import (
+    NET_ELECTRICAL_BRAESS,
+    NET_ELECTRICAL_PIECEWISE,
+    NET_DISCONTINUOUS_COST,
+    NET_SIMPLE_POLYNOMIAL,
+)
+from paminco.net._read_xml import read_network_xml
+from paminco.net._convert_traffic import read_trips, read_net
+from paminco.net._convert_gas import contract_gaslib_instance, si_conversion
+from paminco.net._datasets import DATASETS, build_dataset, load_dataset
+from paminco.net.demand import DemandVectorSP
+from paminco.net.shared import Edges, Nodes
 
 
 @pytest.fixture
@@ -85,6 +101,50 @@ class TestSioux:
         assert np.where(d == 200)[0] == net_sioux.shared.get_node_id("4")
 
 
+TRIPS = """<NUMBER OF ZONES> 3
+<TOTAL OD FLOW> 36.0
+<END OF METADATA>
+
+~ comment
+Origin \t1
+    1 :      0.0;     2 :    10.0;
+    3 :    5.5;
+
+Origin 3
+# comment
+    1 :    20.5;  2 :    0.0
+"""
+
+
+def test_read_trips():
+    f = tempfile.mkstemp(".tntp")[1]
+    with open(f, "w") as fh:
+        fh.write(TRIPS)
+    s, t, r = read_trips(f)
+    assert s.tolist() == ["1", "1", "1", "3", "3"]
+    assert t.tolist() == ["1", "2", "3", "1", "2"]
+    assert r.tolist() == [0., 10., 5.5, 20.5, 0.]
+    
+    dv = DemandVectorSP.from_arrays(s, t, r)
+    assert len(dv) == 3
+    assert dv.node_labels.tolist() == [["1", "2"], ["1", "3"], ["3", "1"]]
+
+
+def test_read_net(net_sioux):
+    tntp_net = FileLineIterator(TNTP_SIOUX_NET, is_string=True).dump()
+    net, metadata = read_net(tntp_net)
+    assert metadata["NUMBER OF LINKS"] == "76"
+    assert metadata["FIRST THRU NODE"] == "1"
+    assert net.shape == (76, 10)
+    assert net.columns[:2].tolist() == ["init_node", "term_node"]
+    assert net["power"].dtype.kind == "i"
+    
+    # BPR: t0 * (1 + b (x / c)^p)
+    x = np.linspace(0, 50000, 76)
+    target = net.free_flow_time * (1 + net.b * (x / net.capacity)**net.power)
+    assert np.allclose(net_sioux.cost.F(x), target)
+
+
 class TestSimpleElectrical:
     @pytest.mark.parametrize("flow, target", 
         [
@@ -208,6 +268,90 @@ class TestXML:
         assert vals == ['12.0', '0.1', '0.5', '17.0', '0.1', '0.3']
 
 
+def _read_per_component(data):
+    return Network(Edges.from_xml(data, return_data=True),
+                   Nodes.from_xml(data, return_data=True),
+                   data,
+                   data)
+
+
+def _assert_same_network(a, b):
+    assert np.array_equal(a.edges.source_lbl, b.edges.source_lbl)
+    assert np.array_equal(a.edges.target_lbl, b.edges.target_lbl)
+    assert np.array_equal(a.edges.bounds, b.edges.bounds)
+    assert np.array_equal(a.nodes.labels, b.nodes.labels)
+    assert type(a.cost) == type(b.cost)
+    x = np.linspace(-2, 3, a.m)
+    assert np.allclose(a.cost.f(x), b.cost.f(x))
+    assert np.allclose(a.cost.ddx(x), b.cost.ddx(x))
+    assert (a.demand(1) != b.demand(1)).nnz == 0
+
+
+class TestStreamingXML:
+    @pytest.mark.parametrize("data", [
+        NET_ELECTRICAL_BRAESS,
+        NET_ELECTRICAL_PIECEWISE,
+        NET_DISCONTINUOUS_COST,
+        NET_SIMPLE_POLYNOMIAL,
+    ], ids=["braess", "piecewise", "discontinuous", "polynomial"])
+    def test_same_as_per_component(self, data):
+        _assert_same_network(Network.from_xml(data), _read_per_component(data))
+
+    @pytest.mark.parametrize("source", ["file", "fileobj", "etree", "element"])
+    def test_sources(self, net_sioux, source):
+        f = tempfile.mkstemp(".xml")[1]
+        net_sioux.to_xml(f)
+        if source == "fileobj":
+            with open(f, "rb") as fobj:
+                net = Network.from_xml(io.BytesIO(fobj.read()))
+        elif source == "etree":
+            net = Network.from_xml(et.parse(f))
+        elif source == "element":
+            net = Network.from_xml(et.parse(f).getroot())
+        else:
+            net = Network.from_xml(f)
+        _assert_same_network(net, net_sioux)
+        assert np.allclose(net.nodes.x, net_sioux.nodes.x)
+
+    def test_affine_demand(self, net_sioux):
+        net_sioux.set_demand((("1", "2", 10), ("2", "3", 5)), mode="affine")
+        f = tempfile.mkstemp(".xml")[1]
+        net_sioux.to_xml(f)
+        net = Network.from_xml(f)
+        assert type(net.demand) == type(net_sioux.demand)
+        for lam in [0, 1, 2.5]:
+            assert (net.demand(lam) != net_sioux.demand(lam)).nnz == 0
+
+    def test_return_dict(self):
+        d = Network.from_xml(NET_ELECTRICAL_BRAESS, return_dict=True)
+        assert d["cost_type"] == "piecewisequadratic"
+        assert d["demand_mode"] == "linear"
+        st, bounds = d["edge_data"]
+        assert st.shape == (5, 2)
+        assert bounds.shape == (5, 2)
+
+    def test_mixed_cost_types(self):
+        data = NET_SIMPLE_POLYNOMIAL.replace(
+            "</edges>",
+            '<edge from="s" to="v"><cost><piecewisequadratic>'
+            '<functionpart a="1" b="0" c="0" tau="-inf"/>'
+            '</piecewisequadratic></cost></edge></edges>',
+        )
+        assert_raises(IOError, read_network_xml, data)
+
+    def test_default_edge_cost(self):
+        net = Network.from_xml(NET_ELECTRICAL_BRAESS,
+                               kw_cost={"default_edge_cost": False})
+        assert net.m == 5
+        
+        # Edge without cost is rejected if no default cost is used
+        data = NET_SIMPLE_POLYNOMIAL.replace(
+            "</edges>", '<edge from="s" to="v"/></edges>')
+        assert_raises(ValueError, lambda d: Network.from_xml(
+            d, kw_cost={"default_edge_cost": False}), data)
+        assert Network.from_xml(data).m == Network.from_xml(NET_SIMPLE_POLYNOMIAL).m + 1
+
+
 @pytest.mark.parametrize(
     "gasnet,n,m,node_labels",
     [
@@ -226,3 +370,69 @@ def test_gas_readin(gasnet, n, m, node_labels):
     for nl in net.nodes.labels:
         assert nl in node_labels
     
+
+
+def test_gas_contraction():
+    # Node sets are represented by the tail of the first aux element
+    st = np.array([[1, 2], [3, 4], [4, 2], [0, 5], [5, 3], [6, 6]])
+    contracted = contract_gaslib_instance(8, st)
+    np.testing.assert_array_equal(contracted, [0, 0, 0, 0, 0, 0, 6, 7])
+    contracted = contract_gaslib_instance(8, st[:3])
+    np.testing.assert_array_equal(contracted, [0, 3, 3, 3, 3, 5, 6, 7])
+
+
+@pytest.mark.parametrize(
+    "unit,value,si",
+    [
+        ("", 3.0, 3.0),
+        ("km", 2.0, 2000.0),
+        ("Celsius", 10.0, 283.15),
+        ("bar", 2.0, 2e5),
+        ("kg_per_kmol", 18.0, 0.018),
+        ("1000m_cube_per_hour", 3.6, 1.0),
+        ("W_per_m_square_per_K", 2.0, 2.0),
+    ]
+    )
+def test_gas_si_conversion(unit, value, si):
+    f, o = si_conversion(unit)
+    assert np.isclose(value * f + o, si)
+
+
+def test_gas_beta_units():
+    # GasLib-24 gives pipe diameters in m and roughness in mm, the
+    # friction factor is computed from both in the same unit
+    with temporary_gas_files("gas24") as filenames:
+        net = Network.from_gaslib(*filenames, contract_aux_elements=False)
+    expected = {
+        ("entry01", "N101"): 2.0745458517e-04,
+        ("N05", "N05a"): 3.5028654992e-04,
+        ("N09", "N10"): 1.2018338284e-03,
+        ("N09", "N11"): 1.6141056302e-03,
+        ("N12", "exit02"): 7.3661753870e-03,
+    }
+    for (st, beta) in expected.items():
+        idx = net.shared.get_edge_id(tuple(net.shared.get_node_id(list(st))))
+        assert np.isclose(net.cost.coefficients[idx, 2], beta, rtol=1e-8)
+
+
+class TestDatasets:
+    @pytest.mark.parametrize("name", DATASETS)
+    def test_prebuilt_up_to_date(self, name):
+        net, ref = load_dataset(name), build_dataset(name)
+        _assert_same_network(net, ref)
+        assert np.array_equal(net.nodes.xy, ref.nodes.xy)
+        assert np.array_equal(net.nodes.zone, ref.nodes.zone)
+
+    def test_independent_copies(self):
+        net = load_dataset("gas24")
+        net.cost.coefficients[:] = 0
+        net.delete_edges([0])
+        net2 = load_dataset("gas24")
+        assert net2.m == net.m + 1
+        assert np.all(net2.cost.coefficients[:, 2] > 0)
+
+    def test_raw_data_not_imported(self):
+        code = ("import sys, paminco; paminco.net.load_gas('gas11'); "
+                "assert 'paminco.net._data_gas' not in sys.modules; "
+                "assert 'paminco.net._data_sioux' not in sys.modules")
+        subprocess.run([sys.executable, "-c", code], check=True)
@@ -1,3 +1,4 @@
+import io
 import tempfile
 import warnings
 
@@ -9,7 +10,8 @@ from paminco.net import load_sioux
 from paminco.net.network import Network
 from paminco.net.shared import Shared, Nodes, Edges
 from paminco.net.demand import LinearDemandFunction
-from paminco.net.cost import NetworkCost
+from paminco.net.cost import NetworkCost, SymbolicCost
+import paminco.net as pn
 
 
 @pytest.mark.parametrize("cost_type", ["polynomial", "symbolic"])
@@ -32,6 +34,62 @@ def test_stack_sioux(cost_type, make_aff_demand):
     assert (net.demand(4.123) != net3.demand(4.123)).nnz == 0
 
 
+def _sioux_symbolic_affine():
+    net = load_sioux()
+    coeffs = {"a": net.cost.coefficients[:, 4], "fft": net.cost.coefficients[:, 0]}
+    net.set_cost(SymbolicCost(coeffs, "x*fft + a/5 * x**5", "fft + a*x**4",
+                              "4*a*x**3", "12*a*x**2"))
+    net.set_demand((net.demand(0.3), net.demand(0.7)), mode="affine", is_label=False)
+    return net
+
+
+class TestStreamXML:
+    
+    @pytest.mark.parametrize("prettify", [False, True])
+    @pytest.mark.parametrize("name", ["NET_ELECTRICAL_PIECEWISE", "NET_SIMPLE_POLYNOMIAL",
+                                      "sioux_symbolic_affine"])
+    def test_same_as_etree(self, name, prettify):
+        if name == "sioux_symbolic_affine":
+            net = _sioux_symbolic_affine()
+        else:
+            net = Network.from_xml(getattr(pn, name))
+        f = tempfile.mkstemp(suffix=".xml")[1]
+        net.to_xml(f, prettify=prettify)
+        streamed = Network.from_xml(f)
+        # Passing write options builds the tree in memory
+        net.to_xml(f, prettify=prettify, encoding="us-ascii")
+        tree = Network.from_xml(f)
+        
+        assert streamed.shared == tree.shared
+        assert type(streamed.cost) is type(tree.cost)
+        assert type(streamed.demand) is type(tree.demand)
+        x = np.linspace(-3, 5, net.m)
+        for d in range(3):
+            assert np.allclose(streamed.cost(x, d=d), tree.cost(x, d=d))
+        for p in (0, 0.5, 1):
+            assert (streamed.demand(p) != tree.demand(p)).nnz == 0
+    
+    def test_file_objects(self):
+        net = Network.from_xml(pn.NET_ELECTRICAL_BRAESS)
+        text, binary = io.StringIO(), io.BytesIO()
+        net.to_xml(text, prettify=True)
+        net.to_xml(binary, prettify=True)
+        assert text.getvalue().encode() == binary.getvalue()
+        
+        lines = text.getvalue().splitlines()
+        assert lines[0] == "<network>"
+        assert lines[-1] == "</network>"
+        assert "    <edge " in text.getvalue()
+        assert Network.from_xml(text.getvalue()).shared == net.shared
+    
+    def test_not_prettified(self):
+        net = Network.from_xml(pn.NET_SIMPLE_POLYNOMIAL)
+        out = io.BytesIO()
+        net.to_xml(out)
+        assert b"\n" not in out.getvalue()
+        assert Network.from_xml(out.getvalue().decode()).shared == net.shared
+
+
 class TestSaveNP:
     def _test_save(self):
         net = load_sioux
@@ -74,3 +132,63 @@ class TestSaveNP:
         net.save_to_numpy(f)
         net2 = Network.from_npz(f)
         assert net == net2, "saving network fails for pwqcost"
+
+
+def _is_mapped(arr) -> bool:
+    return isinstance(arr, np.memmap) or isinstance(arr.base, np.memmap)
+
+
+class TestSaveNpyDir:
+    @pytest.mark.parametrize("make_aff_demand", [True, False])
+    def test_roundtrip(self, make_aff_demand):
+        net = load_sioux()
+        if make_aff_demand is True:
+            net.set_demand((net.demand(0.3), net.demand(0.7)), mode="affine", is_label=False)
+        d = tempfile.mkdtemp()
+        net.save_to_npy_dir(d)
+        net2 = Network.from_npy_dir(d)
+        assert net == net2
+        assert np.array_equal(net.cost(2000), net2.cost(2000))
+        assert (net.demand(4.123) != net2.demand(4.123)).nnz == 0
+        assert np.array_equal(net.nodes.xy, net2.nodes.xy)
+
+    def test_memory_mapped(self):
+        net = load_sioux()
+        d = tempfile.mkdtemp()
+        net.save_to_npy_dir(d)
+        net2 = Network.from_npy_dir(d)
+        for arr in [net2.edges.indices, net2.edges.bounds, net2.edges.label_codes,
+                    net2.nodes.label_codes, net2.cost.coefficients]:
+            assert _is_mapped(arr)
+            assert arr.flags.writeable is False
+        
+        # index mappings are built on first use
+        assert net2.shared._nodes2edge is None
+        assert net2.shared.get_edge_id((0, 1)) == net.shared.get_edge_id((0, 1))
+        assert net2.shared._nodes2edge is not None
+        
+        # networks with read-only arrays can be modified
+        assert net2.delete_edges([0, 1]) == 2
+        assert net2.m == net.m - 2
+        
+        net3 = Network.from_npy_dir(d, mmap_mode=None)
+        assert _is_mapped(net3.edges.bounds) is False
+        assert net3 == net
+
+    def test_pwqc(self):
+        net = load_sioux()
+        i_rule = MCAInterpolationRule(1.01, 1, net.m, 1000)
+        net._c = net.cost.interpolate(i_rule)
+        d = tempfile.mkdtemp()
+        net.save_to_npy_dir(d)
+        net2 = Network.from_npy_dir(d)
+        assert net == net2
+        assert _is_mapped(net2.cost.coefficients.coefficients)
+
+    def test_invalid_directory(self):
+        d = tempfile.mkdtemp()
+        with pytest.raises(FileNotFoundError):
+            Network.from_npy_dir(d)
+        net = load_sioux()
+        with pytest.raises(ValueError):
+            net.save_to_npy_dir(d, extra=np.array([None, 1]))
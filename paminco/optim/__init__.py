@@ -1,12 +1,17 @@
 # flake8: noqa
 
-from . import fw
-from . import fw_net
-from . import subproblem
+from paminco._lazy import attach
 
-from ._base import LinearWarmstart
-from .fw import FW, FWConfig, FWMode
-from .fw_net import NetworkFW, NetworkFWConfig
-from .subproblem import subproblem_solver
-
-__all__ = [s for s in dir() if not s.startswith("_")]
\ No newline at end of file
+__getattr__, __dir__, __all__ = attach(
+    __name__,
+    submodules=["fw", "fw_net", "subproblem"],
+    attributes={
+        "LinearWarmstart": "_base",
+        "FW": "fw",
+        "FWConfig": "fw",
+        "FWMode": "fw",
+        "NetworkFW": "fw_net",
+        "NetworkFWConfig": "fw_net",
+        "subproblem_solver": "subproblem",
+    },
+)
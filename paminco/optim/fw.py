@@ -3,9 +3,9 @@ from __future__ import annotations
 import copy
 
 import numpy as np
-import scipy.optimize as spopt
 
 from paminco._base import Config
+from paminco.profiling import NULL_PROFILER
 from paminco.utils.typing import IntEnum2
 
 
@@ -43,6 +43,8 @@ def linesearch(
     --------
     scipy.optimize.minimize
     """
+    import scipy.optimize as spopt
+    
     def fun_ls(lambd_, y, z):
         return fun((1 - lambd_) * y + lambd_ * z)
 
@@ -52,7 +54,8 @@ def linesearch(
                          tol=tol,
                          bounds=([0., 1], ),
                          **kwargs)
-    s = res.x[0]
+    # Python float keeps the float type of y and z in (1-s)*y + s*z
+    s = float(res.x[0])
     return s
 
 
@@ -232,9 +235,21 @@ class FW:
     x0 : ndarray, shape (n,)
         Initial guess. Array of real elements of size (n,), where n
         is the number of independent variables.
+    fun_and_fprime : callable, optional
+        Function that returns the objective and the gradient at once.
+        Signature: ``fun_and_fprime(x) -> (float, array_like)``. If
+        given, it is used to evaluate the objective at every new
+        iterate, such that the gradient at the iterate is not computed
+        separately. Line searches use ``fun`` only.
     kwargs : keyword arguments
         Further options, see FWConfig.
     
+    Attributes
+    ----------
+    profiler : Profiler or NullProfiler
+        Collects timing spans and counters, disabled by default. See
+        :mod:`paminco.profiling`.
+    
     See Also
     --------
     FWConfig : Options accepted by the solver.
@@ -256,13 +271,17 @@ class FW:
             fprime,
             subproblem_solver,
             x0,
+            fun_and_fprime=None,
             **kwargs
             ) -> None:
         self._c = FWConfig(**kwargs)
         self.fun = fun
         self.fprime = fprime
+        self.fun_and_fprime = fun_and_fprime
         self.subproblem_solver = subproblem_solver
         self.x0 = x0
+        self.profiler = NULL_PROFILER
+        self._gradient = (None, None)
 
     def __str__(self) -> str:
         return (f"Iteration {self.i:4d} | funval: {self.funval:,.2f}")
@@ -282,6 +301,7 @@ class FW:
         self.pmax = 0
         self.partan = 0
         self.breakflag = FWBreakFlag.NOT_SET
+        self._gradient = (None, None)
 
     def run(self, callback=None, **kw) -> None:
         """Run the Frank-Wolfe algorithm.
@@ -306,10 +326,13 @@ class FW:
         FWConfig : Options accepted by the solver.
         scipy.optimize.OptimizeResult : Details on the optimization result.
         """
+        import scipy.optimize as spopt
+        
         self._init_run()
         self._c.map_kwargs(**kw)
+        prof = self.profiler
         self.x = self.x0
-        self.funval = self.fun(self.x)
+        self._evaluate_objective()
         
         # Loop until some break condition is reached
         while self.breakflag == FWBreakFlag.NOT_SET:
@@ -318,11 +341,18 @@ class FW:
                 self.breakflag = FWBreakFlag.COST_INVALID
                 break
             
-            self.xes.s = self.subproblem_solver(self.fprime(self.x))
-            self._check_convergence()
-            self._perform_eta_step()
-            self._perform_partan_step()
-            self.funval = self.fun(self.x)
+            with prof.span("iteration"):
+                with prof.span("gradient"):
+                    gradient = self._get_gradient()
+                with prof.span("subproblem"):
+                    self.xes.s = self.subproblem_solver(gradient)
+                with prof.span("convergence"):
+                    self._check_convergence()
+                with prof.span("linesearch"):
+                    self._perform_eta_step()
+                    self._perform_partan_step()
+                with prof.span("objective"):
+                    self._evaluate_objective()
             
             if self.i == self.config.max_iter:
                 self.breakflag = FWBreakFlag.MAX_ITER
@@ -344,12 +374,27 @@ class FW:
                                     status=self.breakflag.to_status(),
                                     success=(self.breakflag.to_status() == 0))
 
+    def _evaluate_objective(self) -> None:
+        # Objective at current x, gradient is kept if computed alongside
+        if self.fun_and_fprime is None:
+            self.funval = self.fun(self.x)
+        else:
+            self.funval, gradient = self.fun_and_fprime(self.x)
+            self._gradient = (self.x, gradient)
+
     def _get_gradient(self) -> np.ndarray:
-        return self.fprime(self.x)
+        # Gradient at current x, computed once per iterate
+        x, gradient = self._gradient
+        if x is not self.x:
+            gradient = self.fprime(self.x)
+            self._gradient = (self.x, gradient)
+        return gradient
 
     def _check_convergence(self) -> None:
         # Update (best) lower bound
-        self.lb = (self.funval + sum((self.xes.s - self.xes.x) * self._get_gradient()))
+        self.lb = (self.funval
+                   + np.sum((self.xes.s - self.xes.x) * self._get_gradient(),
+                            dtype=np.float64))
         self.blb = max(self.blb, self.lb)
         
         if (self.config.lb is not None) and (np.isclose(self.funval, self.config.lb)):
@@ -376,6 +421,7 @@ class FW:
         if self.config.mode == FWMode.STEP_SIZE_DETERIATION:
             self.eta = 2 / (2 + self.i)
         else:
+            self.profiler.count("linesearches")
             self.eta = linesearch(self.fun,
                                   self.xes.x,
                                   self.xes.s)
@@ -400,6 +446,7 @@ class FW:
                            + self.pmax * (self.xes.x_eta - self.xes.x_bef))
         
         # x is best linear combination between x_eta and x_pmax
+        self.profiler.count("linesearches")
         self.partan = linesearch(self.fun,
                                  self.xes.x_eta,
                                  self.xes.x_pmax)
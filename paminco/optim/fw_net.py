@@ -1,7 +1,6 @@
 from __future__ import annotations
 
 import numpy as np
-import pandas as pd
 
 from ._base import FlowOptimizer
 from .fw import FW, FWConfig
@@ -88,8 +87,9 @@ class NetworkFW(FlowOptimizer):
         the status of the algorithm.
     use_simple_timer : bool, default=True
         Whether timestamps will be collected during initialization and run.
-    copy_network : bool, default=True
-        Whether to work on a copy of ``net``.
+    copy_network : bool or str, default=True
+        Whether to work on a copy of ``net``. If True, a copy-on-write
+        view is used, if ``"deep"``, a deep copy.
     subproblem : callable, optional
         If given, set up subproblem solver with ``subproblem(net, **kw_sub)``,
         else an auto subproblem solver is used.
@@ -274,32 +274,58 @@ class NetworkFW(FlowOptimizer):
         
         """
         self.callback(CallBackFlag.RUN_START, callback)
+        prof = self.profiler
         
         self.subproblem_solver.param = param
         self.subproblem_solver.reset_cache()
         
-        # Find initial solution
-        if (warmstart is not None and
-                isinstance(self.network.demand, LinearDemandFunction) and
-                not np.isclose(warmstart.param, 0)):
-            x0 = warmstart(param)
+        # Count shortest path / LP solves of subproblem
+        if getattr(self.subproblem_solver, "method", None) == SubproblemMethod.SHORTEST_PATH:
+            sub_counter = "dijkstra"
         else:
-            f = np.zeros(self.network.m)
-            s = self.network.cost.ddx(f)
-            x0 = self.subproblem_solver(s)
+            sub_counter = "lp_solves"
         
-        # Setup Frank-Wolfe
-        def costfun(x):
-            return self.network.cost(x).sum()
+        def subproblem(weight):
+            prof.count(sub_counter)
+            return self.subproblem_solver(weight)
         
-        def jac(x):
-            return self.network.cost.ddx(x)
-        self.fw = FW(costfun, jac, self.subproblem_solver, x0, **self._c.get_fw_kwargs())
-        
-        # Map callback and run FW
-        def cb(optim_res):
-            self.callback(CallBackFlag.ITER_END, callback)
-        self.fw.run(callback=cb, **kw)
+        with prof.span("run"):
+            # Find initial solution
+            with prof.span("initial_solution"):
+                if (warmstart is not None and
+                        isinstance(self.network.demand, LinearDemandFunction) and
+                        not np.isclose(warmstart.param, 0)):
+                    x0 = warmstart(param)
+                else:
+                    f = np.zeros(self.network.m, dtype=self.network.dtype_float)
+                    s = self.network.cost.ddx(f)
+                    x0 = subproblem(s)
+            
+            # Setup Frank-Wolfe
+            # Objective is summed up in float64, also for float32 networks
+            def costfun(x):
+                prof.count("cost_evaluations")
+                return self.network.cost(x).sum(dtype=np.float64)
+            
+            def jac(x):
+                prof.count("gradient_evaluations")
+                return self.network.cost.ddx(x)
+            
+            def costfun_and_jac(x):
+                # Cost and marginal cost share the powers of x
+                prof.count("cost_evaluations")
+                prof.count("gradient_evaluations")
+                F, f = self.network.cost.values(x, d=(0, 1))
+                return F.sum(dtype=np.float64), f
+            self.fw = FW(costfun, jac, subproblem, x0,
+                         fun_and_fprime=costfun_and_jac,
+                         **self._c.get_fw_kwargs())
+            self.fw.profiler = prof
+            
+            # Map callback and run FW
+            def cb(optim_res):
+                self.callback(CallBackFlag.ITER_END, callback)
+            self.fw.run(callback=cb, **kw)
         
         self.callback(CallBackFlag.RUN_END, callback)
 
@@ -337,6 +363,7 @@ class NetworkFW(FlowOptimizer):
     @property
     def flows(self) -> pd.DataFrame:
         """(Intermediate) flows of the FW routine."""
+        import pandas as pd
         
         df = pd.DataFrame(self.fw.xes.__dict__)
         df.columns = ["x", "x_s", "x_eta", "x_pmax", "x_bef"]
@@ -1,6 +1,5 @@
 import abc
 import warnings
-from distutils.version import StrictVersion
 
 import scipy as sp
 import scipy.sparse as sps
@@ -12,6 +11,11 @@ from paminco.utils.misc import Cache
 from paminco.utils.typing import IntEnum2
 
 
+def _version(version: str) -> tuple:
+    # Major and minor version as tuple of int
+    return tuple(int(v) for v in version.split(".")[:2])
+
+
 class SubproblemMethod(IntEnum2):
     """Enum defining the subproblem method used in Frank-Wolfe."""
 
@@ -183,6 +187,8 @@ class LPSubproblemSolver(SubproblemSolver):
             raise NotImplementedError(
                 "Multicommodity LP subproblem solver not yet implemented."
             )
+        import scipy.optimize
+        import scipy.special
         
         # Get LHS, RHS
         A_eq = self.network.Gamma()[:-1]  # network caches gamma
@@ -203,7 +209,7 @@ class LPSubproblemSolver(SubproblemSolver):
 
         # Handle method setting
         if (self.method in [SubproblemMethod.LP, SubproblemMethod.LP_HIGHS]
-                and StrictVersion(sp.__version__) < StrictVersion('1.6.0')):
+                and _version(sp.__version__) < (1, 6)):
             if self.method == SubproblemMethod.LP_HIGHS:
                 warnings.warn(
                     "Method 'highs' requires scipy version >= '1.6.0', system "
@@ -235,7 +241,7 @@ class LPSubproblemSolver(SubproblemSolver):
                 f"\nScipy Linprog returned status {result.status} with message"
                 f"\n{result.message}."
             )
-        return result.x
+        return result.x.astype(self.network.dtype_float, copy=False)
 
     def reset_cache(self) -> None:
         """Reset all cache variables of all methods."""
@@ -8,6 +8,7 @@ from paminco.net.network import Network
 from paminco.net._data_gas import temporary_gas_files
 
 from paminco.optim import NetworkFW
+from paminco.optim.fw import FW
 from paminco.optim.subproblem import SubproblemMethod
 
 
@@ -52,6 +53,44 @@ class TestNetworkFW:
         
         assert fw.cost > fw2.cost
 
+    def test_single_precision(self):
+        net = load_sioux()
+        net.integrate_cost()
+        net32 = net.astype(np.float32, np.int32)
+        fw, fw32 = NetworkFW(net), NetworkFW(net32)
+        fw.run(max_iter=50)
+        fw32.run(max_iter=50)
+        assert fw32.x.dtype == np.float32
+        assert fw32.fw.xes.s.dtype == np.float32
+        assert isinstance(fw32.cost, float)
+        assert np.isclose(fw32.cost, fw.cost, rtol=1e-4)
+
+    def test_fun_and_fprime(self):
+        net = load_sioux()
+        net.integrate_cost()
+        fw = NetworkFW(net)
+        fw.run(max_iter=20)
+        calls = []
+        
+        def jac(x):
+            calls.append(x)
+            return net.cost.ddx(x)
+        fw2 = FW(lambda x: net.cost(x).sum(), jac, fw.fw.subproblem_solver,
+                 fw.fw.x0, max_iter=20)
+        fw2.run()
+        # Same iterates, but gradient computed only once per iterate
+        assert np.allclose(fw2.x, fw.x)
+        assert np.isclose(fw2.funval, fw.cost)
+        assert len(calls) == fw2.i
+        
+        calls.clear()
+        fw3 = FW(lambda x: net.cost(x).sum(), jac, fw.fw.subproblem_solver,
+                 fw.fw.x0, fun_and_fprime=lambda x: (net.cost(x).sum(), net.cost.ddx(x)),
+                 max_iter=20)
+        fw3.run()
+        assert np.allclose(fw3.x, fw.x)
+        assert len(calls) == 0
+
     @pytest.mark.parametrize(
         "instancename",
         ["gas11", "gas24", "gas40"]
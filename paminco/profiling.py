@@ -0,0 +1,203 @@
+"""Module defining low-overhead profiling of solvers.
+
+Solvers hold a profiler in their attribute ``profiler``. By default,
+this is :data:`NULL_PROFILER`, whose spans and counters do nothing. To
+profile a solver, pass a :class:`Profiler` as callback (it attaches
+itself to the solver on ``CallBackFlag.INIT_START``) or set it
+directly with ``solver.profiler = Profiler()``.
+
+Examples
+--------
+>>> import paminco
+>>> from paminco.profiling import Profiler
+>>> net = paminco.net.load_example(2)
+>>> prof = Profiler()
+>>> efa = paminco.EFA(net, lambda_max=10, callback=prof)
+>>> efa.run()
+>>> df = prof.to_df()
+>>> df.loc["run/iteration", "calls"]
+4
+>>> prof.counters["factorizations"]
+4
+>>> print(prof)  # doctest: +SKIP
+Profile
+span                                               calls   total [s]    mean [s]   share
+init                                                   1      0.0037    0.003659   36.2%
+run                                                    1      0.0065    0.006453   63.8%
+  calculate_inv                                        1      0.0008    0.000757   11.7%
+  initial_region                                       1      0.0009    0.000934   14.5%
+    update_cost_coeffs                                 1      0.0006    0.000591   63.3%
+  iteration                                            4      0.0047    0.001164   72.1%
+    calculate_inv                                      3      0.0015    0.000506   32.6%
+    compute_boundary                                   4      0.0005    0.000128   11.0%
+...
+"""
+from __future__ import annotations
+
+from time import perf_counter
+
+
+from paminco.callback import CallBackFlag
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> bool:
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class NullProfiler:
+    """Profiler that records nothing, used if profiling is disabled."""
+
+    enabled = False
+
+    def __call__(self, model, status_flag: CallBackFlag) -> None:
+        pass
+
+    def span(self, name: str) -> _NullSpan:
+        """Get a span that does nothing."""
+        return _NULL_SPAN
+
+    def count(self, name: str, n: int = 1) -> None:
+        """Do nothing."""
+        pass
+
+
+NULL_PROFILER = NullProfiler()
+"""Shared :class:`NullProfiler` instance, default profiler of solvers."""
+
+
+class _Span:
+    __slots__ = ("_prof", "_name", "_start")
+
+    def __init__(self, prof: Profiler, name: str) -> None:
+        self._prof = prof
+        self._name = name
+
+    def __enter__(self):
+        self._prof._stack.append(self._name)
+        self._start = perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> bool:
+        elapsed = perf_counter() - self._start
+        prof = self._prof
+        key = "/".join(prof._stack)
+        stats = prof._spans.get(key)
+        if stats is None:
+            prof._spans[key] = [1, elapsed]
+        else:
+            stats[0] += 1
+            stats[1] += elapsed
+        prof._stack.pop()
+        return False
+
+
+class Profiler:
+    """Callback that collects nested timing spans and counters.
+
+    Spans are identified by their path, i.e., the names of all enclosing
+    spans joined by ``'/'``. For every path, the number of calls and the
+    total time spent is recorded.
+
+    Attributes
+    ----------
+    counters : dict
+        Counters of events, e.g., number of factorizations.
+    spans
+    """
+
+    enabled = True
+
+    def __init__(self) -> None:
+        self.reset()
+
+    def __call__(self, model, status_flag: CallBackFlag) -> None:
+        if status_flag == CallBackFlag.INIT_START:
+            model.profiler = self
+            self._init_span = self.span("init")
+            self._init_span.__enter__()
+        elif status_flag == CallBackFlag.INIT_END:
+            if getattr(self, "_init_span", None) is not None:
+                self._init_span.__exit__(None, None, None)
+                self._init_span = None
+
+    def __repr__(self) -> str:
+        return self.report()
+
+    def reset(self) -> None:
+        """Delete all recorded spans and counters."""
+        self._stack = []
+        self._spans = {}
+        self.counters = {}
+
+    def span(self, name: str) -> _Span:
+        """Context manager that times the enclosed block.
+
+        Parameters
+        ----------
+        name : str
+            Name of span, nested in currently open spans.
+
+        Returns
+        -------
+        context manager
+        """
+        return _Span(self, name)
+
+    def count(self, name: str, n: int = 1) -> None:
+        """Increment counter ``name`` by ``n``."""
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    @property
+    def spans(self) -> dict:
+        """dict: path -> (calls, total time in s) of all closed spans."""
+        return {k: tuple(v) for (k, v) in self._spans.items()}
+
+    def to_df(self) -> pd.DataFrame:
+        """Get recorded spans as DataFrame.
+
+        Returns
+        -------
+        df : pandas.DataFrame
+            Indexed by span path with columns ``depth``, ``calls``,
+            ``total``, ``mean`` and ``share`` (fraction of time of the
+            parent span, or of all top level spans).
+        """
+        import pandas as pd
+        
+        rows = []
+        top_total = sum(v[1] for (k, v) in self._spans.items() if "/" not in k)
+        for (path, (calls, total)) in self._spans.items():
+            parent = path.rpartition("/")[0]
+            if parent in self._spans:
+                ref = self._spans[parent][1]
+            else:
+                ref = top_total
+            rows.append((path, path.count("/"), calls, total, total / calls,
+                         total / ref if ref > 0 else float("nan")))
+        cols = ["span", "depth", "calls", "total", "mean", "share"]
+        df = pd.DataFrame(rows, columns=cols).set_index("span")
+        return df.sort_index()
+
+    def report(self) -> str:
+        """Get a summary of spans and counters as str."""
+        out = "Profile\n"
+        out += ("{:<48s}{:>8s}{:>12s}{:>12s}{:>8s}\n"
+                .format("span", "calls", "total [s]", "mean [s]", "share"))
+        for (path, row) in self.to_df().iterrows():
+            name = "  " * int(row.depth) + path.rpartition("/")[2]
+            out += ("{:<48s}{:>8d}{:>12.4f}{:>12.6f}{:>8.1%}\n"
+                    .format(name, int(row.calls), row.total, row["mean"], row.share))
+        if len(self.counters) > 0:
+            out += "Counters\n"
+            for (k, v) in sorted(self.counters.items()):
+                out += "  {:<46s}{:>8d}\n".format(k, v)
+        return out
@@ -82,3 +82,91 @@ def test_npz(sol1):
     sol1.save_to_numpy(f)
     sol2 = ParametricSolution.from_npz(f)
     compare_param_sols(sol1, sol2)
+
+
+@pytest.mark.parametrize("sol1", [sioux(), simple_electrical()])
+@pytest.mark.parametrize("chunk_size", [1, 3])
+def test_chunked(sol1, chunk_size):
+    f = tempfile.mkstemp(suffix=".csv")[1]
+    sol1.to_csv(f, chunk_size=chunk_size)
+    compare_param_sols(sol1, ParametricSolution.from_csv(f))
+    with open(f) as fh:
+        assert fh.read() == sol1.to_csv(None)
+    
+    f = tempfile.mkstemp(suffix=".npz")[1]
+    sol1.save_to_numpy(f, chunk_size=chunk_size)
+    with np.load(f) as data:
+        assert np.array_equal(data["arr_flow"], sol1.arr_flow)
+        if sol1.has_potentials:
+            assert np.array_equal(data["arr_potential"], sol1.arr_potential)
+    compare_param_sols(sol1, ParametricSolution.from_npz(f))
+
+
+@pytest.mark.parametrize("sol1", [sioux(), simple_electrical()])
+def test_parquet(sol1):
+    pytest.importorskip("pyarrow")
+    f = tempfile.mkstemp(suffix=".parquet")[1]
+    sol1.to_parquet(f, chunk_size=2)
+    compare_param_sols(sol1, ParametricSolution.from_parquet(f))
+    
+    # Selected edges only, without potentials
+    edges = [3, 0]
+    sol2 = ParametricSolution.from_parquet(f, edges=edges, nodes=[])
+    assert sol2.has_potentials is False
+    assert np.array_equal(sol2.arr_flow, sol1.arr_flow[:, edges])
+    if sol1.dflow is not None:
+        assert np.array_equal(sol2.dflow, sol1.dflow[edges])
+    
+    # Param range
+    params = sol1.arr_param
+    lo, hi = params[1], params[len(params) // 2]
+    sol3 = ParametricSolution.from_parquet(f, param_range=(lo, hi))
+    mask = (params >= lo) & (params <= hi)
+    assert np.array_equal(sol3.arr_param, params[mask])
+    assert np.array_equal(sol3.arr_potential, sol1.arr_potential[mask])
+    if hi < params[-1]:
+        assert sol3.dflow is None
+
+
+def test_parquet_large():
+    pq = pytest.importorskip("pyarrow.parquet")
+    rng = np.random.default_rng(0)
+    (B, m, n) = (40, 50000, 10000)
+    sol1 = ParametricSolution.from_arrays(
+        param=np.cumsum(rng.uniform(size=B)),
+        flow=rng.normal(size=(B, m)),
+        potential=rng.normal(size=(B, n)),
+        cost=rng.uniform(size=B),
+        dflow=rng.normal(size=m),
+        dpi=rng.normal(size=n),
+    )
+    f = tempfile.mkstemp(suffix=".parquet")[1]
+    sol1.to_parquet(f)
+    
+    # Row groups hold all breakpoints of several edges
+    meta = pq.ParquetFile(f).metadata
+    assert meta.num_columns == 6
+    assert 1 < meta.num_row_groups < 10
+    for i in range(1, meta.num_row_groups):
+        assert meta.row_group(i).num_rows % (B + 1) == 0
+        assert meta.row_group(i).num_rows > B + 1
+    
+    # Subset of edges and param range, without potentials
+    edges = [m - 1, 17, 30000]
+    params = sol1.arr_param
+    sol2 = ParametricSolution.from_parquet(f, edges=edges, nodes=[],
+                                           param_range=(params[5], None))
+    assert sol2.has_potentials is False
+    assert np.array_equal(sol2.arr_param, params[5:])
+    assert np.array_equal(sol2.arr_cost, sol1.arr_cost[5:])
+    assert np.array_equal(sol2.arr_flow, sol1.arr_flow[5:, edges])
+    assert np.array_equal(sol2.dflow, sol1.dflow[edges])
+    
+    # Potentials of single node
+    sol3 = ParametricSolution.from_parquet(f, edges=[], nodes=[n - 1],
+                                           param_range=(None, params[-2]))
+    assert np.array_equal(sol3.arr_potential, sol1.arr_potential[:-1, [n - 1]])
+    assert sol3.dflow is None and sol3.dpi is None
+    
+    with pytest.raises(IndexError):
+        ParametricSolution.from_parquet(f, edges=[m], nodes=[])
@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+
+import paminco
+from paminco.callback import IterationRecorder, SimpleDebuggerIterativeModel
+
+
+@pytest.fixture(scope="module")
+def recorded():
+    net = paminco.net.load_sioux()
+    net.set_demand(("1", "20", 10000), mode="linear")
+    rec = IterationRecorder()
+    dbg = SimpleDebuggerIterativeModel()
+    mca = paminco.MCA(net, lambda_max=1, max_iter=6, callback=[rec, dbg])
+    mca.run()
+    return mca.efa, rec, dbg
+
+
+class TestIterationRecorder:
+
+    def test_fields(self, recorded):
+        efa, rec, dbg = recorded
+        np.testing.assert_array_equal(rec.iterations, np.arange(len(rec)) + 1)
+        for i in rec.iterations:
+            model = dbg.get(i)
+            assert rec.field("lambda_min")[i - 1] == model.lambda_min
+            assert rec.get(i)["min_edge"] == model.min_edge
+            assert np.array_equal(rec.set_at("boundary_edges", i),
+                                  model.boundary_edges)
+
+    def test_region_reconstruction(self, recorded):
+        efa, rec, dbg = recorded
+        for i in range(len(rec) + 1):
+            assert np.array_equal(rec.region_at(i), dbg.get(i).region)
+        np.testing.assert_array_equal(rec.region_at(len(rec)), efa.region)
+
+    def test_replay(self, recorded):
+        _, rec, _ = recorded
+        for state in rec.replay():
+            i = state["i"]
+            assert np.array_equal(state["region"], rec.region_at(i))
+            assert state["lambda_max"] == rec[i]["lambda_max"]
+
+    def test_region_changes(self, recorded):
+        _, rec, dbg = recorded
+        edges, regions = rec.region_changes(1)
+        before, after = dbg.get(0).region, dbg.get(1).region
+        np.testing.assert_array_equal(edges, np.flatnonzero(before != after))
+        np.testing.assert_array_equal(regions, after[edges])
+
+    def test_unrecorded_iteration(self, recorded):
+        _, rec, _ = recorded
+        with pytest.raises(KeyError):
+            rec.region_at(len(rec) + 1)
+
+    def test_growth_and_rerun(self):
+        net = paminco.net.load_example(2)
+        rec = IterationRecorder(capacity=1)
+        efa = paminco.EFA(net, lambda_max=10, callback=rec)
+        efa.run()
+        df = rec.to_df()
+        assert list(df.index) == [1, 2, 3, 4]
+        # running again resets recorded values
+        efa = paminco.EFA(net, lambda_max=10, callback=rec)
+        efa.run()
+        assert len(rec) == 4
+    
+    def test_nested_run_ignored(self):
+        # affine demand runs phase 1 EFA within run
+        net = paminco.net.load_sioux()
+        net.set_demand((("1", "20", 10000), ("13", "2", 20000)), mode="affine")
+        rec = IterationRecorder()
+        mca = paminco.MCA(net, lambda_max=1, callback=rec)
+        mca.run()
+        np.testing.assert_array_equal(rec.iterations, np.arange(len(rec)) + 1)
+        np.testing.assert_array_equal(rec.region_at(len(rec)), mca.efa.region)
@@ -0,0 +1,69 @@
+import json
+import subprocess
+import sys
+
+import pytest
+
+import paminco
+
+
+HEAVY_MODULES = [
+    "matplotlib",
+    "pandas",
+    "numexpr",
+    "psutil",
+    "lxml",
+    "multiprocessing",
+    "scipy.optimize",
+    "scipy.interpolate",
+    "paminco.net._data_gas",
+    "paminco.net._data_sioux",
+]
+
+
+def _run_isolated(code: str) -> dict:
+    """Run ``code`` in a fresh interpreter and return the json it prints."""
+    out = subprocess.run([sys.executable, "-c", code], check=True,
+                         capture_output=True, text=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def _loaded_after(statement: str) -> dict:
+    code = (
+        "import json, sys, time\n"
+        "t = time.perf_counter()\n"
+        f"{statement}\n"
+        "t = time.perf_counter() - t\n"
+        f"heavy = [m for m in {HEAVY_MODULES!r} if m in sys.modules]\n"
+        "print(json.dumps({'time': t, 'heavy': heavy}))\n"
+    )
+    return _run_isolated(code)
+
+
+def test_import_time():
+    res = _loaded_after("import paminco")
+    assert res["heavy"] == []
+    # Only paminco/__init__ is executed, subpackages are imported lazily
+    assert res["time"] < 0.5
+
+
+@pytest.mark.parametrize("statement", [
+    "import paminco.net",
+    "import paminco.algo, paminco.optim",
+    "from paminco import Network, MCA, MCFI, NetworkFW",
+    "import paminco; paminco.net.load_gas('gas24')",
+])
+def test_heavy_dependencies_not_loaded(statement):
+    assert _loaded_after(statement)["heavy"] == []
+
+
+def test_lazy_attributes():
+    assert paminco.Network is paminco.net.network.Network
+    assert paminco.MCA is paminco.algo.mca.MCA
+    assert paminco.optim.FWConfig is paminco.optim.fw.FWConfig
+    assert paminco.net.NET_SIMPLE_POLYNOMIAL.startswith("<network>")
+    for name in paminco.__all__:
+        assert name in dir(paminco)
+        assert getattr(paminco, name) is not None
+    with pytest.raises(AttributeError):
+        paminco.not_an_attribute
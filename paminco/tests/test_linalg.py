@@ -5,7 +5,7 @@ from paminco.net import load_sioux
 
 from paminco.net import load_sioux
 from paminco.net.network import Network
-from paminco.linalg import star_inv, InverseMethod, star_update_by_edge
+from paminco.linalg import star_inv, InverseMethod, star_update_by_edge, FactorizationCache
 
 
 @pytest.fixture
@@ -53,4 +53,61 @@ def test_update_lstar(net_sioux, rng, edge, delta_c):
     assert np.isclose(star_inv_arr_up, star_inv_cho_up).all()
     assert np.isclose(star_inv_arr_up, star_inv_sparse_up).all()
     assert np.isclose(star_inv_cho_up, star_inv_sparse_up).all()
-    
\ No newline at end of file
+    
+
+class TestFactorizationCache:
+
+    def test_lstar_hit(self, net_sioux):
+        cache = FactorizationCache()
+        w = np.arange(1, net_sioux.m + 1, dtype=float)
+        lstar = net_sioux.Lstar(w, cache=cache)
+        assert net_sioux.Lstar(w.copy(), cache=cache) is lstar
+        assert net_sioux.Lstar(w, cache=cache, method="INVERSE") is not lstar
+        assert cache.stats["hits"] == 1
+        assert cache.stats["misses"] == 2
+        assert len(cache) == 2
+        np.testing.assert_allclose(net_sioux.Lstar(w).toarray(), lstar.toarray())
+
+    def test_lru_eviction(self, net_sioux):
+        size = (net_sioux.n - 1) ** 2 * 8
+        cache = FactorizationCache(max_bytes=2 * size)
+        weights = [np.full(net_sioux.m, float(i)) for i in range(1, 4)]
+        keys = [cache.key(w, InverseMethod.CHOLESKY.value, False, net_sioux.n)
+                for w in weights]
+        net_sioux.Lstar(weights[0], cache=cache)
+        net_sioux.Lstar(weights[1], cache=cache)
+        net_sioux.Lstar(weights[0], cache=cache)  # 0 is most recently used
+        net_sioux.Lstar(weights[2], cache=cache)
+        assert keys[0] in cache and keys[2] in cache
+        assert keys[1] not in cache
+        assert cache.evictions == 1
+        assert cache.nbytes <= cache.max_bytes
+
+    def test_too_large_not_stored(self, net_sioux):
+        cache = FactorizationCache(max_bytes=0)
+        net_sioux.Lstar(np.ones(net_sioux.m), cache=cache)
+        assert len(cache) == 0
+        cache.clear()
+        assert cache.misses == 0
+
+    def test_efa_reuse(self):
+        from paminco import EFA, MCA
+        from paminco.profiling import Profiler
+        
+        net = load_sioux()
+        net.set_demand(("1", "20", 10000), mode="linear")
+        # piecewise quadratic network
+        net = MCA(net).efa.network
+        efa = EFA(net, lambda_max=1, max_iter=30)
+        efa.run()
+        prof = Profiler()
+        efa_re = EFA(net, lambda_max=1, max_iter=30, callback=prof)
+        efa_re.factor_cache = efa.factor_cache
+        efa_re.run()
+        assert "factorizations" not in prof.counters
+        assert prof.counters["factor_cache_hits"] == efa_re.i
+        no_cache = EFA(net, lambda_max=1, max_iter=30, factor_cache_size=0)
+        no_cache.run()
+        for (a, b) in zip(no_cache.param_solution, efa_re.param_solution):
+            assert a.param == b.param
+            np.testing.assert_allclose(a.flow, b.flow)
@@ -0,0 +1,89 @@
+import pytest
+import numpy as np
+
+import paminco
+from paminco.profiling import Profiler, NullProfiler, NULL_PROFILER
+
+
+def test_spans_and_counters():
+    prof = Profiler()
+    with prof.span("a"):
+        with prof.span("b"):
+            prof.count("x")
+        with prof.span("b"):
+            prof.count("x", 2)
+    with prof.span("c"):
+        pass
+    assert prof.spans["a"][0] == 1
+    assert prof.spans["a/b"][0] == 2
+    assert prof.counters == {"x": 3}
+    df = prof.to_df()
+    assert list(df.index) == ["a", "a/b", "c"]
+    assert list(df.depth) == [0, 1, 0]
+    assert np.isclose(df.loc[["a", "c"], "share"].sum(), 1)
+    assert "Counters" in prof.report()
+    prof.reset()
+    assert len(prof.spans) == 0 and len(prof.counters) == 0
+
+
+def test_span_exception():
+    prof = Profiler()
+    with pytest.raises(RuntimeError):
+        with prof.span("a"):
+            raise RuntimeError
+    assert prof.spans["a"][0] == 1
+    assert prof._stack == []
+
+
+def test_disabled_by_default():
+    net = paminco.net.load_example(2)
+    efa = paminco.EFA(net, lambda_max=10)
+    assert efa.profiler is NULL_PROFILER
+    assert isinstance(efa.profiler, NullProfiler)
+    with efa.profiler.span("a"):
+        efa.profiler.count("b")
+    efa.run()
+
+
+def test_efa():
+    net = paminco.net.load_example(2)
+    prof = Profiler()
+    efa = paminco.EFA(net, lambda_max=10, callback=prof)
+    assert efa.profiler is prof
+    efa.run()
+    spans = prof.spans
+    assert "init" in spans
+    for s in ["calculate_inv", "compute_potentials", "compute_boundary"]:
+        assert "run/iteration/" + s in spans
+    assert prof.counters["factorizations"] == spans["run/calculate_inv"][0] + spans["run/iteration/calculate_inv"][0]
+
+    # Solve for lambda_max after the last iteration is profiled as well
+    prof = Profiler()
+    efa = paminco.EFA(net, lambda_max=10, max_iter=2, callback=prof)
+    efa.run()
+    spans = prof.spans
+    for s in ["compute_potentials", "compute_flows"]:
+        assert spans["run/iteration/" + s][0] + spans["run/" + s][0] == len(efa.param_solution)
+
+
+def test_fw():
+    net = paminco.net.load_sioux()
+    net.integrate_cost()
+    fw = paminco.NetworkFW(net)
+    fw.profiler = Profiler()
+    fw.run(max_iter=10)
+    spans = fw.profiler.spans
+    assert spans["run/iteration"][0] == fw.fw.i
+    assert "run/iteration/subproblem" in spans
+    assert "run/iteration/linesearch" in spans
+    assert fw.profiler.counters["dijkstra"] == fw.fw.i + 1
+
+
+def test_mcfi():
+    net = paminco.net.load_sioux()
+    net.integrate_cost()
+    prof = Profiler()
+    mcfi = paminco.MCFI(net, callback=prof)
+    mcfi.run(param=[0.2, 0.5])
+    assert prof.spans["iteration"][0] == 2
+    assert prof.spans["iteration/optimize/run"][0] == 2
@@ -1,7 +1,18 @@
 """Module that provides utils for loading objects via pickle, XML."""
+from collections.abc import Mapping
 from xml.etree import ElementTree
 from xml.dom import minidom
+import json
+import os
 import pickle
+import zipfile
+
+import numpy as np
+
+
+NPY_DIR_MANIFEST = "manifest.json"
+NPY_DIR_FORMAT = "paminco.npy_dir"
+NPY_DIR_VERSION = 1
 
 
 def save_object(obj, file: str) -> None:
@@ -69,3 +80,171 @@ def prettify_xml(file) -> None:
 
     with open(file, 'w') as f:
         f.write(prettify(root))
+
+
+def savez_blocks(file, save_dict: dict) -> None:
+    """Save arrays into uncompressed ``.npz``, large arrays blockwise.
+
+    Arrays given as blocks are streamed into the archive block by
+    block, i.e., they never have to be held in memory as a whole. The
+    resulting file can be read by :func:`numpy.load` as usual.
+
+    Parameters
+    ----------
+    file : str or file
+        Filename as str or open file.
+    save_dict : dict
+        Dict with str keys. Values are either array_like, or tuples
+        ``(shape, dtype, blocks)`` where ``blocks`` is an iterable of
+        arrays that, stacked along the first axis, make up an array
+        of ``shape`` and ``dtype``.
+
+    See Also
+    --------
+    numpy.savez
+    numpy.lib.format
+    """
+    if isinstance(file, str) and not file.endswith(".npz"):
+        file = file + ".npz"
+
+    with zipfile.ZipFile(file, mode="w", compression=zipfile.ZIP_STORED,
+                         allowZip64=True) as zf:
+        for (k, v) in save_dict.items():
+            with zf.open(k + ".npy", mode="w", force_zip64=True) as f:
+                if not isinstance(v, tuple):
+                    np.lib.format.write_array(f, np.asanyarray(v))
+                    continue
+
+                shape, dtype, blocks = v
+                shape, dtype = tuple(shape), np.dtype(dtype)
+                header = {
+                    "descr": np.lib.format.dtype_to_descr(dtype),
+                    "fortran_order": False,
+                    "shape": shape,
+                }
+                np.lib.format.write_array_header_1_0(f, header)
+                n_rows = 0
+                for block in blocks:
+                    block = np.ascontiguousarray(block, dtype=dtype)
+                    if block.shape[1:] != shape[1:]:
+                        raise ValueError(
+                            f"Block of shape {block.shape} does not fit "
+                            f"array '{k}' of shape {shape}."
+                        )
+                    n_rows += len(block)
+                    f.write(block.tobytes())
+                if n_rows != shape[0]:
+                    raise ValueError(
+                        f"Blocks of '{k}' have {n_rows} rows, expected {shape[0]}."
+                    )
+
+
+def save_npy_dir(path: str, save_dict: dict) -> None:
+    """Save dict of arrays into a directory of ``.npy`` files.
+
+    Every array is saved into a separate raw ``.npy`` file. Scalars
+    (str, int, float, bool, None) are stored in a JSON manifest
+    ``manifest.json`` that also lists all array files. The manifest is
+    written last, an incompletely written directory is thus rejected
+    by :class:`NpyDirectory`.
+
+    Parameters
+    ----------
+    path : str
+        Directory, created if it does not exist.
+    save_dict : dict
+        Dict with str keys and arrays or scalars as values, e.g., from
+        ``make_save_dict``.
+
+    See Also
+    --------
+    NpyDirectory
+    numpy.save
+    """
+    os.makedirs(path, exist_ok=True)
+    manifest = {
+        "format": NPY_DIR_FORMAT,
+        "version": NPY_DIR_VERSION,
+        "arrays": {},
+        "values": {},
+    }
+    for (k, v) in save_dict.items():
+        if v is None or isinstance(v, (str, bool, int, float)):
+            manifest["values"][k] = v
+            continue
+        v = np.asarray(v)
+        if v.dtype.hasobject:
+            raise ValueError(f"Cannot save '{k}' of dtype object.")
+        file = k + ".npy"
+        np.save(os.path.join(path, file), v, allow_pickle=False)
+        manifest["arrays"][k] = {
+            "file": file,
+            "dtype": v.dtype.str,
+            "shape": list(v.shape),
+        }
+    with open(os.path.join(path, NPY_DIR_MANIFEST), "w") as f:
+        json.dump(manifest, f, indent=1)
+
+
+class NpyDirectory(Mapping):
+    """Read-only mapping to a directory saved by :func:`save_npy_dir`.
+
+    Arrays are loaded lazily on first access, by default as read-only
+    memory maps. Several processes opening the same directory thus share
+    the pages of the arrays.
+
+    Parameters
+    ----------
+    path : str
+        Directory written by :func:`save_npy_dir`.
+    mmap_mode : {None, 'r', 'r+', 'c'}, default='r'
+        Passed to :func:`numpy.load`. If None, arrays are read into
+        memory.
+
+    See Also
+    --------
+    save_npy_dir
+    numpy.load
+    numpy.memmap
+    """
+
+    def __init__(self, path: str, mmap_mode: str = "r") -> None:
+        manifest_file = os.path.join(path, NPY_DIR_MANIFEST)
+        if os.path.isfile(manifest_file) is False:
+            raise FileNotFoundError(f"No {NPY_DIR_MANIFEST} in '{path}'.")
+        with open(manifest_file) as f:
+            manifest = json.load(f)
+        if manifest.get("format") != NPY_DIR_FORMAT:
+            raise ValueError(f"'{path}' is not of format {NPY_DIR_FORMAT}.")
+        if manifest.get("version", 0) > NPY_DIR_VERSION:
+            raise ValueError(
+                f"Version {manifest['version']} of '{path}' is not supported."
+            )
+        self.path = path
+        self.mmap_mode = mmap_mode
+        self._files = {k: v["file"] for (k, v) in manifest["arrays"].items()}
+        self._values = manifest["values"]
+        self._arrays = {}
+
+    def __getitem__(self, key: str):
+        if key in self._values:
+            return self._values[key]
+        arr = self._arrays.get(key)
+        if arr is None:
+            file = os.path.join(self.path, self._files[key])
+            arr = np.load(file, mmap_mode=self.mmap_mode, allow_pickle=False)
+            self._arrays[key] = arr
+        return arr
+
+    def __contains__(self, key) -> bool:
+        return key in self._values or key in self._files
+
+    def __iter__(self):
+        yield from self._values
+        yield from self._files
+
+    def __len__(self) -> int:
+        return len(self._values) + len(self._files)
+
+    def __repr__(self) -> str:
+        return f"NpyDirectory('{self.path}', mmap_mode={self.mmap_mode!r})"
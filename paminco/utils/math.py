@@ -60,3 +60,61 @@ def find_min_col_lex(M) -> int:
     d = M[minrow, ]
     mincol = -min((x, -i) for i, x in enumerate(d))[1]
     return mincol
+
+
+def segment_searchsorted(
+        a,
+        first,
+        last,
+        v,
+        side: str = "right"
+        ) -> np.ndarray:
+    """Find indices into sorted segments of an array.
+    
+    Vectorized binary search of ``v[i]`` in the segment
+    ``a[first[i]:last[i] + 1]``, which must be sorted in ascending
+    order. All queries are searched simultaneously in
+    ``O(log(max segment length))`` vectorized steps.
+    
+    Parameters
+    ----------
+    a : ndarray
+        1-D array of concatenated sorted segments.
+    first, last : ndarray of int
+        Indices of first and last element of the segment of each query.
+    v : ndarray
+        Values to search for, broadcast against ``first`` and ``last``.
+    side : {'left', 'right'}, default='right'
+        As in :func:`numpy.searchsorted`.
+    
+    Returns
+    -------
+    ndarray of int
+        Indices into ``a`` where ``v`` would be inserted in its segment
+        to keep the segment sorted, in ``[first, last + 1]``.
+    
+    See Also
+    --------
+    numpy.searchsorted
+    
+    Examples
+    --------
+    >>> a = np.array([0, 2, 4, -1, 3])
+    >>> segment_searchsorted(a, [0, 0, 3], [2, 2, 4], [1, 4, 5])
+    array([1, 3, 5])
+    """
+    lo, v = np.broadcast_arrays(np.asarray(first), v)
+    lo = lo.astype(np.int64)
+    hi = np.broadcast_to(np.asarray(last) + 1, lo.shape).astype(np.int64)
+    while True:
+        active = lo < hi
+        if not active.any():
+            return lo
+        mid = (lo + hi) // 2
+        a_mid = a[np.where(active, mid, 0)]
+        if side == "right":
+            go_right = a_mid <= v
+        else:
+            go_right = a_mid < v
+        lo = np.where(active & go_right, mid + 1, lo)
+        hi = np.where(active & ~go_right, mid, hi)
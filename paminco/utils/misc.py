@@ -1,6 +1,8 @@
 """Module with miscellaneous util funcs."""
 from collections import UserDict
 
+import numpy as np
+
 
 class Cache(UserDict):
     """Class that acts as a cache.
@@ -82,6 +84,58 @@ class Cache(UserDict):
                 self.valids[key] = False
 
 
+class GrowableArray:
+    """One-dimensional array that doubles its capacity when full.
+    
+    Parameters
+    ----------
+    dtype : dtype
+        Datatype of values.
+    capacity : int, default=256
+        Number of values to allocate space for initially.
+    
+    Examples
+    --------
+    >>> from paminco.utils.misc import GrowableArray
+    >>> arr = GrowableArray(int, capacity=2)
+    >>> arr.append(1)
+    >>> arr.extend([2, 3, 4])
+    >>> arr.values
+    array([1, 2, 3, 4])
+    """
+
+    def __init__(self, dtype, capacity: int = 256) -> None:
+        self._data = np.empty(max(int(capacity), 1), dtype=dtype)
+        self._n = 0
+
+    def __len__(self) -> int:
+        return self._n
+
+    def _reserve(self, n: int) -> None:
+        if n > len(self._data):
+            new = np.empty(max(n, 2 * len(self._data)), dtype=self._data.dtype)
+            new[:self._n] = self._data[:self._n]
+            self._data = new
+
+    def append(self, value) -> None:
+        """Append a single value."""
+        self._reserve(self._n + 1)
+        self._data[self._n] = value
+        self._n += 1
+
+    def extend(self, values) -> None:
+        """Append all values in ``values``."""
+        values = np.asarray(values, dtype=self._data.dtype).ravel()
+        self._reserve(self._n + len(values))
+        self._data[self._n:self._n + len(values)] = values
+        self._n += len(values)
+
+    @property
+    def values(self) -> np.ndarray:
+        """ndarray: View of all values appended so far."""
+        return self._data[:self._n]
+
+
 def callback_to_list(callback):
     """Cast callback to list.
     